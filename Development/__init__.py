@@ -1 +1 @@
-from .compare import compare_qb_file, compare_to_538
\ No newline at end of file
+from .compare import compare_qb_file, compare_to_538, compare_engines
\ No newline at end of file
@@ -5,6 +5,9 @@ import numpy
 
 import nfelodcm as dcm
 
+from nfeloqb.Resources import DataLoader, QBModel
+from nfeloqb.DataModels import ModelConfig
+
 def compare_qb_file(
     ext_file_path: str
 ):
@@ -241,3 +244,54 @@ def compare_to_538():
         '{0}/Development/mae_comparison.csv'.format(root_loc),
         index=False
     )
+
+def compare_engines(model_df=None, tol=1e-9):
+    '''
+    Runs the QB model with the columnar and iterrows engines and checks that the
+    data, data_team, and qb_records tables are numerically equivalent. Returns a df
+    with the max absolute difference for each numeric column.
+    '''
+    root_loc = pathlib.Path(__file__).parent.parent.resolve()
+    if model_df is None:
+        model_df = DataLoader().model_df
+    ## run each engine with its own config, since a run can write normalizations to it ##
+    outputs = {}
+    for engine in ['columnar', 'iterrows']:
+        config = ModelConfig.from_file('{0}/model_config.json'.format(root_loc))
+        model = QBModel(model_df, config)
+        model.run_model(engine=engine)
+        print('{0} engine ran in {1} seconds'.format(engine, round(model.model_runtime, 2)))
+        outputs[engine] = {
+            'data' : pd.DataFrame(model.data),
+            'data_team' : pd.DataFrame(model.data_team),
+            'qb_records' : pd.DataFrame(model.qb_records)
+        }
+    ## compare ##
+    diffs = []
+    for table in ['data', 'data_team', 'qb_records']:
+        col = outputs['columnar'][table]
+        ref = outputs['iterrows'][table]
+        if list(col.columns) != list(ref.columns) or len(col) != len(ref):
+            raise ValueError('{0} tables do not have the same shape'.format(table))
+        for column in ref.columns:
+            if pd.api.types.is_numeric_dtype(ref[column]):
+                diff = numpy.nanmax(numpy.absolute(
+                    col[column].to_numpy(dtype=float) - ref[column].to_numpy(dtype=float)
+                )) if len(ref) > 0 else 0
+                if not numpy.array_equal(col[column].isna(), ref[column].isna()):
+                    diff = numpy.inf
+            else:
+                diff = 0 if col[column].astype(str).equals(ref[column].astype(str)) else numpy.inf
+            diffs.append({
+                'table' : table,
+                'column' : column,
+                'max_abs_diff' : diff
+            })
+    diffs = pd.DataFrame(diffs)
+    failed = diffs[diffs['max_abs_diff'] > tol]
+    if len(failed) > 0:
+        raise ValueError('Engines are not equivalent for: {0}'.format(
+            ', '.join(failed['table'] + '.' + failed['column'])
+        ))
+    print('Engines are equivalent')
+    return diffs
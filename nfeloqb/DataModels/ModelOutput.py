@@ -0,0 +1,142 @@
+## Built-in ##
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+## Packages ##
+import pandas as pd
+import numpy
+
+## columns written for every game as (name, dtype) ##
+OUTPUT_COLUMNS: list[tuple[str, Any]] = [
+    ## game values ##
+    ('qb_value_pre', numpy.float64),
+    ('team_value_pre', numpy.float64),
+    ('qb_adj', numpy.float64),
+    ('opponent_def_value_pre', numpy.float64),
+    ('qb_value_pre_def_adj', numpy.float64),
+    ('player_VALUE_adj', numpy.float64),
+    ('qb_value_post', numpy.float64),
+    ('team_value_post', numpy.float64),
+    ('opponent_def_value_post', numpy.float64),
+    ## qb state after the game ##
+    ('player_name', object),
+    ('current_value', numpy.float64),
+    ('current_variance', numpy.float64),
+    ('rolling_value', numpy.float64),
+    ('starts', numpy.int64),
+    ('season_starts', numpy.int64),
+    ('season_team_adjs_alotted', numpy.float64),
+    ('season_team_adjs_received', numpy.float64),
+    ('season_player_adjs_received', numpy.float64),
+]
+## output columns that are added to the games to create the data table ##
+DATA_COLUMNS: list[str] = [
+    'qb_value_pre', 'team_value_pre', 'qb_adj', 'opponent_def_value_pre',
+    'qb_value_pre_def_adj', 'player_VALUE_adj', 'qb_value_post',
+    'team_value_post', 'opponent_def_value_post'
+]
+
+def round_column(values: numpy.ndarray, digits: int = 3) -> numpy.ndarray:
+    '''
+    Round an array to match python's round(). numpy rounds a scaled copy of the value,
+    which can land on the wrong side of a half way point, so values near one are
+    rounded individually with python's round.
+    '''
+    scale = 10.0 ** digits
+    scaled = values * scale
+    rounded = numpy.round(scaled) / scale
+    ## find values whose scaled fraction is close enough to .5 to be double rounded ##
+    with numpy.errstate(invalid='ignore'):
+        near_half = numpy.absolute(
+            numpy.absolute(scaled - numpy.trunc(scaled)) - 0.5
+        ) < 1e-6 + numpy.absolute(scaled) * 1e-12
+    for i in numpy.flatnonzero(near_half).tolist():
+        rounded[i] = round(values.item(i), digits)
+    return rounded
+
+@dataclass
+class ModelOutput:
+    '''
+    Typed column buffers for the per-game output of a model run. Buffers are sized from
+    the games up front and written by index. The data, data_team, and qb_records tables
+    are built, and rounded, once on first access and then cached.
+    '''
+    ## initing meta ##
+    games: pd.DataFrame = field(repr=False)
+    ## buffers ##
+    columns: dict[str, numpy.ndarray] = field(init=False, repr=False)
+    ## cached tables ##
+    cached_data: Optional[pd.DataFrame] = field(default=None, init=False, repr=False)
+    cached_data_team: Optional[pd.DataFrame] = field(default=None, init=False, repr=False)
+    cached_qb_records: Optional[pd.DataFrame] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        ## allocate buffers ##
+        self.columns = {
+            name: numpy.empty(len(self.games), dtype=dtype) for name, dtype in OUTPUT_COLUMNS
+        }
+
+    def fill(self, columns: dict[str, numpy.ndarray], n_games: int) -> None:
+        '''
+        Copy the first n games of previously written buffers, ie from a checkpoint
+        '''
+        for name in self.columns:
+            self.columns[name][:n_games] = columns[name][:n_games]
+
+    @property
+    def data(self) -> pd.DataFrame:
+        '''
+        The games with the model's pre and post game values added
+        '''
+        if self.cached_data is None:
+            data = self.games.copy()
+            for name in DATA_COLUMNS:
+                data[name] = self.columns[name]
+            self.cached_data = data
+        return self.cached_data
+
+    @property
+    def data_team(self) -> pd.DataFrame:
+        '''
+        The defensive value of each team before and after each game
+        '''
+        if self.cached_data_team is None:
+            self.cached_data_team = pd.DataFrame({
+                'game_id' : self.games['game_id'].to_numpy(),
+                'season' : self.games['season'].to_numpy(),
+                'week' : self.games['week'].to_numpy(),
+                'team' : self.games['opponent'].to_numpy(),
+                'def_value_pre' : round_column(self.columns['opponent_def_value_pre']),
+                'def_value_post' : round_column(self.columns['opponent_def_value_post'])
+            })
+        return self.cached_data_team
+
+    @property
+    def qb_records(self) -> pd.DataFrame:
+        '''
+        The state of the starting QB after each game, in the format of QB.as_record
+        '''
+        if self.cached_qb_records is None:
+            self.cached_qb_records = pd.DataFrame({
+                'player_id' : self.games['player_id'].to_numpy(),
+                'player_name' : self.columns['player_name'],
+                'current_value' : round_column(self.columns['current_value']),
+                'current_variance' : round_column(self.columns['current_variance']),
+                'rolling_value' : round_column(self.columns['rolling_value']),
+                'starts' : self.columns['starts'],
+                'season_starts' : self.columns['season_starts'],
+                'season_team_adjs_alotted' : round_column(self.columns['season_team_adjs_alotted']),
+                'season_team_adjs_received' : round_column(self.columns['season_team_adjs_received']),
+                'season_player_adjs_received' : round_column(self.columns['season_player_adjs_received']),
+                'last_game_date' : self.games['gameday'].to_numpy(),
+                'last_game_season' : self.games['season'].to_numpy(),
+                'last_game_team' : self.games['team'].to_numpy(),
+                'value_pre' : round_column(self.columns['qb_value_pre']),
+                'opponent_def_value_pre' : round_column(self.columns['opponent_def_value_pre']),
+                'value_pre_def_adj' : round_column(self.columns['qb_value_pre_def_adj']),
+                'value_performance_def_adj' : round_column(self.columns['player_VALUE_adj']),
+                'game_id' : self.games['game_id'].to_numpy(),
+                'season' : self.games['season'].to_numpy(),
+                'week' : self.games['week'].to_numpy()
+            })
+        return self.cached_qb_records
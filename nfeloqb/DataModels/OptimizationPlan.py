@@ -0,0 +1,139 @@
+## built ins ##
+import json
+from dataclasses import dataclass, field
+
+## methods a plan step can be optimized with ##
+PLAN_METHODS: list[str] = ['minimize', 'multi_start', 'surrogate', 'cmaes', 'halving']
+## objectives a plan step can minimize ##
+PLAN_OBJECTIVES: list[str] = ['mae', 'season_mae', 'mae_first_16', 'mae_backup']
+
+@dataclass
+class PlanStep:
+  '''
+  Dataclass for a step of an optimization plan, which optimizes a subset of params.
+  '''
+  name: str
+  subset: list[str]
+  objective: str = 'mae'
+  method: str = 'minimize'
+  depends_on: list[str] = field(default_factory=list)
+  options: dict = field(default_factory=dict) ## passed to the ConfigOptimizer or multi start ##
+
+  @classmethod
+  def from_dict(cls, dict_data: dict, subsets: dict[str, list[str]] = {}) -> 'PlanStep':
+    '''
+    Init a PlanStep from a dict object. The subset can be a list of params, or the name
+    of a subset defined by the plan. When it is omitted, the plan subset with the step's
+    name is used.
+    '''
+    dict_data = dict_data.copy()
+    subset = dict_data.pop('subset', dict_data['name'])
+    if isinstance(subset, str):
+      if subset not in subsets:
+        raise ValueError('Step {0} uses subset {1}, which is not defined.'.format(dict_data['name'], subset))
+      subset = subsets[subset]
+    return cls(subset=list(subset), **dict_data)
+
+@dataclass
+class OptimizationPlan:
+  '''
+  Dataclass for a declarative optimization plan. Each step optimizes a subset of params
+  with an objective and method, and can depend on other steps, in which case it starts
+  from the values they found. Steps that don't depend on each other can run concurrently.
+  '''
+  name: str
+  steps: list[PlanStep]
+
+  def __post_init__(self):
+    self.validate()
+
+  @classmethod
+  def from_dict(cls, name: str, steps: list[dict], subsets: dict[str, list[str]] = {}) -> 'OptimizationPlan':
+    '''
+    Create an OptimizationPlan from a list of step dicts, and the named subsets they use.
+    '''
+    return cls(
+      name=name,
+      steps=[PlanStep.from_dict(step, subsets) for step in steps]
+    )
+
+  @classmethod
+  def from_file(cls, file_path: str, plan_name: str) -> 'OptimizationPlan':
+    '''
+    Create an OptimizationPlan from a plan in a json file. The file holds named subsets,
+    which steps can share, and named plans, each a list of steps.
+    '''
+    with open(file_path, 'r') as fp:
+      json_data = json.load(fp)
+    if plan_name not in json_data['plans']:
+      raise ValueError('Plan {0} is not defined in {1}.'.format(plan_name, file_path))
+    return cls.from_dict(plan_name, json_data['plans'][plan_name], json_data.get('subsets', {}))
+
+  def validate(self) -> None:
+    '''
+    Validates that step names are unique, that methods and objectives are supported, and
+    that dependencies exist and don't form a cycle.
+    '''
+    names = [step.name for step in self.steps]
+    if len(set(names)) != len(names):
+      raise ValueError('Step names in plan {0} must be unique.'.format(self.name))
+    for step in self.steps:
+      if step.method not in PLAN_METHODS:
+        raise ValueError('Method {0} of step {1} is not a valid option.'.format(step.method, step.name))
+      if step.objective not in PLAN_OBJECTIVES:
+        raise ValueError('Objective {0} of step {1} is not a valid option.'.format(step.objective, step.name))
+      for dependency in step.depends_on:
+        if dependency not in names:
+          raise ValueError('Step {0} depends on {1}, which is not in the plan.'.format(step.name, dependency))
+    ## a plan with a cycle can't be ordered ##
+    self.order()
+
+  def levels(self) -> list[list[PlanStep]]:
+    '''
+    Steps grouped into levels, where each level's steps only depend on steps in earlier
+    levels, keeping the plan's order within a level.
+    '''
+    levels, placed = [], set()
+    while len(placed) < len(self.steps):
+      ready = [
+        step for step in self.steps
+        if step.name not in placed and all(d in placed for d in step.depends_on)
+      ]
+      if len(ready) == 0:
+        raise ValueError('Steps in plan {0} have circular dependencies.'.format(self.name))
+      levels.append(ready)
+      placed.update(step.name for step in ready)
+    return levels
+
+  def order(self) -> list[PlanStep]:
+    '''
+    Steps ordered so each comes after the steps it depends on, keeping the plan's order
+    otherwise.
+    '''
+    return [step for level in self.levels() for step in level]
+
+  def width(self) -> int:
+    '''
+    The most steps that can run at once, which is the size of the widest level.
+    '''
+    return max([len(level) for level in self.levels()], default=0)
+
+  def select(self, step_names: list[str]) -> 'OptimizationPlan':
+    '''
+    A plan of only the named steps. Dependencies on steps that aren't selected are
+    dropped, so the selected steps start from the config as is.
+    '''
+    return OptimizationPlan(
+      name=self.name,
+      steps=[
+        PlanStep(
+          name=step.name,
+          subset=step.subset,
+          objective=step.objective,
+          method=step.method,
+          depends_on=[d for d in step.depends_on if d in step_names],
+          options=step.options
+        )
+        for step in self.steps if step.name in step_names
+      ]
+    )
@@ -1,14 +1,16 @@
 ## Built-in ##
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import Optional
 import math
 
 ## Packages ##
 import pandas as pd
+import numpy
 
 ## Models ##
 from .ModelConfig import ModelConfig
 from .Team import Team
+from .StateStore import StateStore, StoreField, NULL_SEASON
 
 ## utilities ##
 from .Utilities import s_curve, prog_disc
@@ -16,68 +18,120 @@ from .Utilities import s_curve, prog_disc
 @dataclass
 class QB:
     '''
-    An object that contains state about a quarterback
+    An object that contains state about a quarterback. State is held in a StateStore,
+    and the QB is a view onto a single index of that store.
     '''
     ## initing meta ##
-    player_id: str
-    player_name: str
-    config: ModelConfig
-    draft_number: Optional[int]
-    inital_league_avg: float
-    inital_team_avg: float
-    first_game_date: str
-    first_game_season: int
-    ## state ##
-    current_value: float = field(init=False)
-    current_variance: float = field(init=False)
-    rolling_value: float = field(init=False)
-    starts: int = field(init=False)
-    season_starts: int = field(init=False)
-    season_team_adjs_alotted: int = field(init=False)
-    season_team_adjs_received: int = field(init=False)
-    season_player_adjs_received: int = field(init=False)
-    last_game_date: Optional[str] = field(init=False)
-    last_game_season: Optional[int] = field(init=False)
-    last_game_team: Optional[str] = field(init=False)
+    store: StateStore = field(repr=False)
+    index: int
+    config: ModelConfig = field(repr=False)
     ## extra ##
-    params: dict = field(init=False)
+    params: dict = field(init=False, repr=False)
+    ## state ##
+    player_name = StoreField('qb', 'player_name')
+    draft_number = StoreField('qb', 'draft_number')
+    inital_league_avg = StoreField('qb', 'inital_league_avg')
+    inital_team_avg = StoreField('qb', 'inital_team_avg')
+    first_game_date = StoreField('qb', 'first_game_date')
+    first_game_season = StoreField('qb', 'first_game_season', null=NULL_SEASON)
+    current_value = StoreField('qb', 'current_value')
+    current_variance = StoreField('qb', 'current_variance')
+    rolling_value = StoreField('qb', 'rolling_value')
+    starts = StoreField('qb', 'starts')
+    season_starts = StoreField('qb', 'season_starts')
+    season_team_adjs_alotted = StoreField('qb', 'season_team_adjs_alotted')
+    season_team_adjs_received = StoreField('qb', 'season_team_adjs_received')
+    season_player_adjs_received = StoreField('qb', 'season_player_adjs_received')
+    last_game_date = StoreField('qb', 'last_game_date')
+    last_game_season = StoreField('qb', 'last_game_season', null=NULL_SEASON)
+    last_game_team = StoreField('qb', 'last_game_team')
 
     def __post_init__(self):
         '''
-        Check that the QB was created successfully. QB objects must be created via
-        the create class method so that league context can be used to set initial values.
-        If this was not done, an error is raised
+        convenience method to unpack the config
         '''
-        ## unpack the config for convenience ##
         self.params = self.config.values
-        ## calc the iniitial current value using the draft model ##
-        self.current_value = min(
+
+    @property
+    def player_id(self) -> str:
+        return self.store.qb_ids[self.index]
+
+    @staticmethod
+    def initial_value(
+        params: dict,
+        draft_number: Optional[float],
+        inital_team_avg: float,
+        inital_league_avg: float
+    ) -> float:
+        '''
+        Calculate a QB's value before their first start using the draft model
+
+        Parameters:
+        * params: The model config values
+        * draft_number: The QB's draft position, which may be null for undrafted QBs
+        * inital_team_avg: The team's average from the previous season
+        * inital_league_avg: The league's average from the previous season
+
+        Returns:
+        * The QB's initial value
+        '''
+        return min(
             ## value over team's previous average based on draft number ##
             (
-                self.params['rookie_draft_intercept'] +
-                (self.params['rookie_draft_slope'] * math.log(
-                    self.draft_number if not pd.isnull(self.draft_number) else self.params['rookie_undrafted_draft_number']
+                params['rookie_draft_intercept'] +
+                (params['rookie_draft_slope'] * math.log(
+                    draft_number if not pd.isnull(draft_number) else params['rookie_undrafted_draft_number']
                 ))
             ) +
             ## team value is regressed to the league average ##
             (
-                ((1-self.params['rookie_league_reg']) * self.inital_team_avg) +
-                (self.params['rookie_league_reg'] * self.inital_league_avg)
-            ) * (1+self.params['rookie_league_cap']),
+                ((1-params['rookie_league_reg']) * inital_team_avg) +
+                (params['rookie_league_reg'] * inital_league_avg)
+            ) * (1+params['rookie_league_cap']),
             ## value is capped at a discount of the league average ##
-            ((1+self.params['rookie_league_cap']) * self.inital_league_avg)
+            ((1+params['rookie_league_cap']) * inital_league_avg)
+        )
+
+    @classmethod
+    def create(cls,
+        store: StateStore,
+        index: int,
+        player_name: str,
+        config: ModelConfig,
+        draft_number: Optional[int],
+        inital_league_avg: float,
+        inital_team_avg: float,
+        first_game_date: str,
+        first_game_season: int
+    ) -> 'QB':
+        '''
+        Initialize a QB's state in the store, using league context to set the
+        initial value, and return a view onto it
+        '''
+        qb = cls(store=store, index=index, config=config)
+        qb.player_name = player_name
+        qb.draft_number = draft_number if not pd.isnull(draft_number) else numpy.nan
+        qb.inital_league_avg = inital_league_avg
+        qb.inital_team_avg = inital_team_avg
+        qb.first_game_date = first_game_date
+        qb.first_game_season = first_game_season
+        ## calc the iniitial current value using the draft model ##
+        qb.current_value = cls.initial_value(
+            qb.params, draft_number, inital_team_avg, inital_league_avg
         )
         ## set other initial values ##
-        self.current_variance = 1000
-        self.rolling_value = self.current_value
-        self.starts = 0
-        self.season_starts = 0
-        self.season_team_adjs_alotted = 0
-        self.season_team_adjs_received = 0
-        self.season_player_adjs_received = 0
-        self.last_game_date = None
-        self.last_game_season = None
-        self.last_game_team = None
+        qb.current_variance = 1000
+        qb.rolling_value = qb.current_value
+        qb.starts = 0
+        qb.season_starts = 0
+        qb.season_team_adjs_alotted = 0
+        qb.season_team_adjs_received = 0
+        qb.season_player_adjs_received = 0
+        qb.last_game_date = None
+        qb.last_game_season = None
+        qb.last_game_team = None
+        store.qb['initialized'][index] = True
+        return qb
     
     def as_record(self) -> dict:
         '''
@@ -0,0 +1,121 @@
+## Built-in ##
+from dataclasses import dataclass, field
+from typing import Optional
+import pathlib
+import shutil
+import tempfile
+
+## Packages ##
+import pandas as pd
+import numpy
+
+## game columns read by the QB model and its scoring ##
+MODEL_COLUMNS: list[str] = [
+    'game_id', 'season', 'week', 'gameday', 'team', 'opponent', 'player_id',
+    'player_display_name', 'draft_number', 'temp', 'wind', 'player_VALUE',
+    'team_VALUE', 'start_number'
+]
+
+@dataclass
+class SharedGames:
+    '''
+    A games dataset published once as memory-mapped numpy arrays, so worker processes
+    can attach to it without each receiving and holding their own copy.
+
+    Games are sorted as QBModel sorts them before publishing. Numeric columns are written
+    as is. String columns, like ids and dates, are written as integer codes, with their
+    (small) vocabularies kept on the object. Only the handle is pickled when it's sent
+    to a worker; arrays are mapped read-only from disk and shared through the page cache.
+    Workers read string columns as categoricals over the codes, and QBModel builds its
+    columns from the codes, so no worker decodes a column row by row.
+    '''
+    ## initing meta ##
+    folder: str
+    n_games: int
+    dtypes: dict[str, str]
+    vocabs: dict[str, list] = field(default_factory=dict)
+    ## attached arrays, which are not pickled ##
+    arrays: dict[str, numpy.ndarray] = field(default_factory=dict, init=False, repr=False)
+
+    @classmethod
+    def publish(cls, games: pd.DataFrame, columns: Optional[list[str]] = None) -> 'SharedGames':
+        '''
+        Writes the games to a temporary folder of memory-mappable arrays
+
+        Parameters:
+        * games: pd.DataFrame - the games
+        * columns: list[str] - columns to publish. Defaults to the model's columns that exist
+
+        Returns:
+        * SharedGames - a handle to the published games, which owns the folder until unlink
+        '''
+        columns = columns if columns is not None else [c for c in MODEL_COLUMNS if c in games.columns]
+        ## sort as QBModel.chrono_sort does so workers don't need to reorder ##
+        games = games.sort_values(
+            by=['season', 'week', 'game_id'],
+            ascending=[True, True, True]
+        ).reset_index(drop=True)
+        folder = tempfile.mkdtemp(prefix='nfeloqb_games_')
+        dtypes = {}
+        vocabs = {}
+        for col in columns:
+            values = games[col].to_numpy()
+            if values.dtype == object or not numpy.issubdtype(values.dtype, numpy.number):
+                ## encode strings, with nulls coded as -1 as categoricals code them ##
+                codes, uniques = pd.factorize(games[col])
+                values = codes.astype(numpy.int32)
+                vocabs[col] = list(uniques)
+            numpy.save('{0}/{1}.npy'.format(folder, col), values, allow_pickle=False)
+            dtypes[col] = values.dtype.str
+        return cls(
+            folder=folder,
+            n_games=len(games),
+            dtypes=dtypes,
+            vocabs=vocabs
+        )
+
+    def __getstate__(self) -> dict:
+        ## send the handle without any attached arrays ##
+        state = self.__dict__.copy()
+        state['arrays'] = {}
+        return state
+
+    def attach(self) -> dict[str, numpy.ndarray]:
+        '''
+        Maps the published arrays read-only, returning them keyed by column. String
+        columns are returned as their integer codes.
+        '''
+        if len(self.arrays) == 0:
+            self.arrays = {
+                col: numpy.load('{0}/{1}.npy'.format(self.folder, col), mmap_mode='r')
+                for col in self.dtypes
+            }
+        return self.arrays
+
+    def to_frame(self) -> pd.DataFrame:
+        '''
+        Builds a games df from the published arrays. Numeric columns are views of the mapped
+        arrays. String columns are categoricals over their codes and vocabularies, so they
+        are never decoded into a column of values.
+        '''
+        arrays = self.attach()
+        data = {}
+        for col in self.dtypes:
+            if col in self.vocabs:
+                data[col] = pd.Categorical.from_codes(arrays[col], categories=self.vocabs[col])
+            else:
+                data[col] = arrays[col]
+        return pd.DataFrame(data, copy=False)
+
+    def unlink(self) -> None:
+        '''
+        Removes the published arrays. Only the process that published them should call this,
+        once workers are done with them.
+        '''
+        self.arrays = {}
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    @property
+    def nbytes(self) -> int:
+        ## size of the published arrays on disk ##
+        return sum(p.stat().st_size for p in pathlib.Path(self.folder).glob('*.npy'))
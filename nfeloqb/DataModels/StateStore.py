@@ -0,0 +1,161 @@
+## Built-in ##
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+## Packages ##
+import numpy
+
+## column definitions as (name, dtype, reset value) ##
+## seasons use -1 in place of None so they can be held in an int array ##
+NULL_SEASON = -1
+QB_COLUMNS: list[tuple[str, Any, Any]] = [
+    ('initialized', bool, False),
+    ('player_name', object, None),
+    ('draft_number', numpy.float64, numpy.nan),
+    ('inital_league_avg', numpy.float64, numpy.nan),
+    ('inital_team_avg', numpy.float64, numpy.nan),
+    ('first_game_date', object, None),
+    ('first_game_season', numpy.int64, NULL_SEASON),
+    ('current_value', numpy.float64, numpy.nan),
+    ('current_variance', numpy.float64, numpy.nan),
+    ('rolling_value', numpy.float64, numpy.nan),
+    ('starts', numpy.int64, 0),
+    ('season_starts', numpy.int64, 0),
+    ('season_team_adjs_alotted', numpy.float64, 0),
+    ('season_team_adjs_received', numpy.float64, 0),
+    ('season_player_adjs_received', numpy.float64, 0),
+    ('last_game_date', object, None),
+    ('last_game_season', numpy.int64, NULL_SEASON),
+    ('last_game_team', object, None),
+]
+TEAM_COLUMNS: list[tuple[str, Any, Any]] = [
+    ('initialized', bool, False),
+    ('last_game_date_off', object, None),
+    ('last_game_season_off', numpy.int64, NULL_SEASON),
+    ('last_game_date_def', object, None),
+    ('last_game_season_def', numpy.int64, NULL_SEASON),
+    ('off_value', numpy.float64, numpy.nan),
+    ('def_value', numpy.float64, numpy.nan),
+    ('season_adjs', numpy.float64, 0),
+]
+## columns whose values depend on the config, which get a config axis in batched stores ##
+CONFIG_COLUMNS = {
+    'inital_league_avg', 'inital_team_avg', 'current_value', 'current_variance',
+    'rolling_value', 'season_team_adjs_alotted', 'season_team_adjs_received',
+    'season_player_adjs_received', 'off_value', 'def_value', 'season_adjs'
+}
+
+@dataclass(eq=False)
+class StateStore:
+    '''
+    Struct-of-arrays storage for QB and team state. QB and team ids are interned to
+    integer codes, which index into one numpy array per state column. The QB and Team
+    dataclasses are thin views over a single index of the store.
+
+    When n_configs is set, config dependent columns are allocated with a trailing
+    config axis so a single pass can update several configs at once. Indexing a
+    column by code then returns that QB or team's values across all configs. Views
+    are only supported on stores without a config axis.
+    '''
+    ## initing meta ##
+    qb_ids: list[str]
+    team_ids: list[str]
+    n_configs: Optional[int] = None
+    ## interned codes ##
+    qb_codes: dict[str, int] = field(init=False)
+    team_codes: dict[str, int] = field(init=False)
+    ## state ##
+    qb: dict[str, numpy.ndarray] = field(init=False, repr=False)
+    team: dict[str, numpy.ndarray] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        ## intern ids, removing dupes while keeping order ##
+        self.qb_ids = list(dict.fromkeys(self.qb_ids))
+        self.team_ids = list(dict.fromkeys(self.team_ids))
+        self.qb_codes = {k: i for i, k in enumerate(self.qb_ids)}
+        self.team_codes = {k: i for i, k in enumerate(self.team_ids)}
+        ## allocate arrays ##
+        self.qb = self.allocate(QB_COLUMNS, len(self.qb_ids))
+        self.team = self.allocate(TEAM_COLUMNS, len(self.team_ids))
+
+    def allocate(self, columns: list[tuple[str, Any, Any]], size: int) -> dict[str, numpy.ndarray]:
+        '''
+        Allocate a set of columns at their reset values
+        '''
+        return {
+            name: numpy.full(
+                (size, self.n_configs) if self.n_configs is not None and name in CONFIG_COLUMNS else size,
+                fill,
+                dtype=dtype
+            ) for name, dtype, fill in columns
+        }
+
+    def reset(self) -> None:
+        '''
+        Return every QB and team to an uninitialized state without reallocating
+        '''
+        for name, dtype, fill in QB_COLUMNS:
+            self.qb[name][:] = fill
+        for name, dtype, fill in TEAM_COLUMNS:
+            self.team[name][:] = fill
+
+    def grow(self, arrays: dict[str, numpy.ndarray], columns: list[tuple[str, Any, Any]], size: int) -> None:
+        '''
+        Extend a set of columns so they can hold at least `size` entries. Capacity is
+        doubled to keep repeated growth amortized.
+        '''
+        capacity = len(next(iter(arrays.values())))
+        if size <= capacity:
+            return
+        new_arrays = self.allocate(columns, max(size, capacity * 2))
+        for name in arrays:
+            new_arrays[name][:capacity] = arrays[name]
+            arrays[name] = new_arrays[name]
+
+    def intern_qb(self, player_id: str) -> int:
+        '''
+        Return the code for a QB, adding the QB to the store if it is new
+        '''
+        code = self.qb_codes.get(player_id)
+        if code is None:
+            code = len(self.qb_ids)
+            self.qb_ids.append(player_id)
+            self.qb_codes[player_id] = code
+            self.grow(self.qb, QB_COLUMNS, code + 1)
+        return code
+
+    def intern_team(self, team: str) -> int:
+        '''
+        Return the code for a team, adding the team to the store if it is new
+        '''
+        code = self.team_codes.get(team)
+        if code is None:
+            code = len(self.team_ids)
+            self.team_ids.append(team)
+            self.team_codes[team] = code
+            self.grow(self.team, TEAM_COLUMNS, code + 1)
+        return code
+
+
+class StoreField:
+    '''
+    Descriptor that exposes a single column of a StateStore as an attribute of a
+    view, so QB and Team logic can read and write state as if it were held on the object.
+    '''
+    def __init__(self, table: str, column: str, null: Optional[Any] = None):
+        self.table = table
+        self.column = column
+        self.null = null
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        value = getattr(view.store, self.table)[self.column].item(view.index)
+        if self.null is not None and value == self.null:
+            return None
+        return value
+
+    def __set__(self, view, value):
+        if value is None and self.null is not None:
+            value = self.null
+        getattr(view.store, self.table)[self.column][view.index] = value
@@ -1,34 +1,57 @@
 from dataclasses import dataclass, field
-from typing import Optional
 
 from .ModelConfig import ModelConfig
+from .StateStore import StateStore, StoreField, NULL_SEASON
 
 @dataclass
 class Team:
     '''
-    Object representing a team
+    Object representing a team. State is held in a StateStore, and the Team is a
+    view onto a single index of that store.
     '''
     ## initing meta ##
-    abbr: str
-    config: ModelConfig
-    ## state ##
-    last_game_date_off: Optional[str] = field(default=None, init=False)
-    last_game_season_off: Optional[int] = field(default=None, init=False)
-    last_game_date_def: Optional[str] = field(default=None, init=False)
-    last_game_season_def: Optional[int] = field(default=None, init=False)
-    off_value: float = field(init=False)
-    def_value: float = field(init=False)
-    season_adjs: float = field(default=0, init=False)
+    store: StateStore = field(repr=False)
+    index: int
+    config: ModelConfig = field(repr=False)
     ## extra ##
-    params: dict = field(init=False)
+    params: dict = field(init=False, repr=False)
+    ## state ##
+    last_game_date_off = StoreField('team', 'last_game_date_off')
+    last_game_season_off = StoreField('team', 'last_game_season_off', null=NULL_SEASON)
+    last_game_date_def = StoreField('team', 'last_game_date_def')
+    last_game_season_def = StoreField('team', 'last_game_season_def', null=NULL_SEASON)
+    off_value = StoreField('team', 'off_value')
+    def_value = StoreField('team', 'def_value')
+    season_adjs = StoreField('team', 'season_adjs')
 
     def __post_init__(self):
-        ## init the values ##
         ## unpack params from config for convenience ##
-        self.params = self.config.values    
+        self.params = self.config.values
+
+    @property
+    def abbr(self) -> str:
+        return self.store.team_ids[self.index]
+
+    @classmethod
+    def create(cls,
+        store: StateStore,
+        index: int,
+        config: ModelConfig
+    ) -> 'Team':
+        '''
+        Initialize a team's state in the store and return a view onto it
+        '''
+        team = cls(store=store, index=index, config=config)
         ## init the values ##
-        self.off_value = self.params['init_value']
-        self.def_value = 0 ## def is a relative measure, so it is initialized to 0
+        team.off_value = team.params['init_value']
+        team.def_value = 0 ## def is a relative measure, so it is initialized to 0
+        team.season_adjs = 0
+        team.last_game_date_off = None
+        team.last_game_season_off = None
+        team.last_game_date_def = None
+        team.last_game_season_def = None
+        store.team['initialized'][index] = True
+        return team
     
     def update_off_value(self,
         value: float,
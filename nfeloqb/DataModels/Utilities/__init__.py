@@ -1,2 +1,3 @@
-from .s_curve import s_curve
-from .prog_disc import prog_disc
\ No newline at end of file
+from .s_curve import s_curve, s_curve_array, s_curve_table
+from .prog_disc import prog_disc, prog_disc_cap, prog_disc_array
+from .dual import Dual, dual_log
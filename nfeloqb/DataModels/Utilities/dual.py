@@ -0,0 +1,129 @@
+## Built-in ##
+import math
+from typing import Union
+
+## Packages ##
+import numpy
+
+class Dual:
+    '''
+    A forward mode dual number, holding a value and its derivatives with respect to a set
+    of inputs. Arithmetic with floats and other duals carries the derivatives along, so
+    scalar functions like s_curve and prog_disc work on duals unchanged.
+
+    Values are plain python floats, computed with the same operations as the float
+    arithmetic they replace, so a calculation on duals produces exactly the same value
+    as it would on floats. Powers are taken with numpy.power, as the s_curve and
+    prog_disc kernels take them. Comparisons are on values, so branches like min() take the
+    same path they would on floats, and the derivative is that of the path taken.
+    '''
+    __slots__ = ('v', 'd')
+    __hash__ = None
+
+    def __init__(self, v: float, d: numpy.ndarray):
+        self.v = v ## value ##
+        self.d = d ## derivatives with respect to each input ##
+
+    @classmethod
+    def seed(cls, v: float, index: int, n: int) -> 'Dual':
+        '''
+        An input to differentiate with respect to, at position index of n inputs.
+        '''
+        d = numpy.zeros(n)
+        d[index] = 1.0
+        return cls(v, d)
+
+    def __repr__(self) -> str:
+        return 'Dual({0}, {1})'.format(self.v, self.d)
+
+    def __float__(self) -> float:
+        return float(self.v)
+
+    ## arithmetic ##
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.v + other.v, self.d + other.d)
+        return Dual(self.v + other, self.d)
+
+    def __radd__(self, other):
+        return Dual(other + self.v, self.d)
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.v - other.v, self.d - other.d)
+        return Dual(self.v - other, self.d)
+
+    def __rsub__(self, other):
+        return Dual(other - self.v, -self.d)
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.v * other.v, self.d * other.v + other.d * self.v)
+        return Dual(self.v * other, self.d * other)
+
+    def __rmul__(self, other):
+        return Dual(other * self.v, self.d * other)
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            v = self.v / other.v
+            return Dual(v, (self.d - other.d * v) / other.v)
+        return Dual(self.v / other, self.d / other)
+
+    def __rtruediv__(self, other):
+        v = other / self.v
+        return Dual(v, self.d * (-v / self.v))
+
+    def __pow__(self, other):
+        exponent = value(other)
+        v = float(numpy.power(self.v, exponent))
+        d = self.d * (
+            exponent * v / self.v if self.v != 0
+            else exponent * float(numpy.power(self.v, exponent - 1))
+        )
+        if isinstance(other, Dual) and self.v > 0:
+            d = d + other.d * (v * math.log(self.v))
+        return Dual(v, d)
+
+    def __rpow__(self, other):
+        v = float(numpy.power(other, self.v))
+        return Dual(v, self.d * (v * math.log(other)))
+
+    def __neg__(self):
+        return Dual(-self.v, -self.d)
+
+    def __abs__(self):
+        return Dual(-self.v, -self.d) if self.v < 0 else self
+
+    ## comparisons, on values ##
+    def __lt__(self, other):
+        return self.v < value(other)
+
+    def __le__(self, other):
+        return self.v <= value(other)
+
+    def __gt__(self, other):
+        return self.v > value(other)
+
+    def __ge__(self, other):
+        return self.v >= value(other)
+
+    def __eq__(self, other):
+        return self.v == value(other)
+
+    def __ne__(self, other):
+        return self.v != value(other)
+
+def value(x: Union[Dual, float]) -> float:
+    '''
+    The value of a dual, or a float as is.
+    '''
+    return x.v if isinstance(x, Dual) else x
+
+def dual_log(x: Union[Dual, float]) -> Union[Dual, float]:
+    '''
+    Natural log of a dual or a float, using math.log for the value.
+    '''
+    if isinstance(x, Dual):
+        return Dual(math.log(x.v), x.d / x.v)
+    return math.log(x)
@@ -1,8 +1,39 @@
+## Built-in ##
+import math
+from typing import Optional
+
+## Packages ##
+import numpy
+
+def prog_disc_cap(
+    scale: float,
+    alpha: float
+) -> float:
+    '''
+    The error cap used by prog_disc, which only depends on the scale and alpha. It can be
+    computed once and passed to prog_disc when the scale and alpha don't change.
+    '''
+    cap = 0.309 * numpy.power(alpha, -0.864) * scale
+    return float(cap) if isinstance(cap, numpy.floating) else cap
+
+def prog_disc_error(
+    capped_error: numpy.ndarray,
+    scale: float,
+    alpha: numpy.ndarray
+) -> numpy.ndarray:
+    '''
+    The discounted size of an error that has already been capped. This is the single
+    implementation of the discount, which prog_disc and prog_disc_array share, so every
+    engine gets exactly the same values. Inputs can be floats, arrays, or duals.
+    '''
+    return numpy.power(capped_error, 1 - numpy.minimum((capped_error / scale) * alpha, 1))
+
 def prog_disc(
     obs: float,
     proj: float,
     scale: float,
-    alpha: float
+    alpha: float,
+    cap: Optional[float] = None
 ) -> float:
     '''
     Progressively discount a value as it moves away from zero, with an additional cap
@@ -20,6 +51,7 @@ def prog_disc(
     * proj: The projected value
     * scale: The scale of the error. Scale * 15 should align with where the long tail begins
     * alpha: The aggressiveness of the discounting. Reasonable values are between 0 and 0.005
+    * cap: Optional precomputed prog_disc_cap(scale, alpha)
 
     Returns:
     * The processed obs
@@ -30,26 +62,34 @@ def prog_disc(
     ## control for instances with no error or discounting
     if abs_error == 0 or alpha == 0:
         return obs
-    ## attempt to calc processed value while controlling for overflow errors ##
-    try:
-        return (
-            proj +
-            (
-                error_direction *
-                ## process error ##
-                min(
-                    abs_error, 0.309 * (alpha ** -0.864) * scale
-                ) ** (
-                    1 -
-                    min(
-                        (
-                            min(abs_error, 0.309 * (alpha ** -0.864) * scale) /
-                            scale
-                        ) * alpha,
-                        1
-                    )
-                )
-            )
-        )
-    except OverflowError:
+    if cap is None:
+        cap = prog_disc_cap(scale, alpha)
+    ## process the error, returning obs if the calculation overflows, as prog_disc_array does ##
+    discounted = prog_disc_error(min(abs_error, cap), scale, alpha)
+    if isinstance(discounted, numpy.floating):
+        discounted = float(discounted)
+    if not math.isfinite(discounted):
         return obs
+    return proj + error_direction * discounted
+
+def prog_disc_array(
+    obs: numpy.ndarray,
+    proj: numpy.ndarray,
+    scale: float,
+    alpha: numpy.ndarray
+) -> numpy.ndarray:
+    '''
+    Array version of prog_disc. Obs, proj, and alpha broadcast against each other, so
+    errors can be processed for several configs at once. As in prog_disc, obs is returned
+    where there is no error, no discounting, or the calculation overflows.
+    '''
+    with numpy.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        abs_error = numpy.absolute(obs - proj)
+        error_direction = numpy.where(obs >= proj, 1.0, -1.0)
+        capped_error = numpy.minimum(abs_error, prog_disc_cap(scale, alpha))
+        processed = proj + error_direction * prog_disc_error(capped_error, scale, alpha)
+    return numpy.where(
+        (abs_error == 0) | (alpha == 0) | ~numpy.isfinite(processed),
+        obs,
+        processed
+    )
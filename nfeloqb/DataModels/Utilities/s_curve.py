@@ -1,3 +1,35 @@
+## Built-in ##
+import functools
+
+## Packages ##
+import numpy
+
+def s_curve_array(
+    height: numpy.ndarray,
+    mp: numpy.ndarray,
+    x: numpy.ndarray,
+    direction: str = 'down'
+) -> numpy.ndarray:
+    '''
+    Calculate an s-curve for discounting or ramping values. Height, mp, and x broadcast
+    against each other, so a curve can be evaluated over games, configs, or both at once.
+
+    This is the single implementation of the curve, which s_curve and s_curve_table
+    evaluate, so every engine gets exactly the same values. Inputs can also be duals, in
+    which case the curve is evaluated on them element by element.
+
+    Parameters:
+    * height: The maximum value of the curve
+    * mp: The midpoint of the curve
+    * x: The x-values to calculate the curve for
+    * direction: The direction of the curve, either 'down' or 'up'
+    '''
+    down = 1 - (1 / (1 + numpy.power(1.5, (-1 * (x - mp)) * (10 / mp))))
+    if direction == 'down':
+        return down * height
+    else:
+        return (1 - down) * height
+
 def s_curve(
     height: float,
     mp: float,
@@ -5,7 +37,7 @@ def s_curve(
     direction: str = 'down'
 ) -> float:
     '''
-    Calculate an s-curve for discounting or ramping values
+    Calculate an s-curve for discounting or ramping values, for a single x
 
     Parameters:
     * height: The maximum value of the curve
@@ -13,17 +45,28 @@ def s_curve(
     * x: The x-value to calculate the curve for
     * direction: The direction of the curve, either 'down' or 'up'
     '''
-    if direction == 'down':
-        return (
-            1 - (1 / (1 + 1.5 ** (
-                (-1 * (x - mp)) *
-                (10 / mp)
-            )))
-        ) * height
-    else:
-        return (1-(
-            1 - (1 / (1 + 1.5 ** (
-                (-1 * (x - mp)) *
-                (10 / mp)
-            )))
-        )) * height
\ No newline at end of file
+    value = s_curve_array(height, mp, x, direction)
+    return float(value) if isinstance(value, numpy.floating) else value
+
+@functools.lru_cache(maxsize=256)
+def s_curve_table(
+    height: float,
+    mp: float,
+    size: int,
+    direction: str = 'down'
+) -> tuple[float, ...]:
+    '''
+    Lookup table of s_curve evaluated at the integers 0 through size - 1, for curves
+    over counts such as starts. Tables are cached by their arguments, so each config
+    builds its tables once.
+
+    Parameters:
+    * height: The maximum value of the curve
+    * mp: The midpoint of the curve
+    * size: The number of integer x-values in the table
+    * direction: The direction of the curve, either 'down' or 'up'
+
+    Returns:
+    * A tuple where the value at index x is s_curve(height, mp, x, direction)
+    '''
+    return tuple(s_curve_array(height, mp, numpy.arange(size, dtype=numpy.float64), direction).tolist())
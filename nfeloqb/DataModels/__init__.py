@@ -1,5 +1,9 @@
 from .ModelConfig import ModelConfig
 from .ModelParam import ModelParam
+from .StateStore import StateStore
+from .ModelOutput import ModelOutput
+from .SharedGames import SharedGames
 from .QB import QB
 from .Team import Team
 from .GameContext import GameContext
+from .OptimizationPlan import OptimizationPlan, PlanStep
@@ -0,0 +1,118 @@
+## built-in packages ##
+from typing import Optional
+
+## external packages ##
+import numpy
+
+class CMAES:
+  '''
+  Covariance matrix adaptation evolution strategy over the normalized param box. Each
+  generation samples a population from a multivariate normal, and the mean, step size,
+  and covariance are adapted toward the best members. Candidates are clipped to the box
+  and the clipped points are used in the update.
+
+  Sampling only uses the strategy's own generator, so the same seed gives the same
+  search, and state() captures everything needed to continue a search exactly.
+  '''
+  def __init__(self,
+    mean: list[float],
+    sigma: float = 0.3,
+    popsize: Optional[int] = None,
+    seed: Optional[int] = None
+  ):
+    n = len(mean)
+    self.n: int = n
+    self.popsize: int = popsize if popsize is not None else 4 + int(3 * numpy.log(n))
+    self.mu: int = self.popsize // 2
+    ## recombination weights ##
+    weights = numpy.log(self.mu + 0.5) - numpy.log(numpy.arange(1, self.mu + 1))
+    self.weights: numpy.ndarray = weights / weights.sum()
+    self.mueff: float = 1 / numpy.sum(self.weights ** 2)
+    ## adaptation rates ##
+    self.cc: float = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+    self.cs: float = (self.mueff + 2) / (n + self.mueff + 5)
+    self.c1: float = 2 / ((n + 1.3) ** 2 + self.mueff)
+    self.cmu: float = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+    self.damps: float = 1 + 2 * max(0, numpy.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+    self.chi_n: float = numpy.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+    ## state ##
+    self.mean: numpy.ndarray = numpy.clip(numpy.asarray(mean, dtype=float), 0, 1)
+    self.sigma: float = sigma
+    self.pc: numpy.ndarray = numpy.zeros(n)
+    self.ps: numpy.ndarray = numpy.zeros(n)
+    self.C: numpy.ndarray = numpy.eye(n)
+    self.generation: int = 0
+    self.rng: numpy.random.Generator = numpy.random.default_rng(seed)
+
+  def decompose(self) -> tuple[numpy.ndarray, numpy.ndarray]:
+    '''
+    Eigenbasis and axis lengths of the covariance.
+    '''
+    self.C = (self.C + self.C.T) / 2
+    eigenvalues, B = numpy.linalg.eigh(self.C)
+    return B, numpy.sqrt(numpy.maximum(eigenvalues, 1e-20))
+
+  def ask(self) -> numpy.ndarray:
+    '''
+    Samples the next generation, clipped to the box, one row per candidate.
+    '''
+    B, D = self.decompose()
+    z = self.rng.standard_normal((self.popsize, self.n))
+    return numpy.clip(self.mean + self.sigma * (z * D) @ B.T, 0, 1)
+
+  def tell(self, xs: numpy.ndarray, fs: numpy.ndarray) -> None:
+    '''
+    Adapts the strategy to a generation's candidates and their objective values.
+    '''
+    B, D = self.decompose()
+    order = numpy.argsort(fs, kind='stable')
+    y = (numpy.asarray(xs)[order[:self.mu]] - self.mean) / self.sigma
+    y_w = self.weights @ y
+    self.mean = self.mean + self.sigma * y_w
+    ## step size path, in the covariance's whitened coordinates ##
+    c_inv_sqrt = B @ numpy.diag(1 / D) @ B.T
+    self.ps = (1 - self.cs) * self.ps + numpy.sqrt(self.cs * (2 - self.cs) * self.mueff) * (c_inv_sqrt @ y_w)
+    h_sigma = (
+      numpy.linalg.norm(self.ps) / numpy.sqrt(1 - (1 - self.cs) ** (2 * (self.generation + 1))) / self.chi_n
+    ) < 1.4 + 2 / (self.n + 1)
+    ## covariance path and update ##
+    self.pc = (1 - self.cc) * self.pc + h_sigma * numpy.sqrt(self.cc * (2 - self.cc) * self.mueff) * y_w
+    self.C = (
+      (1 - self.c1 - self.cmu) * self.C +
+      self.c1 * (numpy.outer(self.pc, self.pc) + (1 - h_sigma) * self.cc * (2 - self.cc) * self.C) +
+      self.cmu * (y.T * self.weights) @ y
+    )
+    self.sigma = self.sigma * numpy.exp((self.cs / self.damps) * (numpy.linalg.norm(self.ps) / self.chi_n - 1))
+    self.generation += 1
+
+  def converged(self, tol: float) -> bool:
+    '''
+    Whether the search distribution has shrunk below tol along every axis.
+    '''
+    return self.sigma * numpy.sqrt(numpy.max(numpy.diag(self.C))) < tol
+
+  def state(self) -> dict:
+    '''
+    The strategy's adapted state and generator state, which can be restored with restore.
+    '''
+    return {
+      'mean' : self.mean.copy(),
+      'sigma' : self.sigma,
+      'pc' : self.pc.copy(),
+      'ps' : self.ps.copy(),
+      'C' : self.C.copy(),
+      'generation' : self.generation,
+      'rng' : self.rng.bit_generator.state
+    }
+
+  def restore(self, state: dict) -> None:
+    '''
+    Continues from a state returned by state.
+    '''
+    self.mean = state['mean'].copy()
+    self.sigma = state['sigma']
+    self.pc = state['pc'].copy()
+    self.ps = state['ps'].copy()
+    self.C = state['C'].copy()
+    self.generation = state['generation']
+    self.rng.bit_generator.state = state['rng']
@@ -0,0 +1,114 @@
+## built-in packages ##
+from typing import Optional
+import os
+import json
+import pathlib
+import datetime
+
+## external packages ##
+import numpy
+
+## data models ##
+from .InFlightLog import json_default
+
+class Campaign:
+  '''
+  State of a resumable optimization campaign, kept in a directory named by the campaign's
+  id. The campaign records the seed every start and step is derived from, the starts and
+  steps that have completed along with the best record of each subset, and an evaluation
+  cache of every config scored. A campaign that was killed can be rerun with the same id,
+  skipping completed work, and replaying the evaluations of in-progress starts from the
+  cache, so they continue from the iterate they were on rather than being run again.
+
+  State files are written then swapped, so an interrupted write leaves the last state.
+  Each subset's starts are written only by the process running them.
+  '''
+  def __init__(self,
+    campaign_id: str,
+    seed: Optional[int] = None,
+    state_dir: Optional[str] = None
+  ):
+    self.campaign_id: str = campaign_id
+    self.state_dir: str = state_dir if state_dir is not None else '{0}/Campaigns/{1}'.format(
+      pathlib.Path(__file__).parent.resolve(),
+      campaign_id
+    )
+    os.makedirs(self.state_dir, exist_ok=True)
+    self.file_path: str = '{0}/campaign.json'.format(self.state_dir)
+    ## evaluation cache shared by every start and step of the campaign ##
+    self.cache: str = '{0}/evaluations.db'.format(self.state_dir)
+    ## a new campaign records its seed, which is drawn from fresh entropy if not given ##
+    state = self.read(self.file_path)
+    if state is None:
+      state = {
+        'campaign_id' : campaign_id,
+        'seed' : seed if seed is not None else int(numpy.random.SeedSequence().entropy),
+        'created' : datetime.datetime.now().isoformat(),
+        'steps' : {}
+      }
+      self.write(self.file_path, state)
+    elif seed is not None and seed != state['seed']:
+      raise ValueError('Campaign {0} was started with seed {1}, not {2}.'.format(campaign_id, state['seed'], seed))
+    self.seed: int = state['seed']
+
+  def read(self, file_path: str) -> Optional[dict]:
+    '''
+    Reads a state file, or returns None if it hasn't been written.
+    '''
+    if not os.path.exists(file_path):
+      return None
+    with open(file_path, 'r', encoding='utf-8') as f:
+      return json.load(f)
+
+  def write(self, file_path: str, state: dict) -> None:
+    '''
+    Writes a state file, swapping it in once it is complete.
+    '''
+    with open('{0}.tmp'.format(file_path), 'w', encoding='utf-8') as f:
+      json.dump(state, f, default=json_default, indent=2)
+      f.flush()
+      os.fsync(f.fileno())
+    os.replace('{0}.tmp'.format(file_path), file_path)
+
+  def starts_path(self, subset_name: str) -> str:
+    '''
+    Location of a subset's completed starts.
+    '''
+    return '{0}/{1}_starts.json'.format(self.state_dir, subset_name)
+
+  def checkpoint(self, subset_name: str) -> str:
+    '''
+    Location of the cmaes checkpoint of a subset.
+    '''
+    return '{0}/{1}.ckpt'.format(self.state_dir, subset_name)
+
+  def completed_starts(self, subset_name: str) -> list[dict]:
+    '''
+    Best records of the subset's completed starts.
+    '''
+    state = self.read(self.starts_path(subset_name))
+    return state['starts'] if state is not None else []
+
+  def complete_start(self, subset_name: str, record: dict, objective_name: str = 'mae') -> None:
+    '''
+    Records a completed start of a subset, along with the subset's best record so far.
+    '''
+    state = self.read(self.starts_path(subset_name)) or {'starts' : [], 'best' : None}
+    state['starts'].append(record)
+    if state['best'] is None or record[objective_name] < state['best'][objective_name]:
+      state['best'] = record
+    self.write(self.starts_path(subset_name), state)
+
+  def completed_steps(self) -> dict[str, dict]:
+    '''
+    Records of the plan steps that have completed, by step name.
+    '''
+    return self.read(self.file_path)['steps']
+
+  def complete_step(self, record: dict) -> None:
+    '''
+    Records a completed plan step.
+    '''
+    state = self.read(self.file_path)
+    state['steps'][record['step']] = record
+    self.write(self.file_path, state)
@@ -1,17 +1,26 @@
 ## built-in packages ##
-from typing import Tuple, Any, Optional
+from typing import Tuple, Any, Optional, Callable
 import pathlib
+import pickle
+import os
 import time
 import datetime
 
 ## external packages ##
 import pandas as pd
 import numpy
-from scipy.optimize import minimize
+from scipy.optimize import minimize, OptimizeResult
+from scipy.stats import qmc
 
 ## data models ##
 from ..DataModels import ModelConfig, ModelParam
-from ..Resources import QBModel
+from ..Resources import ModelSession, BatchQBModel, DualQBModel
+from .EvaluationPool import EvaluationPool
+from .EvaluationCache import EvaluationCache
+from .Surrogate import GaussianProcess, propose_batch
+from .InFlightLog import InFlightLog
+from .Telemetry import OptimizerTelemetry
+from .CMAES import CMAES
 
 class ConfigOptimizer:
   '''
@@ -26,8 +35,24 @@ class ConfigOptimizer:
     method: str = 'SLSQP',
     subset: list[str] = [],
     subset_name: str = 'subset',
+    exclude_seasons: list[int] = [],
     obj_normalization: int = 30,
-    randomize_bgs: bool = False
+    randomize_bgs: bool = False,
+    gradient: Optional[str] = None,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    save_in_flight: bool = True,
+    cache: Optional[str] = None,
+    early_abort: bool = False,
+    backend: str = 'minimize',
+    budget: int = 100,
+    batch_size: int = 4,
+    popsize: Optional[int] = None,
+    checkpoint: Optional[str] = None,
+    eta: int = 3,
+    min_seasons: int = 2,
+    progress: bool = False,
+    telemetry_interval: float = 10.0
   ):
     self.data: pd.DataFrame = data
     self.config: ModelConfig = config
@@ -35,6 +60,7 @@ class ConfigOptimizer:
     self.validate_objective()
     self.subset: list[str] = subset
     self.subset_name: str = subset_name
+    self.exclude_seasons: list[int] = exclude_seasons ## seasons left out of scoring, like a held out fold ##
     ## optimizer setup ##
     self.features: list[str] = []
     self.bgs: list[float] = []
@@ -44,7 +70,57 @@ class ConfigOptimizer:
     self.method: str = method
     self.obj_normalization: int = obj_normalization
     self.randomize_bgs: bool = randomize_bgs
+    self.seed: Optional[int] = seed ## seed for randomized best guesses ##
+    self.rng: numpy.random.Generator = numpy.random.default_rng(seed)
+    self.save_in_flight: bool = save_in_flight
+    in_flight_loc = '{0}/In-flight Results/{1}{2}'.format(
+      pathlib.Path(__file__).parent.resolve(),
+      datetime.datetime.now().strftime('%Y%m%d'),
+      '_{0}'.format(subset_name) if len(subset) > 0 else ''
+    )
+    self.in_flight: Optional[InFlightLog] = None
+    if save_in_flight:
+      self.in_flight = InFlightLog('{0}.jsonl'.format(in_flight_loc))
+    self.early_abort: bool = early_abort
+    self.gradient: Optional[str] = gradient
+    self.validate_gradient()
+    self.backend: str = backend
+    self.budget: int = budget ## model evaluations for the surrogate and cmaes backends ##
+    self.batch_size: int = batch_size ## points evaluated together by the surrogate backend ##
+    self.popsize: Optional[int] = popsize ## candidates per cmaes generation, which defaults to 4 + 3ln(n) ##
+    self.checkpoint: Optional[str] = checkpoint ## where the cmaes backend saves each generation ##
+    self.eta: int = eta ## the halving backend promotes the best 1/eta of configs at each rung ##
+    self.min_seasons: int = min_seasons ## scored seasons in the halving backend's shortest history ##
+    self.validate_backend()
+    self.validate_early_abort()
+    ## running telemetry, written next to the in-flight log ##
+    self.telemetry: OptimizerTelemetry = OptimizerTelemetry(
+      file_path='{0}_telemetry.json'.format(in_flight_loc) if save_in_flight else None,
+      budget=budget if backend in ['surrogate', 'cmaes', 'halving'] else None,
+      interval=telemetry_interval,
+      progress=progress
+    )
     self.init_features()
+    ## games are prepared once and reused by every evaluation ##
+    self.session: ModelSession = ModelSession(self.data, self.config)
+    ## worker processes for parallel gradients, started on first use ##
+    self.pool: EvaluationPool = EvaluationPool(self.data, workers)
+    self.last_evaluation: Optional[Tuple[numpy.ndarray, float]] = None ## most recent objective x and value ##
+    ## forward mode model for dual gradients, prepared on first use ##
+    self.dual_model: Optional[DualQBModel] = None
+    ## sessions on histories truncated after a season, prepared on first use ##
+    self.truncated_sessions: dict[int, ModelSession] = {}
+    ## optional persistent cache of scored records, keyed to these games and the model version ##
+    self.cache: Optional[EvaluationCache] = None
+    if cache is not None:
+      self.cache = EvaluationCache(
+        cache,
+        '{0}:{1}{2}'.format(
+          self.session.model.checkpoint_version,
+          self.session.model.games_hash(len(self.session.model.games)),
+          ':x{0}'.format(','.join(str(s) for s in sorted(self.exclude_seasons))) if len(self.exclude_seasons) > 0 else ''
+        )
+      )
     ## in-optimization data ##
     self.round_number: int = 0
     self.optimization_records: list[dict] = []
@@ -58,9 +134,53 @@ class ConfigOptimizer:
     Validates whether the objective is a valid option returned
     by the scored record.
     '''
-    if self.objective_name not in ['mae', 'mae_first_16', 'mae_backup']:
+    if self.objective_name not in ['mae', 'season_mae', 'mae_first_16', 'mae_backup']:
       raise ValueError('Objective {0} is not a valid option returned by the scored record.'.format(self.objective_name))
 
+  def validate_gradient(self):
+    '''
+    Validates the gradient option. None leaves gradient estimation to scipy,
+    'batch' evaluates the finite difference stencil in a single batched model pass,
+    'parallel' evaluates the stencil's points concurrently in worker processes, and
+    'dual' returns the exact gradient along with the objective from a single forward
+    mode run.
+    '''
+    if self.gradient not in [None, 'batch', 'parallel', 'dual']:
+      raise ValueError('Gradient {0} is not a valid option.'.format(self.gradient))
+
+  def validate_backend(self):
+    '''
+    Validates the search backend. 'minimize' runs scipy's minimize on the objective,
+    'surrogate' runs a Bayesian optimization that fits a Gaussian process to evaluated
+    configs and picks batches of new ones by expected improvement, and 'cmaes' runs a
+    population based CMA-ES search. Both stop at the budget. 'halving' runs a Hyperband
+    search, which scores many configs on truncated game histories and only promotes the
+    best to longer ones, stopping once the budget, in full runs, is spent.
+    '''
+    if self.backend not in ['minimize', 'surrogate', 'cmaes', 'halving']:
+      raise ValueError('Backend {0} is not a valid option.'.format(self.backend))
+    if self.backend == 'surrogate' and (self.budget < 1 or self.batch_size < 1):
+      raise ValueError('The surrogate backend needs a positive budget and batch size.')
+    if self.backend == 'cmaes' and (self.budget < 1 or (self.popsize is not None and self.popsize < 2)):
+      raise ValueError('The cmaes backend needs a positive budget and a popsize of at least 2.')
+    if self.backend == 'halving' and (self.budget < 1 or self.eta < 2 or self.min_seasons < 1):
+      raise ValueError('The halving backend needs a positive budget and min seasons, and an eta of at least 2.')
+
+  def validate_early_abort(self):
+    '''
+    Validates that early abort is only used with the mae objective, which is the only
+    objective scored over a fixed set of games, and with the cmaes or halving backends.
+    Aborted evaluations return a lower bound on the mae, so early abort only suits searches
+    that rank candidates against the incumbent. Finite differences, and the surrogate's
+    Gaussian process, would be fit to the understated errors.
+    '''
+    if self.early_abort and self.backend not in ['cmaes', 'halving']:
+      raise ValueError('Early abort is only supported by the cmaes and halving backends, not {0}.'.format(self.backend))
+    if self.early_abort and self.objective_name != 'mae':
+      raise ValueError('Early abort is only supported for the mae objective, not {0}.'.format(self.objective_name))
+    if self.early_abort and len(self.exclude_seasons) > 0:
+      raise ValueError('Early abort bounds every scored season, so it can\'t be used with excluded seasons.')
+
   def normalize_param(self, value: float, param: ModelParam) -> float:
     '''
     Normalize a parameter to a value between 0 and 1.
@@ -95,43 +215,43 @@ class ConfigOptimizer:
       self.features.append(k)
       self.bgs.append(
         self.normalize_param(v.value, v) if not self.randomize_bgs
-        else numpy.random.uniform(0, 1)
+        else self.rng.uniform(0, 1)
       )
       self.bounds.append((0,1)) ## all features are normalized ##
 
-  def objective(self, x: list[float]) -> float:
+  def config_from_optimizer_values(self, x: list[float]) -> ModelConfig:
     '''
-    Objective function for the optimizer.
+    Creates a stand alone ModelConfig from optimizer values.
+    '''
+    with self.telemetry.phase('build'):
+      ## create a denormalized config ##
+      denormalized_dict = self.denormalize_optimizer_values(x)
+      ## transalte into a config compatible dict ##
+      denormalized_config_dict = {}
+      for k, v in denormalized_dict.items():
+        denormalized_config_dict[k] = {
+          'param_name': k,
+          'value': v,
+          'description': 'none, created from denormalized optimizer values',
+          'opti_min': numpy.nan,
+          'opti_max': numpy.nan
+        }
+      ## create a new config object ##
+      return ModelConfig.from_dict(denormalized_config_dict)
+
+  def record_evaluation(self, scored_record: dict) -> None:
+    '''
+    Adds a scored record to the optimization records and appends it to the in-flight
+    log, which is synced to disk on a new best or every 100 rounds.
     '''
     ## increment the round number ##
     self.round_number += 1
-    ## initialize a QBModel ##
-    ## create a denormalized config ##
-    denormalized_dict = self.denormalize_optimizer_values(x)
-    ## transalte into a config compatible dict ##
-    denormalized_config_dict = {}
-    for k, v in denormalized_dict.items():
-      denormalized_config_dict[k] = {
-        'param_name': k,
-        'value': v,
-        'description': 'none, created from denormalized optimizer values',
-        'opti_min': numpy.nan,
-        'opti_max': numpy.nan
-      }
-    ## create a new config object ##
-    denormalized_config = ModelConfig.from_dict(denormalized_config_dict)
-    ## create the model ##
-    model = QBModel(
-      self.data,
-      denormalized_config
-    )
-    ## run the model ##
-    model.run_model()
-    ## score the model ##
-    scored_record = model.score_model(add_elo=False)
     ## add the record to the optimization records ##
     self.optimization_records.append(scored_record)
-    ## save the record if it is a new best, or if it an interval of 100 rounds ##
+    with self.telemetry.phase('io'):
+      if self.in_flight is not None:
+        self.in_flight.append(scored_record)
+    ## sync the log if it is a new best, or if it an interval of 100 rounds ##
     save_record = False
     if self.best_obj is None:
       self.best_obj = scored_record[self.objective_name]
@@ -141,15 +261,378 @@ class ConfigOptimizer:
       save_record = True
     if self.round_number % 100 == 0:
       save_record = True
-    if save_record:
-      df = pd.DataFrame(self.optimization_records)
-      df.to_csv('{0}/In-flight Results/{1}{2}.csv'.format(
-        pathlib.Path(__file__).parent.resolve(),
-        datetime.datetime.now().strftime('%Y%m%d'),
-        '_{0}'.format(self.subset_name) if len(self.subset) > 0 else ''
-      ))
+    with self.telemetry.phase('io'):
+      if save_record and self.in_flight is not None:
+        self.in_flight.sync()
+      ## update and report telemetry ##
+      self.telemetry.record(self.best_obj)
+      if self.cache is not None:
+        self.telemetry.update_cache(self.cache.hits, self.cache.misses)
+      self.telemetry.report()
+
+  def score_configs(self, configs: list[ModelConfig], run_configs: Callable[[list[ModelConfig]], list[dict]]) -> list[dict]:
+    '''
+    Scored records for each config, read from the evaluation cache where possible. Configs
+    that aren't cached are scored by run_configs, and added to the cache.
+    '''
+    ## key on the values before running, since a run can normalize them ##
+    values = [config.values.copy() for config in configs]
+    with self.telemetry.phase('io'):
+      records = [
+        self.cache.get(v, self.objective_name) if self.cache is not None else None
+        for v in values
+      ]
+    missing = [i for i, record in enumerate(records) if record is None]
+    if len(missing) > 0:
+      for i, record in zip(missing, run_configs([configs[i] for i in missing])):
+        records[i] = record
+        ## aborted records only hold a bound, so they aren't cached ##
+        if self.cache is not None and not record.get('aborted', False):
+          with self.telemetry.phase('io'):
+            self.cache.put(values[i], self.objective_name, record)
+    return records
+
+  def run_session(self, configs: list[ModelConfig]) -> list[dict]:
+    '''
+    Scores configs one at a time on the prepared games. With early abort, each run is
+    bounded by the incumbent, so a config stops as soon as it can't beat the best mae.
+    '''
+    max_mae = self.best_obj if self.early_abort else None
+    records = []
+    for config in configs:
+      with self.telemetry.phase('run_model'):
+        model = self.session.run(config, max_mae=max_mae)
+      with self.telemetry.phase('score_model'):
+        records.append(model.score_model(add_elo=False, exclude_seasons=self.exclude_seasons))
+    return records
+
+  def run_batch(self, configs: list[ModelConfig]) -> list[dict]:
+    '''
+    Scores configs together in a single pass of a BatchQBModel.
+    '''
+    with self.telemetry.phase('build'):
+      model = BatchQBModel(self.data, configs)
+    with self.telemetry.phase('run_model'):
+      model.run_model()
+    with self.telemetry.phase('score_model'):
+      return model.score_model(exclude_seasons=self.exclude_seasons)
+
+  def run_pool(self, configs: list[ModelConfig]) -> list[dict]:
+    '''
+    Scores configs concurrently in the evaluation pool, where workers both run and
+    score them. With early abort, each run is bounded by the incumbent, as in run_session.
+    '''
+    max_mae = self.best_obj if self.early_abort else None
+    with self.telemetry.phase('pool'):
+      return self.pool.evaluate(configs, self.exclude_seasons, max_mae=max_mae)
+
+  def objective(self, x: list[float]) -> float:
+    '''
+    Objective function for the optimizer.
+    '''
+    ## run the model on the prepared games and score it ##
+    scored_record = self.score_configs(
+      [self.config_from_optimizer_values(x)],
+      self.run_session
+    )[0]
+    self.record_evaluation(scored_record)
     ## calculate the objective ##
-    return scored_record[self.objective_name] / self.obj_normalization
+    obj = scored_record[self.objective_name] / self.obj_normalization
+    self.last_evaluation = (numpy.array(x, dtype=float), obj)
+    return obj
+
+  def objective_batch(
+      self,
+      xs: list[list[float]],
+      run_configs: Optional[Callable[[list[ModelConfig]], list[dict]]] = None
+    ) -> list[float]:
+    '''
+    Objective function for several sets of optimizer values, which are evaluated
+    together by run_configs, or in a single pass of a BatchQBModel by default.
+    '''
+    objectives = []
+    for scored_record in self.score_configs(
+      [self.config_from_optimizer_values(x) for x in xs],
+      run_configs if run_configs is not None else self.run_batch
+    ):
+      self.record_evaluation(scored_record)
+      objectives.append(scored_record[self.objective_name] / self.obj_normalization)
+    return objectives
+
+  def gradient_stencil(self, x: list[float]) -> Tuple[numpy.ndarray, list[numpy.ndarray]]:
+    '''
+    Steps and perturbed points for a finite difference gradient. Steps are taken forward,
+    or backward when a forward step would leave the normalized bounds.
+    '''
+    x = numpy.asarray(x, dtype=float)
+    steps = numpy.where(x + self.step > 1, -self.step, self.step)
+    xs = []
+    for i in range(len(x)):
+      x_step = x.copy()
+      x_step[i] += steps[i]
+      xs.append(x_step)
+    return steps, xs
+
+  def batch_gradient(self, x: list[float]) -> numpy.ndarray:
+    '''
+    Finite difference gradient of the objective, where the base point and each
+    perturbed point are evaluated in one batched model pass.
+    '''
+    steps, xs = self.gradient_stencil(x)
+    objectives = self.objective_batch([numpy.asarray(x, dtype=float)] + xs)
+    return numpy.array([
+      (objectives[i+1] - objectives[0]) / steps[i] for i in range(len(x))
+    ])
+
+  def parallel_gradient(self, x: list[float]) -> numpy.ndarray:
+    '''
+    Finite difference gradient of the objective, where the perturbed points are run
+    concurrently in the evaluation pool. The base point is reused from the last
+    objective call when the optimizer has just evaluated it, as SLSQP does.
+    '''
+    x = numpy.asarray(x, dtype=float)
+    steps, xs = self.gradient_stencil(x)
+    base_known = self.last_evaluation is not None and numpy.array_equal(self.last_evaluation[0], x)
+    if not base_known:
+      xs = [x] + xs
+    ## run points in the pool, recording them in submission order ##
+    objectives = self.objective_batch(xs, self.run_pool)
+    if base_known:
+      objectives = [self.last_evaluation[1]] + objectives
+    return numpy.array([
+      (objectives[i+1] - objectives[0]) / steps[i] for i in range(len(x))
+    ])
+
+  def batch_runner(self) -> Callable[[list[ModelConfig]], list[dict]]:
+    '''
+    Runner for the batches of configs the search backends evaluate, which uses the
+    evaluation pool when it has several workers, and the prepared games otherwise.
+    '''
+    return self.run_pool if self.pool.workers > 1 else self.run_session
+
+  def surrogate_search(self) -> OptimizeResult:
+    '''
+    Bayesian optimization over the normalized param box. The current values and a latin
+    hypercube of configs are evaluated first, then a Gaussian process is fit to every
+    evaluated config, and batches picked by expected improvement are evaluated until the
+    budget is spent. Batches are run in the evaluation pool when it has several workers,
+    and one at a time on the prepared games otherwise.
+    '''
+    run_configs = self.batch_runner()
+    n_features = len(self.features)
+    ## initial design, starting from the best guesses ##
+    n_init = min(self.budget, max(2 * n_features, self.batch_size))
+    xs = [numpy.asarray(self.bgs, dtype=float)]
+    if n_init > 1:
+      xs.extend(qmc.LatinHypercube(d=n_features, seed=self.rng).random(n_init - 1))
+    X = numpy.array(xs)
+    y = numpy.array(self.objective_batch(xs, run_configs))
+    ## search ##
+    gp = GaussianProcess()
+    n_iter = 0
+    while len(y) < self.budget:
+      with self.telemetry.phase('surrogate'):
+        gp.fit(X, y)
+        batch = propose_batch(gp, X, y, min(self.batch_size, self.budget - len(y)), self.rng)
+      X = numpy.vstack([X, batch])
+      y = numpy.append(y, self.objective_batch(list(batch), run_configs))
+      n_iter += 1
+    best = int(numpy.argmin(y))
+    return OptimizeResult(
+      x=X[best],
+      fun=y[best],
+      nfev=len(y),
+      nit=n_iter,
+      success=True,
+      message='Evaluation budget reached'
+    )
+
+  def dual_objective(self, x: list[float]) -> Tuple[float, numpy.ndarray]:
+    '''
+    Objective function that also returns its exact gradient, from a single run of a
+    DualQBModel carrying derivatives with respect to the features.
+    '''
+    config = self.config_from_optimizer_values(x)
+    values = config.values.copy()
+    if self.dual_model is None:
+      with self.telemetry.phase('build'):
+        self.dual_model = DualQBModel(self.data, config)
+    self.dual_model.config = config
+    with self.telemetry.phase('run_model'):
+      self.dual_model.run_model(wrt=self.features)
+    with self.telemetry.phase('score_model'):
+      scored_record = self.dual_model.score_model(add_elo=False, exclude_seasons=self.exclude_seasons)
+      gradient = self.dual_model.score_gradient(self.objective_name, exclude_seasons=self.exclude_seasons)
+    if self.cache is not None:
+      with self.telemetry.phase('io'):
+        self.cache.put(values, self.objective_name, scored_record)
+    self.record_evaluation(scored_record)
+    obj = scored_record[self.objective_name] / self.obj_normalization
+    self.last_evaluation = (numpy.array(x, dtype=float), obj)
+    ## chain the gradient through the normalization of each feature ##
+    ranges = numpy.array([
+      self.config.params[k].opti_max - self.config.params[k].opti_min for k in self.features
+    ])
+    return obj, gradient * ranges / self.obj_normalization
+
+  def population_search(self) -> OptimizeResult:
+    '''
+    CMA-ES over the normalized param box, starting from the best guesses. Each generation
+    is evaluated as a batch, in parallel when the pool has several workers, and the search
+    stops once the budget is reached or the population has converged.
+
+    With a checkpoint, the strategy's state is saved after every generation, and a search
+    with the same features, popsize, and seed continues from the saved generation. The
+    same seed gives the same search whether or not it was resumed.
+    '''
+    run_configs = self.batch_runner()
+    strategy = CMAES(self.bgs, popsize=self.popsize, seed=self.seed)
+    best_x, best_fun, evaluations = numpy.asarray(self.bgs, dtype=float), numpy.inf, 0
+    ## continue from a matching checkpoint ##
+    if self.checkpoint is not None and os.path.exists(self.checkpoint):
+      with open(self.checkpoint, 'rb') as f:
+        saved = pickle.load(f)
+      if (
+        saved['features'] == self.features and
+        saved['popsize'] == strategy.popsize and
+        saved['seed'] == self.seed
+      ):
+        strategy.restore(saved['strategy'])
+        best_x, best_fun, evaluations = saved['best_x'], saved['best_fun'], saved['evaluations']
+    ## search ##
+    while evaluations < self.budget and not strategy.converged(self.tol):
+      xs = strategy.ask()
+      fs = numpy.array(self.objective_batch(list(xs), run_configs))
+      strategy.tell(xs, fs)
+      evaluations += len(xs)
+      if fs.min() < best_fun:
+        best_x, best_fun = xs[numpy.argmin(fs)], fs.min()
+      if self.checkpoint is not None:
+        with self.telemetry.phase('io'):
+          ## write then swap so an interrupted save leaves the last checkpoint ##
+          with open('{0}.tmp'.format(self.checkpoint), 'wb') as f:
+            pickle.dump({
+              'features' : self.features,
+              'popsize' : strategy.popsize,
+              'seed' : self.seed,
+              'strategy' : strategy.state(),
+              'best_x' : best_x,
+              'best_fun' : best_fun,
+              'evaluations' : evaluations
+            }, f)
+          os.replace('{0}.tmp'.format(self.checkpoint), self.checkpoint)
+    return OptimizeResult(
+      x=best_x,
+      fun=best_fun,
+      nfev=evaluations,
+      nit=strategy.generation,
+      success=True,
+      message='Converged' if strategy.converged(self.tol) else 'Evaluation budget reached'
+    )
+
+  def fidelity_rungs(self) -> list[int]:
+    '''
+    Last seasons of the game histories the halving backend scores configs on. The scored
+    window of the shortest history is min_seasons long, each rung's window is eta times
+    longer than the last, and the final rung is the full history.
+    '''
+    ## score_model scores from 2009 on ##
+    seasons = sorted(s for s in self.data['season'].unique() if s >= 2009)
+    rungs, window = [], self.min_seasons
+    while window < len(seasons):
+      rungs.append(int(seasons[window - 1]))
+      window *= self.eta
+    return rungs + [int(seasons[-1])]
+
+  def run_truncated(self, configs: list[ModelConfig], last_season: int) -> list[dict]:
+    '''
+    Scores configs on the games through the last season only. Configs are run in the
+    evaluation pool when it has several workers, and one at a time otherwise. Truncated
+    runs are never bounded, since the incumbent's mae is over the full history.
+    '''
+    if self.pool.workers > 1:
+      with self.telemetry.phase('pool'):
+        return self.pool.evaluate(configs, self.exclude_seasons, last_season)
+    if last_season not in self.truncated_sessions:
+      with self.telemetry.phase('build'):
+        self.truncated_sessions[last_season] = ModelSession(
+          self.data[self.data['season'] <= last_season],
+          self.config
+        )
+    records = []
+    for config in configs:
+      with self.telemetry.phase('run_model'):
+        model = self.truncated_sessions[last_season].run(config)
+      with self.telemetry.phase('score_model'):
+        records.append(model.score_model(add_elo=False, exclude_seasons=self.exclude_seasons))
+    return records
+
+  def halving_search(self) -> OptimizeResult:
+    '''
+    Hyperband search over the normalized param box. Each bracket samples configs, scores
+    them on a truncated game history, and promotes the best 1/eta to the next, longer,
+    history, until the finalists get full runs. Brackets cycle from the most aggressive,
+    which starts the most configs on the shortest history, to one of only full runs, and
+    the first bracket includes the best guesses.
+
+    A truncated run costs its share of the games, and the budget, counted in full runs, is
+    checked before every rung. A rung that can't be afforded in full only runs the configs
+    that can be, which are the best ranked of a promoted rung, and the search stops once
+    none can. The one exception is the first full run, which is always made, so a small
+    budget can be overshot by up to one full run. Only full runs are recorded as
+    evaluations, cached, or used for the result, since truncated scores aren't comparable
+    to them.
+    '''
+    run_configs = self.batch_runner()
+    rungs = self.fidelity_rungs()
+    costs = [(self.data['season'] <= rung).sum() / len(self.data) for rung in rungs]
+    s_max = len(rungs) - 1
+    best_x, best_fun = numpy.asarray(self.bgs, dtype=float), numpy.inf
+    spent, full_runs, brackets, exhausted = 0.0, 0, 0, False
+    while not exhausted:
+      s = s_max - brackets % (s_max + 1)
+      n = int(numpy.ceil((s_max + 1) / (s + 1) * self.eta ** s))
+      xs = self.rng.random((n, len(self.features)))
+      if brackets == 0:
+        xs[0] = self.bgs
+      rung = s_max - s
+      while rung <= s_max:
+        ## only run the configs the rest of the budget affords ##
+        affordable = int(numpy.floor((self.budget - spent) / costs[rung] + 1e-9))
+        if affordable < len(xs):
+          exhausted = True
+          if affordable == 0 and full_runs == 0:
+            ## the first full run is always made, from the best ranked config ##
+            rung, affordable = s_max, 1
+          if affordable == 0:
+            break
+          xs = xs[:affordable]
+        spent += len(xs) * costs[rung]
+        if rung == s_max:
+          fs = numpy.array(self.objective_batch(list(xs), run_configs))
+          full_runs += len(xs)
+          if fs.min() < best_fun:
+            best_x, best_fun = xs[numpy.argmin(fs)], fs.min()
+        else:
+          fs = numpy.array([
+            record[self.objective_name] / self.obj_normalization
+            for record in self.run_truncated(
+              [self.config_from_optimizer_values(x) for x in xs],
+              rungs[rung]
+            )
+          ])
+          ## promote the best configs to the next rung ##
+          xs = xs[numpy.argsort(fs, kind='stable')[:max(1, len(xs) // self.eta)]]
+        rung += 1
+      brackets += 1
+    return OptimizeResult(
+      x=best_x,
+      fun=best_fun,
+      nfev=full_runs,
+      nit=brackets,
+      success=True,
+      message='Evaluation budget reached'
+    )
 
   def update_config(self, x: list[float]):
     '''
@@ -178,16 +661,44 @@ class ConfigOptimizer:
     ## run the optimizer ##
     ## start timer ##
     start_time = float(time.time())
-    solution = minimize(
-      self.objective,
-      self.bgs,
-      bounds=self.bounds,
-      method=self.method,
-      options={
-          'ftol' : self.tol,
-          'eps' : self.step
-      }
-    )
+    self.telemetry.start()
+    fun = self.objective
+    jac = None
+    if self.gradient == 'dual':
+      fun = self.dual_objective
+      jac = True
+    elif self.gradient == 'batch':
+      jac = self.batch_gradient
+    elif self.gradient == 'parallel':
+      jac = self.parallel_gradient
+    try:
+      if self.backend == 'surrogate':
+        solution = self.surrogate_search()
+      elif self.backend == 'cmaes':
+        solution = self.population_search()
+      elif self.backend == 'halving':
+        solution = self.halving_search()
+      else:
+        solution = minimize(
+          fun,
+          self.bgs,
+          jac=jac,
+          bounds=self.bounds,
+          method=self.method,
+          options={
+              'ftol' : self.tol,
+              'eps' : self.step
+          }
+        )
+    finally:
+      ## shut down any worker processes ##
+      self.pool.close()
+      if self.in_flight is not None:
+        self.in_flight.close()
+      self.telemetry.report(force=True)
+      if self.cache is not None:
+        print('     Evaluation cache: {0} hits, {1} misses'.format(self.cache.hits, self.cache.misses))
+        self.cache.close()
     ## end timer ##
     end_time = float(time.time())
     ## save the solution ##
@@ -214,15 +725,15 @@ class ConfigOptimizer:
 
   def get_best_record(self) -> dict:
     '''
-    Gets the best record from the stored optimization records. Since the final optimization
-    result does not have the same level of detail, this function is useful for getting the
-    best config, along with the rmse and mae, and the corresponding values for
+    Gets the best record, by the objective, from the stored optimization records. Since the
+    final optimization result does not have the same level of detail, this function is useful
+    for getting the best config, along with the rmse and mae, and the corresponding values for
     simple rolling average models that can be used for giving context on error magnitude.
     '''
     ## get the best record ##
     df = pd.DataFrame(self.optimization_records)
     return df.sort_values(
-      by=['mae'],
+      by=[self.objective_name],
       ascending=[True]
     ).reset_index(drop=True).to_dict(orient='records')[0]
 
@@ -0,0 +1,143 @@
+## built-in packages ##
+from typing import Optional, Union
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+## external packages ##
+import pandas as pd
+
+## data models ##
+from ..DataModels import ModelConfig, SharedGames
+from .ConfigOptimizer import ConfigOptimizer
+
+## each worker holds the games so they are only sent once per worker ##
+worker_data: Optional[pd.DataFrame] = None
+
+def init_fold_worker(data: Union[pd.DataFrame, SharedGames]) -> None:
+  '''
+  Holds the games in a worker process, attaching to shared games if they were published.
+  '''
+  global worker_data
+  worker_data = data.to_frame() if isinstance(data, SharedGames) else data
+
+def season_folds(data: pd.DataFrame, first_season: int = 2009) -> list[list[int]]:
+  '''
+  Leave-one-season-out folds for every season from first_season on.
+  '''
+  return [[int(season)] for season in sorted(data['season'].unique()) if season >= first_season]
+
+def run_fold(
+  fold: int,
+  seasons: list[int],
+  config: ModelConfig,
+  subset: list[str],
+  subset_name: str,
+  objective_name: str,
+  first_season: int,
+  optimizer_kwargs: dict,
+  data: Optional[pd.DataFrame] = None
+) -> dict:
+  '''
+  Optimizes a config on every season except the fold's, then scores the fold's seasons
+  with that config, returning a record of the fold's training and held out error along
+  with the config values chosen.
+  '''
+  optimizer = ConfigOptimizer(
+    data=data if data is not None else worker_data,
+    config=config,
+    subset=subset,
+    subset_name='{0}_fold{1}'.format(subset_name, fold),
+    objective_name=objective_name,
+    exclude_seasons=seasons,
+    save_in_flight=False,
+    workers=1,
+    **optimizer_kwargs
+  )
+  optimizer.optimize(False, False)
+  ## score the held out seasons from a single run of the chosen config ##
+  fold_config = optimizer.config_from_optimizer_values(optimizer.solution.x)
+  folds = optimizer.session.run(fold_config).score_folds(first_season)
+  test = folds[folds['season'].isin(seasons)]
+  return {
+    'fold' : fold,
+    'seasons' : ','.join(str(s) for s in seasons),
+    'train_{0}'.format(objective_name) : optimizer.solution.fun * optimizer.obj_normalization,
+    'test_games' : int(test['games'].sum()),
+    'test_mae' : (test['mae'] * test['games']).sum() / test['games'].sum(),
+    'test_rmse' : ((test['rmse'] ** 2 * test['games']).sum() / test['games'].sum()) ** 0.5
+  } | {k: fold_config.values[k] for k in optimizer.features}
+
+def cross_validate(
+  data: pd.DataFrame,
+  config: ModelConfig,
+  subset: list[str] = [],
+  subset_name: str = 'subset',
+  results_loc: Optional[str] = None,
+  folds: Optional[list[list[int]]] = None,
+  first_season: int = 2009,
+  objective_name: str = 'mae',
+  workers: Optional[int] = None,
+  **optimizer_kwargs
+) -> pd.DataFrame:
+  '''
+  Season fold cross validation of the config optimization. For each fold, the config is
+  optimized with the fold's seasons left out of scoring, and the chosen config is then
+  scored on the held out seasons. Folds are independent, so they run concurrently in a
+  process pool, with games published once as SharedGames.
+
+  This measures the error of the tuning process itself. To score a single config by fold
+  without optimizing, use QBModel.score_folds, which comes from a single model run. The
+  season_mae objective is only the in-sample mean of the season maes, not a held out score.
+
+  Parameters:
+  * data: pd.DataFrame - the games
+  * config: ModelConfig - the config whose subset is optimized
+  * subset: list[str] - the params to optimize, or all params if empty
+  * subset_name: str - name of the subset
+  * results_loc: str - optional location of a results csv, rewritten as folds finish
+  * folds: list[list[int]] - seasons held out by each fold. Defaults to leave-one-season-out
+    from first_season on
+  * first_season: int - the first season scored
+  * objective_name: str - the scored record field minimized on the training seasons
+  * workers: int - the number of worker processes, which defaults to the cpu count. With
+    one worker, folds are run in this process
+  * optimizer_kwargs - passed to each fold's ConfigOptimizer, like backend or budget
+
+  Returns:
+  * pd.DataFrame - a record of each fold
+  '''
+  workers = workers if workers is not None else (os.cpu_count() or 1)
+  folds = folds if folds is not None else season_folds(data, first_season)
+  fold_recs = []
+  def save(record: dict) -> None:
+    fold_recs.append(record)
+    if results_loc is not None:
+      pd.DataFrame(fold_recs).sort_values(by=['fold']).reset_index(drop=True).to_csv(results_loc)
+    print('     Completed fold {0} ({1} of {2}), test mae {3:.4f}'.format(
+      record['seasons'], len(fold_recs), len(folds), record['test_mae']
+    ))
+  args = [
+    (i, folds[i], config, subset, subset_name, objective_name, first_season, optimizer_kwargs)
+    for i in range(len(folds))
+  ]
+  if workers <= 1:
+    for fold_args in args:
+      save(run_fold(*fold_args, data))
+  else:
+    shared = SharedGames.publish(data)
+    try:
+      with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_fold_worker,
+        initargs=(shared,)
+      ) as executor:
+        futures = [executor.submit(run_fold, *fold_args) for fold_args in args]
+        for future in as_completed(futures):
+          save(future.result())
+    finally:
+      shared.unlink()
+  results = pd.DataFrame(fold_recs).sort_values(by=['fold']).reset_index(drop=True)
+  print('     Cross validated mae: {0:.4f}'.format(
+    (results['test_mae'] * results['test_games']).sum() / results['test_games'].sum()
+  ))
+  return results
@@ -0,0 +1,99 @@
+## built-in packages ##
+from typing import Optional
+import hashlib
+import json
+import sqlite3
+import time
+
+## external packages ##
+import pandas as pd
+
+class EvaluationCache:
+  '''
+  Persistent cache of scored records in a SQLite file. Records are keyed by a fingerprint
+  of the dataset, the rounded config values, and the objective name, so configs that were
+  already scored on the same games, in this run or an earlier one, don't need to be run
+  again. Records stay queryable across runs with records().
+  '''
+  def __init__(self,
+    file_path: str,
+    dataset: str,
+    digits: int = 10
+  ):
+    self.file_path: str = file_path
+    self.dataset: str = dataset ## fingerprint of the games and model version ##
+    self.digits: int = digits ## config values are rounded to this many places in the key ##
+    self.hits: int = 0
+    self.misses: int = 0
+    ## open the db, allowing concurrent readers and writers from other processes ##
+    self.conn: sqlite3.Connection = sqlite3.connect(file_path, timeout=60)
+    self.conn.execute('PRAGMA journal_mode=WAL')
+    self.conn.execute('''
+      CREATE TABLE IF NOT EXISTS evaluations (
+        dataset TEXT NOT NULL,
+        params_hash TEXT NOT NULL,
+        objective TEXT NOT NULL,
+        params TEXT NOT NULL,
+        record TEXT NOT NULL,
+        created REAL NOT NULL,
+        PRIMARY KEY (dataset, params_hash, objective)
+      )
+    ''')
+    self.conn.commit()
+
+  def key(self, values: dict[str, float]) -> tuple[str, str]:
+    '''
+    Returns the hash and json of the rounded config values.
+    '''
+    params = json.dumps(
+      {k: round(v, self.digits) for k, v in values.items()},
+      sort_keys=True
+    )
+    return hashlib.sha256(params.encode()).hexdigest(), params
+
+  def get(self, values: dict[str, float], objective_name: str) -> Optional[dict]:
+    '''
+    Returns the cached scored record for the config values, or None if they haven't
+    been scored.
+    '''
+    params_hash, params = self.key(values)
+    row = self.conn.execute(
+      'SELECT record FROM evaluations WHERE dataset = ? AND params_hash = ? AND objective = ?',
+      (self.dataset, params_hash, objective_name)
+    ).fetchone()
+    if row is None:
+      self.misses += 1
+      return None
+    self.hits += 1
+    return json.loads(row[0])
+
+  def put(self, values: dict[str, float], objective_name: str, record: dict) -> None:
+    '''
+    Stores the scored record of the config values.
+    '''
+    params_hash, params = self.key(values)
+    self.conn.execute(
+      'INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?, ?)',
+      (self.dataset, params_hash, objective_name, params, json.dumps(record), time.time())
+    )
+    self.conn.commit()
+
+  def records(self, objective_name: Optional[str] = None) -> pd.DataFrame:
+    '''
+    Returns every cached record for the dataset, optionally for a single objective.
+    '''
+    rows = self.conn.execute(
+      'SELECT objective, record FROM evaluations WHERE dataset = ?{0} ORDER BY created'.format(
+        ' AND objective = ?' if objective_name is not None else ''
+      ),
+      (self.dataset, objective_name) if objective_name is not None else (self.dataset,)
+    ).fetchall()
+    return pd.DataFrame([
+      json.loads(record) | {'objective' : objective} for objective, record in rows
+    ])
+
+  def close(self) -> None:
+    '''
+    Closes the db connection.
+    '''
+    self.conn.close()
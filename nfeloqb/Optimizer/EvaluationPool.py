@@ -0,0 +1,108 @@
+## built-in packages ##
+from typing import Optional, Union
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+## external packages ##
+import pandas as pd
+
+## data models ##
+from ..DataModels import ModelConfig, SharedGames
+from ..Resources import ModelSession
+
+## each worker prepares the games once and reuses its session for every evaluation ##
+worker_session: Optional[ModelSession] = None
+## sessions on histories truncated after a season, prepared from the games on first use ##
+worker_games: Optional[pd.DataFrame] = None
+worker_truncated: dict[int, ModelSession] = {}
+
+def init_worker(data: Union[pd.DataFrame, SharedGames]) -> None:
+  '''
+  Prepares a model session in a worker process, attaching to shared games if they
+  were published.
+  '''
+  global worker_session, worker_games
+  worker_games = data.to_frame() if isinstance(data, SharedGames) else data
+  worker_session = ModelSession(worker_games)
+
+def evaluate_config(
+  config: ModelConfig,
+  exclude_seasons: Optional[list[int]] = None,
+  last_season: Optional[int] = None,
+  max_mae: Optional[float] = None
+) -> dict:
+  '''
+  Runs and scores a config in a worker process, returning the scored record. With a last
+  season, the config is run and scored on the games through that season only. With a max
+  mae, the run is bounded, and stops once its mae can't be below the bound.
+  '''
+  session = worker_session
+  if last_season is not None:
+    if last_season not in worker_truncated:
+      worker_truncated[last_season] = ModelSession(worker_games[worker_games['season'] <= last_season])
+    session = worker_truncated[last_season]
+  model = session.run(config, max_mae=max_mae)
+  return model.score_model(add_elo=False, exclude_seasons=exclude_seasons)
+
+class EvaluationPool:
+  '''
+  Pool of worker processes that run and score configs concurrently. Games are published
+  once as SharedGames when the pool starts, and each worker attaches to them rather than
+  receiving its own copy. Records are returned in the order the configs were submitted.
+  '''
+  def __init__(self,
+    data: pd.DataFrame,
+    workers: Optional[int] = None
+  ):
+    self.data: pd.DataFrame = data
+    self.workers: int = workers if workers is not None else (os.cpu_count() or 1)
+    self.executor: Optional[ProcessPoolExecutor] = None
+    self.shared: Optional[SharedGames] = None
+
+  def start(self) -> None:
+    '''
+    Starts the worker processes if they are not already running.
+    '''
+    if self.executor is None:
+      self.shared = SharedGames.publish(self.data)
+      self.executor = ProcessPoolExecutor(
+        max_workers=self.workers,
+        initializer=init_worker,
+        initargs=(self.shared,)
+      )
+
+  def evaluate(
+    self,
+    configs: list[ModelConfig],
+    exclude_seasons: Optional[list[int]] = None,
+    last_season: Optional[int] = None,
+    max_mae: Optional[float] = None
+  ) -> list[dict]:
+    '''
+    Runs and scores each config, returning the scored records in the same order. With a
+    last season, configs are run on the games through that season only, and with a max
+    mae, each run is bounded by it.
+    '''
+    self.start()
+    return list(self.executor.map(
+      evaluate_config, configs, repeat(exclude_seasons), repeat(last_season), repeat(max_mae)
+    ))
+
+  def close(self) -> None:
+    '''
+    Shuts down the worker processes.
+    '''
+    if self.executor is not None:
+      self.executor.shutdown()
+      self.executor = None
+    if self.shared is not None:
+      self.shared.unlink()
+      self.shared = None
+
+  def __enter__(self) -> 'EvaluationPool':
+    self.start()
+    return self
+
+  def __exit__(self, *args) -> None:
+    self.close()
@@ -0,0 +1,78 @@
+## built-in packages ##
+from typing import Optional, TextIO
+import json
+import os
+
+## external packages ##
+import pandas as pd
+import numpy
+
+def json_default(value):
+  ## numpy scalars can appear in scored records ##
+  if isinstance(value, numpy.generic):
+    return value.item()
+  raise TypeError('{0} is not json serializable'.format(type(value)))
+
+class InFlightLog:
+  '''
+  Append-only log of scored records written during an optimization. Each record is
+  appended as a single json line, so writing a record costs the same however long the
+  optimization has run. Lines are flushed as they are written, and synced to disk on sync,
+  which the optimizer calls on new bests and at intervals. Records with different fields,
+  like aborted evaluations, can share a log.
+
+  An existing log is replaced on the first write unless append is set.
+  '''
+  def __init__(self, file_path: str, append: bool = False):
+    self.file_path: str = file_path
+    self.append_existing: bool = append
+    self.file: Optional[TextIO] = None
+    self.records_written: int = 0
+
+  def append(self, record: dict) -> None:
+    '''
+    Appends a scored record to the log, opening it on the first write.
+    '''
+    if self.file is None:
+      self.file = open(self.file_path, 'a' if self.append_existing else 'w', encoding='utf-8')
+      ## reopening after a close continues the log ##
+      self.append_existing = True
+    self.file.write(json.dumps(record, default=json_default) + '\n')
+    self.file.flush()
+    self.records_written += 1
+
+  def sync(self) -> None:
+    '''
+    Forces written records to disk.
+    '''
+    if self.file is not None:
+      os.fsync(self.file.fileno())
+
+  def close(self) -> None:
+    '''
+    Syncs and closes the log.
+    '''
+    if self.file is not None:
+      self.sync()
+      self.file.close()
+      self.file = None
+
+def read_in_flight(file_path: str) -> pd.DataFrame:
+  '''
+  Rebuilds the optimization history from an in-flight log. A partially written last line,
+  left by an interrupted optimization, is skipped.
+
+  Parameters:
+  * file_path: str - location of the log
+
+  Returns:
+  * pd.DataFrame - the scored records, in the order they were evaluated
+  '''
+  records = []
+  with open(file_path, 'r', encoding='utf-8') as f:
+    for line in f:
+      try:
+        records.append(json.loads(line))
+      except json.JSONDecodeError:
+        continue
+  return pd.DataFrame(records)
@@ -0,0 +1,137 @@
+## built-in packages ##
+from typing import Optional, Union
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+## external packages ##
+import pandas as pd
+import numpy
+
+## data models ##
+from ..DataModels import ModelConfig, SharedGames
+from .ConfigOptimizer import ConfigOptimizer
+from .Campaign import Campaign
+
+## each worker holds the games so they are only sent once per worker ##
+worker_data: Optional[pd.DataFrame] = None
+
+def init_start_worker(data: Union[pd.DataFrame, SharedGames]) -> None:
+  '''
+  Holds the games in a worker process, attaching to shared games if they were published.
+  '''
+  global worker_data
+  worker_data = data.to_frame() if isinstance(data, SharedGames) else data
+
+def run_start(
+  start: int,
+  seed: int,
+  config: ModelConfig,
+  subset: list[str],
+  subset_name: str,
+  objective_name: str,
+  cache: Optional[str] = None,
+  data: Optional[pd.DataFrame] = None
+) -> dict:
+  '''
+  Runs a single randomized start, returning its best record along with the start number
+  and the seed that reproduces it.
+  '''
+  optimizer = ConfigOptimizer(
+    data=data if data is not None else worker_data,
+    config=config,
+    subset=subset,
+    subset_name=subset_name,
+    objective_name=objective_name,
+    randomize_bgs=True,
+    seed=seed,
+    save_in_flight=False,
+    cache=cache
+  )
+  optimizer.optimize(False, False)
+  record = optimizer.get_best_record()
+  record['start'] = start
+  record['seed'] = seed
+  return record
+
+def start_seeds(rounds: int, seed: Optional[int] = None) -> list[int]:
+  '''
+  Independent seeds for each start, derived from a single seed. When seed is None,
+  fresh entropy is used, and the per-start seeds are still recorded with each result.
+  '''
+  return [
+    int(s.generate_state(1)[0]) for s in numpy.random.SeedSequence(seed).spawn(rounds)
+  ]
+
+def optimize_multi_start(
+  data: pd.DataFrame,
+  config: ModelConfig,
+  subset: list[str],
+  subset_name: str,
+  results_loc: str,
+  objective_name: str = 'mae',
+  rounds: int = 25,
+  workers: Optional[int] = None,
+  seed: Optional[int] = None,
+  cache: Optional[str] = None,
+  campaign: Optional[Campaign] = None
+) -> pd.DataFrame:
+  '''
+  Runs randomized start optimizations of a subset in a process pool. Starts are
+  independent, so each is seeded from a single seed and results are collected as they
+  complete. The results csv is rewritten, ordered by start, each time a start finishes.
+  Games are published once as SharedGames, which every worker attaches to.
+
+  Parameters:
+  * data: pd.DataFrame - the games to optimize over
+  * config: ModelConfig - the config whose subset is optimized
+  * subset: list[str] - the params to optimize
+  * subset_name: str - name of the subset
+  * results_loc: str - location of the results csv
+  * objective_name: str - the scored record field to minimize
+  * rounds: int - the number of randomized starts
+  * workers: int - the number of worker processes, which defaults to the cpu count.
+    With one worker, starts are run in this process
+  * seed: int - seed that the per-start seeds are derived from
+  * cache: str - optional path to a SQLite evaluation cache shared by every start
+  * campaign: Campaign - optional campaign the starts belong to. Starts are seeded from the
+    campaign's seed, starts it has completed are skipped, and each completed start is
+    recorded to it. Unless another cache is given, starts use the campaign's cache, so a
+    start that was interrupted replays its evaluations up to where it stopped
+
+  Returns:
+  * pd.DataFrame - the best record of each start
+  '''
+  workers = workers if workers is not None else (os.cpu_count() or 1)
+  best_recs = []
+  if campaign is not None:
+    seed = campaign.seed if seed is None else seed
+    cache = campaign.cache if cache is None else cache
+    best_recs = [r for r in campaign.completed_starts(subset_name) if r['start'] < rounds]
+  seeds = start_seeds(rounds, seed)
+  remaining = [i for i in range(rounds) if i not in [r['start'] for r in best_recs]]
+  def save(record: dict) -> None:
+    best_recs.append(record)
+    if campaign is not None:
+      campaign.complete_start(subset_name, record, objective_name)
+    pd.DataFrame(best_recs).sort_values(by=['start']).reset_index(drop=True).to_csv(results_loc)
+    print('     Completed start {0} ({1} of {2})'.format(record['start'] + 1, len(best_recs), rounds))
+  if workers <= 1 or len(remaining) == 0:
+    for i in remaining:
+      save(run_start(i, seeds[i], config, subset, subset_name, objective_name, cache, data))
+  else:
+    shared = SharedGames.publish(data)
+    try:
+      with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_start_worker,
+        initargs=(shared,)
+      ) as executor:
+        futures = [
+          executor.submit(run_start, i, seeds[i], config, subset, subset_name, objective_name, cache)
+          for i in remaining
+        ]
+        for future in as_completed(futures):
+          save(future.result())
+    finally:
+      shared.unlink()
+  return pd.DataFrame(best_recs).sort_values(by=['start']).reset_index(drop=True)
@@ -0,0 +1,224 @@
+## built-in packages ##
+from typing import Optional, Union
+import os
+import copy
+import time
+import pathlib
+import datetime
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+## external packages ##
+import pandas as pd
+
+## data models ##
+from ..DataModels import ModelConfig, SharedGames, OptimizationPlan, PlanStep
+from .ConfigOptimizer import ConfigOptimizer
+from .MultiStart import optimize_multi_start, start_seeds
+from .Campaign import Campaign
+
+## each worker holds the games so they are only sent once per worker ##
+worker_data: Optional[pd.DataFrame] = None
+
+def init_plan_worker(data: Union[pd.DataFrame, SharedGames]) -> None:
+  '''
+  Holds the games in a worker process, attaching to shared games if they were published.
+  '''
+  global worker_data
+  worker_data = data.to_frame() if isinstance(data, SharedGames) else data
+
+def run_step(
+  step: PlanStep,
+  config: ModelConfig,
+  seed: int,
+  workers: int = 1,
+  save_result: bool = True,
+  rounds: Optional[int] = None,
+  campaign: Optional[Campaign] = None,
+  data: Optional[pd.DataFrame] = None
+) -> dict:
+  '''
+  Optimizes a plan step's subset from the config, returning a record of the step with
+  the best objective reached and the subset values that reached it. In a campaign, the
+  step's evaluations are cached to the campaign, and cmaes steps checkpoint to it.
+  '''
+  data = data if data is not None else worker_data
+  start_time = time.time()
+  if step.method == 'multi_start':
+    options = step.options.copy()
+    rounds = rounds if rounds is not None else options.pop('rounds', 25)
+    options.pop('rounds', None)
+    starts = optimize_multi_start(
+      data=data,
+      config=config,
+      subset=step.subset,
+      subset_name=step.name,
+      results_loc='{0}/Results/{1}{2}.csv'.format(
+        pathlib.Path(__file__).parent.resolve(),
+        datetime.datetime.now().strftime('%Y%m%d'),
+        '_{0}_randomized_bgs'.format(step.name)
+      ),
+      objective_name=step.objective,
+      rounds=rounds,
+      workers=workers,
+      seed=seed,
+      campaign=campaign,
+      **options
+    )
+    best = starts.sort_values(by=[step.objective]).iloc[0]
+    best_value = float(best[step.objective])
+    values = {k: float(best[k]) for k in step.subset}
+  else:
+    options = step.options.copy()
+    if campaign is not None:
+      options.setdefault('cache', campaign.cache)
+      if step.method == 'cmaes':
+        options.setdefault('checkpoint', campaign.checkpoint(step.name))
+    optimizer = ConfigOptimizer(
+      data=data,
+      config=config,
+      subset=step.subset,
+      subset_name=step.name,
+      objective_name=step.objective,
+      backend=step.method,
+      workers=workers,
+      seed=seed,
+      **options
+    )
+    optimizer.optimize(save_result, False)
+    best_value = optimizer.solution.fun * optimizer.obj_normalization
+    optimal_values = optimizer.denormalize_optimizer_values(optimizer.solution.x)
+    values = {k: optimal_values[k] for k in step.subset}
+  return {
+    'step' : step.name,
+    'objective' : step.objective,
+    'method' : step.method,
+    'best' : best_value,
+    'runtime' : time.time() - start_time,
+    'values' : values
+  }
+
+def step_config(plan: OptimizationPlan, step: PlanStep, config: ModelConfig, found: dict[str, dict]) -> ModelConfig:
+  '''
+  A copy of the config with the values found by every step the step depends on, directly
+  or through other steps, applied in plan order.
+  '''
+  by_name = {s.name: s for s in plan.steps}
+  ancestors, queue = set(), list(step.depends_on)
+  while len(queue) > 0:
+    name = queue.pop()
+    if name not in ancestors:
+      ancestors.add(name)
+      queue.extend(by_name[name].depends_on)
+  config = copy.deepcopy(config)
+  for s in plan.order():
+    if s.name in ancestors:
+      config.update_config(found[s.name])
+  return config
+
+def run_plan(
+  plan: OptimizationPlan,
+  data: pd.DataFrame,
+  config: ModelConfig,
+  workers: Optional[int] = None,
+  step_workers: Optional[int] = None,
+  seed: Optional[int] = None,
+  rounds: Optional[int] = None,
+  save_result: bool = True,
+  update_config: bool = False,
+  campaign: Optional[Campaign] = None
+) -> pd.DataFrame:
+  '''
+  Runs an optimization plan. Steps whose dependencies are complete are run concurrently
+  in a process pool, and each dependent step is started as soon as the steps it depends
+  on finish, from the values they found. Games are published once as SharedGames for
+  the whole plan.
+
+  Parameters:
+  * plan: OptimizationPlan - the plan to run
+  * data: pd.DataFrame - the games, loaded once for every step
+  * config: ModelConfig - the config the plan starts from
+  * workers: int - total worker processes, which defaults to the cpu count
+  * step_workers: int - processes each step evaluates with. Defaults to an equal share of
+    workers across the steps that can run at once
+  * seed: int - seed that each step's seed is derived from
+  * rounds: int - optional number of starts for multi start steps, overriding the plan
+  * save_result: bool - save each step's result, and a summary of the plan, to csvs
+  * update_config: bool - update the model_config.json file with the values of every step
+  * campaign: Campaign - optional campaign the plan runs in. Step seeds are derived from
+    the campaign's seed, and completed steps are recorded to it, so a rerun of the plan in
+    the campaign skips steps that completed and resumes those that were in progress
+
+  Returns:
+  * pd.DataFrame - a record of each step, in plan order
+  '''
+  workers = workers if workers is not None else (os.cpu_count() or 1)
+  ordered = plan.order()
+  ## steps that can run at once share the workers ##
+  concurrent = max(1, min(workers, plan.width()))
+  step_workers = step_workers if step_workers is not None else max(1, workers // concurrent)
+  if campaign is not None and seed is None:
+    seed = campaign.seed
+  seeds = dict(zip([s.name for s in plan.steps], start_seeds(len(plan.steps), seed)))
+  ## steps the campaign completed are not run again ##
+  records = {
+    name: record for name, record in (campaign.completed_steps() if campaign is not None else {}).items()
+    if name in seeds
+  }
+  found = {name: record['values'] for name, record in records.items()}
+  ordered_remaining = [step for step in ordered if step.name not in records]
+  def complete(record: dict) -> None:
+    found[record['step']] = record['values']
+    records[record['step']] = record
+    if campaign is not None:
+      campaign.complete_step(record)
+    print('     Completed step {0} ({1} of {2}), best {3} {4:.4f}'.format(
+      record['step'], len(records), len(ordered), record['objective'], record['best']
+    ))
+  if concurrent <= 1 or len(ordered_remaining) == 0:
+    for step in ordered_remaining:
+      complete(run_step(
+        step, step_config(plan, step, config, found), seeds[step.name],
+        step_workers, save_result, rounds, campaign, data
+      ))
+  else:
+    shared = SharedGames.publish(data)
+    try:
+      with ProcessPoolExecutor(
+        max_workers=concurrent,
+        initializer=init_plan_worker,
+        initargs=(shared,)
+      ) as executor:
+        running = {}
+        submitted = set()
+        while len(records) < len(ordered):
+          ## start every step whose dependencies are complete ##
+          for step in ordered_remaining:
+            if step.name not in submitted and all(d in found for d in step.depends_on):
+              submitted.add(step.name)
+              running[executor.submit(
+                run_step, step, step_config(plan, step, config, found), seeds[step.name],
+                step_workers, save_result, rounds, campaign
+              )] = step.name
+          done, _ = wait(running, return_when=FIRST_COMPLETED)
+          for future in done:
+            del running[future]
+            complete(future.result())
+    finally:
+      shared.unlink()
+  ## summarize ##
+  results = pd.DataFrame([
+    {k: v for k, v in records[step.name].items() if k != 'values'} | records[step.name]['values']
+    for step in ordered
+  ])
+  if save_result:
+    results.to_csv('{0}/Results/{1}_plan_{2}.csv'.format(
+      pathlib.Path(__file__).parent.resolve(),
+      datetime.datetime.now().strftime('%Y%m%d'),
+      plan.name
+    ))
+  if update_config:
+    ## later steps take precedence where subsets overlap ##
+    for step in ordered:
+      config.update_config({k: round(v, 6) for k, v in found[step.name].items()})
+    config.to_file()
+  return results
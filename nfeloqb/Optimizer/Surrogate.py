@@ -0,0 +1,171 @@
+## built-in packages ##
+from typing import Optional
+
+## external packages ##
+import numpy
+from scipy.linalg import cho_factor, cho_solve
+from scipy.optimize import minimize
+from scipy.stats import norm
+
+class GaussianProcess:
+  '''
+  Gaussian process surrogate of the objective over the normalized param box. Uses a
+  Matern 5/2 kernel with a lengthscale per param, so params the objective is insensitive
+  to are learned to have long lengthscales. Observations are standardized before fitting,
+  and lengthscales and noise are fit by maximizing the marginal likelihood.
+  '''
+  def __init__(self,
+    min_lengthscale: float = 0.01,
+    max_lengthscale: float = 10.0,
+    min_noise: float = 1e-6
+  ):
+    self.log_bounds: tuple[float, float] = (numpy.log(min_lengthscale), numpy.log(max_lengthscale))
+    self.min_noise: float = min_noise
+    ## fit state ##
+    self.X: Optional[numpy.ndarray] = None
+    self.y_mean: float = 0.0
+    self.y_std: float = 1.0
+    self.lengthscales: Optional[numpy.ndarray] = None
+    self.noise: float = min_noise
+    self.chol: Optional[tuple] = None
+    self.alpha: Optional[numpy.ndarray] = None
+
+  @staticmethod
+  def kernel(A: numpy.ndarray, B: numpy.ndarray, lengthscales: numpy.ndarray) -> numpy.ndarray:
+    '''
+    Matern 5/2 covariance between the rows of A and B, with unit signal variance.
+    '''
+    diff = (A[:, None, :] - B[None, :, :]) / lengthscales
+    r = numpy.sqrt(5 * numpy.sum(diff * diff, axis=2))
+    return (1 + r + r * r / 3) * numpy.exp(-r)
+
+  def neg_log_likelihood(self, theta: numpy.ndarray, X: numpy.ndarray, y: numpy.ndarray) -> float:
+    '''
+    Negative log marginal likelihood of standardized observations, where theta holds the
+    log lengthscales followed by the log noise.
+    '''
+    K = self.kernel(X, X, numpy.exp(theta[:-1]))
+    K[numpy.diag_indices_from(K)] += numpy.exp(theta[-1]) + self.min_noise
+    try:
+      chol = cho_factor(K, lower=True)
+    except numpy.linalg.LinAlgError:
+      return 1e10
+    alpha = cho_solve(chol, y)
+    return 0.5 * y @ alpha + numpy.sum(numpy.log(numpy.diag(chol[0])))
+
+  def fit(self, X: numpy.ndarray, y: numpy.ndarray, optimize_hyperparams: bool = True) -> 'GaussianProcess':
+    '''
+    Fits the surrogate to observed points and objective values
+
+    Parameters:
+    * X: numpy.ndarray - observed points, one row per point
+    * y: numpy.ndarray - objective value of each point
+    * optimize_hyperparams: bool - refit lengthscales and noise. When False, the previous
+      fit's are kept, which is used to condition on pending points while building a batch
+
+    Returns:
+    * GaussianProcess - the fit surrogate
+    '''
+    X = numpy.asarray(X, dtype=float)
+    y = numpy.asarray(y, dtype=float)
+    self.X = X
+    self.y_mean = y.mean()
+    self.y_std = y.std() if y.std() > 0 else 1.0
+    y_std = (y - self.y_mean) / self.y_std
+    if optimize_hyperparams or self.lengthscales is None:
+      theta_0 = numpy.append(
+        numpy.log(self.lengthscales) if self.lengthscales is not None else numpy.zeros(X.shape[1]),
+        numpy.log(max(self.noise, 1e-4))
+      )
+      solution = minimize(
+        self.neg_log_likelihood,
+        theta_0,
+        args=(X, y_std),
+        method='L-BFGS-B',
+        bounds=[self.log_bounds] * X.shape[1] + [(numpy.log(self.min_noise), 0.0)]
+      )
+      self.lengthscales = numpy.exp(solution.x[:-1])
+      self.noise = numpy.exp(solution.x[-1])
+    K = self.kernel(X, X, self.lengthscales)
+    K[numpy.diag_indices_from(K)] += self.noise + self.min_noise
+    self.chol = cho_factor(K, lower=True)
+    self.alpha = cho_solve(self.chol, y_std)
+    return self
+
+  def predict(self, X: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray]:
+    '''
+    Predicted mean and standard deviation of the objective at each point.
+    '''
+    K_s = self.kernel(numpy.asarray(X, dtype=float), self.X, self.lengthscales)
+    mu = K_s @ self.alpha
+    v = cho_solve(self.chol, K_s.T)
+    var = numpy.clip(1 - numpy.sum(K_s * v.T, axis=1), 1e-12, None)
+    return mu * self.y_std + self.y_mean, numpy.sqrt(var) * self.y_std
+
+def expected_improvement(
+  mu: numpy.ndarray,
+  sigma: numpy.ndarray,
+  best: float,
+  xi: float = 0.0
+) -> numpy.ndarray:
+  '''
+  Expected improvement of each point over the best observed value, for minimization.
+  '''
+  improvement = best - mu - xi
+  z = improvement / sigma
+  return improvement * norm.cdf(z) + sigma * norm.pdf(z)
+
+def propose_batch(
+  gp: GaussianProcess,
+  X: numpy.ndarray,
+  y: numpy.ndarray,
+  batch_size: int,
+  rng: numpy.random.Generator,
+  n_candidates: int = 4096,
+  xi: float = 0.0
+) -> numpy.ndarray:
+  '''
+  Picks a batch of points to evaluate by expected improvement. After each pick, the
+  surrogate is conditioned on the point as if it returned its predicted mean (a kriging
+  believer), which leaves the point's neighborhood with little expected improvement so the
+  rest of the batch explores elsewhere.
+
+  Candidates are drawn uniformly over the box, along with local perturbations of the
+  best observed points, since improvements late in a search are usually near the best.
+
+  Parameters:
+  * gp: GaussianProcess - surrogate fit to the observed points
+  * X: numpy.ndarray - observed points
+  * y: numpy.ndarray - observed objective values
+  * batch_size: int - number of points to propose
+  * rng: numpy.random.Generator - source of candidates
+  * n_candidates: int - number of candidates scored for each pick
+  * xi: float - improvement required over the best, which favors exploration when > 0
+
+  Returns:
+  * numpy.ndarray - the proposed points, one row per point
+  '''
+  X_fit = numpy.asarray(X, dtype=float)
+  y_fit = numpy.asarray(y, dtype=float)
+  best = y_fit.min()
+  top = X_fit[numpy.argsort(y_fit)[:5]]
+  picks = []
+  for i in range(batch_size):
+    n_local = n_candidates // 2
+    candidates = numpy.vstack([
+      rng.uniform(0, 1, size=(n_candidates - n_local, X_fit.shape[1])),
+      numpy.clip(
+        top[rng.integers(0, len(top), n_local)] +
+        rng.normal(0, 0.05, size=(n_local, X_fit.shape[1])),
+        0, 1
+      )
+    ])
+    mu, sigma = gp.predict(candidates)
+    pick = candidates[numpy.argmax(expected_improvement(mu, sigma, best, xi))]
+    picks.append(pick)
+    if i < batch_size - 1:
+      ## condition on the pick at its predicted mean ##
+      X_fit = numpy.vstack([X_fit, pick])
+      y_fit = numpy.append(y_fit, gp.predict(pick[None, :])[0])
+      gp.fit(X_fit, y_fit, optimize_hyperparams=False)
+  return numpy.array(picks)
@@ -0,0 +1,148 @@
+## built-in packages ##
+from typing import Optional
+from contextlib import contextmanager
+import json
+import os
+import time
+
+class OptimizerTelemetry:
+  '''
+  Running telemetry of an optimization: evaluation throughput, time spent in each phase,
+  cache hit rate, the best objective over time, and an ETA when the number of evaluations
+  is known ahead of time.
+
+  Phases are timed with the phase context manager, and nest without double counting, so
+  time in a phase entered inside another is only credited to the inner phase. Time that
+  isn't in any phase is reported as other. A snapshot is written, replacing the previous one,
+  and optionally printed as a progress line, at most every interval seconds.
+  '''
+  def __init__(self,
+    file_path: Optional[str] = None,
+    budget: Optional[int] = None,
+    interval: float = 10.0,
+    progress: bool = False
+  ):
+    self.file_path: Optional[str] = file_path ## where snapshots are written, if anywhere ##
+    self.budget: Optional[int] = budget ## expected evaluations, used for the eta ##
+    self.interval: float = interval ## min seconds between reports ##
+    self.progress: bool = progress ## print a progress line with each report ##
+    self.start_time: Optional[float] = None
+    self.last_report: float = 0.0
+    self.evaluations: int = 0
+    self.phases: dict[str, float] = {}
+    self.phase_stack: list[list] = [] ## open phases as [name, start, time in nested phases] ##
+    self.best: Optional[float] = None
+    self.best_history: list[dict] = [] ## each new best with when it was found ##
+    self.cache_hits: int = 0
+    self.cache_misses: int = 0
+
+  def start(self) -> None:
+    '''
+    Starts the clock, if it hasn't been already.
+    '''
+    if self.start_time is None:
+      self.start_time = time.time()
+      self.last_report = self.start_time
+
+  @property
+  def elapsed(self) -> float:
+    return time.time() - self.start_time if self.start_time is not None else 0.0
+
+  @contextmanager
+  def phase(self, name: str):
+    '''
+    Times the enclosed block as the named phase.
+    '''
+    start = time.perf_counter()
+    self.phase_stack.append([name, start, 0.0])
+    try:
+      yield
+    finally:
+      _, _, nested = self.phase_stack.pop()
+      total = time.perf_counter() - start
+      self.phases[name] = self.phases.get(name, 0.0) + total - nested
+      if len(self.phase_stack) > 0:
+        self.phase_stack[-1][2] += total
+
+  def record(self, best: float) -> None:
+    '''
+    Counts an evaluation, noting the best objective after it when it improves.
+    '''
+    self.evaluations += 1
+    if self.best is None or best < self.best:
+      self.best = best
+      self.best_history.append({
+        'elapsed': round(self.elapsed, 3),
+        'evaluation': self.evaluations,
+        'best': best
+      })
+
+  def update_cache(self, hits: int, misses: int) -> None:
+    '''
+    Sets the evaluation cache's running counts.
+    '''
+    self.cache_hits = hits
+    self.cache_misses = misses
+
+  def snapshot(self) -> dict:
+    '''
+    Current telemetry as a json serializable dict.
+    '''
+    elapsed = self.elapsed
+    rate = self.evaluations / elapsed if elapsed > 0 else 0.0
+    lookups = self.cache_hits + self.cache_misses
+    eta = None
+    if self.budget is not None and rate > 0:
+      eta = max(self.budget - self.evaluations, 0) / rate
+    phases = {k: round(v, 3) for k, v in self.phases.items()}
+    phases['other'] = round(max(elapsed - sum(self.phases.values()), 0.0), 3)
+    return {
+      'elapsed': round(elapsed, 3),
+      'evaluations': self.evaluations,
+      'budget': self.budget,
+      'evaluations_per_sec': round(rate, 4),
+      'eta': round(eta, 1) if eta is not None else None,
+      'best': self.best,
+      'cache_hits': self.cache_hits,
+      'cache_misses': self.cache_misses,
+      'cache_hit_rate': round(self.cache_hits / lookups, 4) if lookups > 0 else None,
+      'phases': phases,
+      'best_history': self.best_history
+    }
+
+  def progress_line(self, snapshot: dict) -> str:
+    '''
+    Compact, single line summary of a snapshot.
+    '''
+    top_phases = sorted(
+      [(k, v) for k, v in snapshot['phases'].items()],
+      key=lambda kv: kv[1],
+      reverse=True
+    )[:3]
+    return '     {0} evals{1} | {2:.2f}/s | best {3} | {4}{5}{6}'.format(
+      snapshot['evaluations'],
+      '/{0}'.format(snapshot['budget']) if snapshot['budget'] is not None else '',
+      snapshot['evaluations_per_sec'],
+      '{0:.4f}'.format(snapshot['best']) if snapshot['best'] is not None else '-',
+      ', '.join('{0} {1:.0f}s'.format(k, v) for k, v in top_phases),
+      ' | cache {0:.0%}'.format(snapshot['cache_hit_rate']) if snapshot['cache_hit_rate'] is not None else '',
+      ' | eta {0:.0f}s'.format(snapshot['eta']) if snapshot['eta'] is not None else ''
+    )
+
+  def report(self, force: bool = False) -> None:
+    '''
+    Writes and prints a snapshot if the interval has passed since the last one.
+    '''
+    now = time.time()
+    if not force and now - self.last_report < self.interval:
+      return
+    self.last_report = now
+    snapshot = self.snapshot()
+    if self.file_path is not None:
+      ## write then swap so readers never see a partial file ##
+      temp_path = '{0}.tmp'.format(self.file_path)
+      with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=2)
+      os.replace(temp_path, self.file_path)
+    if self.progress:
+      print(self.progress_line(snapshot))
@@ -1 +1,8 @@
-from .ConfigOptimizer import ConfigOptimizer
\ No newline at end of file
+from .ConfigOptimizer import ConfigOptimizer
+from .EvaluationPool import EvaluationPool
+from .EvaluationCache import EvaluationCache
+from .MultiStart import optimize_multi_start
+from .InFlightLog import InFlightLog, read_in_flight
+from .CrossValidation import cross_validate
+from .PlanScheduler import run_plan
+from .Campaign import Campaign
\ No newline at end of file
@@ -1,5 +1,8 @@
 from .data_loader import DataLoader
 from .qb_model import QBModel
+from .batch_qb_model import BatchQBModel
+from .dual_qb_model import DualQBModel
+from .model_session import ModelSession
 from .airtable_wrapper import AirtableWrapper
 from .elo_file_constructor import EloConstructor
 from .elo import Elo
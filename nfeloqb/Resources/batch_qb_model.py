@@ -0,0 +1,262 @@
+## Built-ins ##
+import time
+import math
+import warnings
+## packages ##
+import pandas as pd
+import numpy
+
+## local ##
+from ..DataModels import ModelConfig, StateStore
+from ..DataModels.StateStore import NULL_SEASON
+from ..DataModels.Utilities import s_curve_array
+from .qb_model import QBModel
+from .model_steps import (
+    rookie_value, regress_qb, regress_offense, regress_defense, backup_adjustment, play_game
+)
+
+class BatchQBModel(QBModel):
+    ## Runs the QB model for several configs in one chronological pass. Games, ordering, and ##
+    ## starters are shared across configs, so state arrays carry a config axis and each game ##
+    ## updates every config at once with numpy ops ##
+    def __init__(self,
+        games: pd.DataFrame,
+        model_configs: list[ModelConfig]
+    ):
+        if len(model_configs) == 0:
+            raise ValueError('BatchQBModel requires at least one config.')
+        self.configs: list[ModelConfig] = model_configs
+        self.n_configs: int = len(model_configs)
+        ## params as arrays with one value per config ##
+        self.param_values: dict[str, numpy.ndarray] = {
+            k: numpy.array([c.values[k] for c in model_configs], dtype=numpy.float64)
+            for k in model_configs[0].values
+        }
+        ## output, with one column per config ##
+        self.batch_data: dict[str, numpy.ndarray] = {}
+        super().__init__(games, model_configs[0])
+    
+    def intern_ids(self):
+        ## intern ids into a store with a config axis ##
+        self.store = StateStore(
+            qb_ids=self.id_values('player_id'),
+            team_ids=self.id_values('team') + self.id_values('opponent'),
+            n_configs=self.n_configs
+        )
+    
+    def batch_prev_season_team_avg(self, season, team):
+        ## previous season team avg, falling back to each config's init value ##
+        avg = self.lookup_prev_season_team_avg(season, team)
+        return self.param_values['init_value'] if avg is None else avg
+    
+    def batch_prev_season_league_avg(self, season):
+        ## previous season league avg, falling back to each config's init value ##
+        avg = self.lookup_prev_season_league_avg(season)
+        return self.param_values['init_value'] if avg is None else avg
+    
+    def run_model(self):
+        '''
+        Walks the games once, updating the state of every config in the batch. Game updates
+        and regressions are the model_steps the single config engines use, on vectors with
+        one value per config
+        '''
+        start_time = time.time()
+        self.store.reset()
+        p = self.param_values
+        n = len(self.games)
+        ## unpack game columns ##
+        qb_codes = self.game_columns['qb_codes']
+        team_codes = self.game_columns['team_codes']
+        opponent_codes = self.game_columns['opponent_codes']
+        seasons = self.game_columns['seasons']
+        player_values = self.game_columns['player_values']
+        draft_numbers = self.game_columns['draft_numbers']
+        teams = self.game_columns['teams']
+        ## weather for every game and config ##
+        weather_adjs = (
+            s_curve_array(p['temp_disc_height'], p['temp_disc_mp'], self.game_columns['clean_temps'][:, None], 'down') +
+            s_curve_array(p['wind_disc_height'], p['wind_disc_mp'], self.game_columns['clean_winds'][:, None], 'up')
+        )
+        ## s curves over start counts for every config, as lookup tables ##
+        starts = numpy.arange(self.max_player_games + 1)[:, None]
+        league_table = s_curve_array(
+            p['player_regression_league_height'], p['player_regression_league_mp'], starts, 'down'
+        )
+        career_table = s_curve_array(
+            p['player_regression_career_height'], p['player_regression_career_mp'], starts, 'up'
+        )
+        season_table = s_curve_array(1, 4, starts[:, 0], 'up')
+        rolling_sf_table = s_curve_array(
+            p['player_career_sf_height'], p['player_career_sf_mp'], starts, 'down'
+        )
+        ## state ##
+        qb_init = self.store.qb['initialized']
+        qb_value = self.store.qb['current_value']
+        qb_variance = self.store.qb['current_variance']
+        qb_rolling = self.store.qb['rolling_value']
+        qb_starts = self.store.qb['starts']
+        qb_season_starts = self.store.qb['season_starts']
+        qb_alotted = self.store.qb['season_team_adjs_alotted']
+        qb_team_adjs = self.store.qb['season_team_adjs_received']
+        qb_player_adjs = self.store.qb['season_player_adjs_received']
+        qb_last_season = self.store.qb['last_game_season']
+        team_init = self.store.team['initialized']
+        off_value = self.store.team['off_value']
+        def_value = self.store.team['def_value']
+        season_adjs = self.store.team['season_adjs']
+        last_season_off = self.store.team['last_game_season_off']
+        last_season_def = self.store.team['last_game_season_def']
+        ## output ##
+        out_value_pre = numpy.empty((n, self.n_configs))
+        out_team_value_pre = numpy.empty((n, self.n_configs))
+        out_value_pre_def_adj = numpy.empty((n, self.n_configs))
+        ## walk games ##
+        for i in range(n):
+            q = qb_codes[i]
+            t = team_codes[i]
+            o = opponent_codes[i]
+            season = seasons[i]
+            ## init objects as necessary ##
+            if not qb_init[q]:
+                inital_team_avg = self.batch_prev_season_team_avg(season, teams[i])
+                inital_league_avg = self.batch_prev_season_league_avg(season)
+                draft_number = draft_numbers[i]
+                log_draft = (
+                    math.log(draft_number) if draft_number == draft_number
+                    else numpy.log(p['rookie_undrafted_draft_number'])
+                )
+                qb_value[q] = rookie_value(
+                    p['rookie_draft_intercept'], p['rookie_draft_slope'], log_draft,
+                    p['rookie_league_reg'], p['rookie_league_cap'], inital_team_avg, inital_league_avg
+                )
+                qb_variance[q] = 1000
+                qb_rolling[q] = qb_value[q]
+                qb_init[q] = True
+            for k in (t, o):
+                if not team_init[k]:
+                    off_value[k] = p['init_value']
+                    def_value[k] = 0
+                    season_adjs[k] = 0
+                    team_init[k] = True
+            ## handle regressions ##
+            ## QB ##
+            if qb_last_season[q] != NULL_SEASON and season > qb_last_season[q]:
+                qb_value[q] = regress_qb(
+                    qb_value[q], qb_team_adjs[q], qb_rolling[q], league_table[qb_starts[q]],
+                    season_table[qb_season_starts[q]], career_table[qb_starts[q]],
+                    self.batch_prev_season_league_avg(season)
+                )
+                qb_season_starts[q] = 0
+                qb_alotted[q] = 0
+                qb_team_adjs[q] = 0
+                qb_player_adjs[q] = 0
+            ## TEAM ##
+            if last_season_off[t] != NULL_SEASON and season > last_season_off[t]:
+                ## normalization is written back to the params, as in Team.regress_offense ##
+                off_value[t], p['team_off_qb_reversion'], p['team_off_league_reversion'] = regress_offense(
+                    off_value[t], qb_value[q], p['team_off_qb_reversion'],
+                    p['team_off_league_reversion'], self.batch_prev_season_league_avg(season)
+                )
+                season_adjs[t] = 0
+            ## OPPONENT ##
+            if last_season_def[o] != NULL_SEASON and season > last_season_def[o]:
+                def_value[o] = regress_defense(def_value[o], p['team_def_reversion'])
+            ## get values, accounting for the backup adjustment ##
+            if qb_season_starts[q] == 0:
+                qb_value[q], qb_alotted[q], qb_team_adjs[q] = backup_adjustment(
+                    qb_value[q], off_value[t], season_adjs[t], qb_player_adjs[q],
+                    qb_alotted[q], qb_team_adjs[q], p['player_team_adj_allotment_disc']
+                )
+            ## state rows are views, so values read before the update are copied ##
+            qb_expected_value = qb_value[q].copy()
+            team_off_value = off_value[t].copy()
+            (
+                qb_expected_value_adj_def, def_adjusted_performance, qb_value[q],
+                qb_rolling[q], qb_variance[q], off_value[t], def_value[o]
+            ) = play_game(
+                qb_expected_value, qb_rolling[q], qb_variance[q], team_off_value, def_value[o],
+                player_values[i], weather_adjs[i],
+                p['player_career_sf_base'] + rolling_sf_table[qb_starts[q] + 1],
+                p['player_sf'], p['team_off_sf'], p['team_def_sf'], p['player_prog_disc_alpha']
+            )
+            ## update qb ##
+            qb_last_season[q] = season
+            qb_starts[q] += 1
+            qb_season_starts[q] += 1
+            qb_player_adjs[q] += (qb_value[q] - qb_expected_value)
+            ## update team and opponent ##
+            season_adjs[t] += qb_value[q] - qb_expected_value
+            last_season_off[t] = season
+            last_season_def[o] = season
+            ## write outputs ##
+            out_value_pre[i] = qb_expected_value
+            out_team_value_pre[i] = team_off_value
+            out_value_pre_def_adj[i] = qb_expected_value_adj_def
+        ## write param normalizations back to the configs ##
+        for j, config in enumerate(self.configs):
+            for k in ['team_off_qb_reversion', 'team_off_league_reversion']:
+                config.values[k] = p[k].item(j)
+        self.batch_data = {
+            'qb_value_pre' : out_value_pre,
+            'team_value_pre' : out_team_value_pre,
+            'qb_value_pre_def_adj' : out_value_pre_def_adj
+        }
+        self.model_runtime = time.time() - start_time
+    
+    def score_model(self, first_season=2009, exclude_seasons=None) -> list[dict]:
+        '''
+        Scores each config in the batch, returning a list of records with the same
+        fields as QBModel.score_model(add_elo=False)
+        '''
+        player_value = self.games['player_VALUE'].to_numpy(dtype=numpy.float64)[:, None]
+        start_number = self.games['start_number'].to_numpy()
+        ## only look at data past first season ##
+        seasons = self.games['season'].to_numpy()
+        scored = seasons >= first_season
+        if exclude_seasons is not None:
+            scored &= ~numpy.isin(seasons, exclude_seasons)
+        pred = self.batch_data['qb_value_pre_def_adj']
+        se = ((pred - player_value) ** 2)[scored]
+        abs_error = numpy.absolute(pred - player_value)[scored]
+        backup = (self.batch_data['qb_value_pre'] - self.batch_data['team_value_pre'] < -15)[scored]
+        with warnings.catch_warnings():
+            ## configs with no backups or rookies return nan, as in score_model ##
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            rmse = numpy.nanmean(se, axis=0) ** 0.5
+            mae = numpy.nanmean(abs_error, axis=0)
+            ## mean of the in-sample season maes ##
+            scored_seasons = seasons[scored]
+            season_mae = numpy.nanmean([
+                numpy.nanmean(abs_error[scored_seasons == season], axis=0)
+                for season in numpy.unique(scored_seasons)
+            ], axis=0)
+            mae_first_16 = numpy.nanmean(numpy.where(
+                (start_number[scored] <= 16)[:, None], abs_error, numpy.nan
+            ), axis=0)
+            mae_backup = numpy.nanmean(numpy.where(backup, abs_error, numpy.nan), axis=0)
+            ## rolling averages, which fall back to the model where a player has no history ##
+            rolling = {}
+            for roll, baseline in self.rolling_baselines().items():
+                roll_pred = numpy.where(
+                    numpy.isnan(baseline)[:, None], pred, baseline[:, None]
+                )
+                rolling[roll] = (
+                    numpy.nanmean(((roll_pred - player_value) ** 2)[scored], axis=0) ** 0.5,
+                    numpy.nanmean(numpy.absolute(roll_pred - player_value)[scored], axis=0)
+                )
+        ## build records ##
+        records = []
+        for j, config in enumerate(self.configs):
+            record = config.values.copy()
+            record['rmse'] = rmse.item(j)
+            record['mae'] = mae.item(j)
+            record['season_mae'] = season_mae.item(j)
+            record['mae_first_16'] = mae_first_16.item(j)
+            record['mae_backup'] = mae_backup.item(j)
+            for roll, (roll_rmse, roll_mae) in rolling.items():
+                record['rmse_r{0}'.format(roll)] = roll_rmse.item(j)
+                record['mae_r{0}'.format(roll)] = roll_mae.item(j)
+            ## the run is shared, so each config is credited an equal share of it ##
+            record['model_runtime'] = self.model_runtime / self.n_configs
+            records.append(record)
+        return records
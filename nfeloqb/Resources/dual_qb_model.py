@@ -0,0 +1,297 @@
+## Built-ins ##
+import time
+import warnings
+from typing import Optional
+## packages ##
+import pandas as pd
+import numpy
+
+## local ##
+from ..DataModels import ModelConfig, ModelOutput
+from ..DataModels.StateStore import NULL_SEASON
+from ..DataModels.Utilities import s_curve_array, s_curve_table, prog_disc_cap, Dual, dual_log
+from ..DataModels.Utilities.dual import value
+from .qb_model import QBModel
+from .model_steps import (
+    rookie_value, regress_qb, regress_offense, regress_defense, backup_adjustment, play_game
+)
+
+class DualQBModel(QBModel):
+    ## Runs the QB model with forward mode derivatives. Params being differentiated are ##
+    ## seeded as dual numbers, which carry the derivative of every value with respect to ##
+    ## each of them through the run, so a single pass returns the output and its gradient ##
+    ## Values are computed with the same float operations as the columnar engine, so the ##
+    ## output and scored record match a columnar run of the same config exactly ##
+    def __init__(self,
+        games: pd.DataFrame,
+        model_config: ModelConfig
+    ):
+        self.wrt: list[str] = [] ## params the last run was differentiated with respect to ##
+        self.tangents: numpy.ndarray = numpy.empty((0, 0)) ## derivatives of qb_value_pre_def_adj, games x wrt ##
+        super().__init__(games, model_config)
+
+    def run_model(self, wrt: Optional[list[str]] = None):
+        '''
+        Walks the games once, carrying derivatives with respect to the wrt params
+
+        Parameters:
+        * wrt: list[str] - params to differentiate with respect to. Defaults to every param
+        '''
+        start_time = time.time()
+        self.wrt = list(wrt) if wrt is not None else list(self.config.values.keys())
+        self.run_config_hash = self.config_hash()
+        self.store.reset()
+        self.snapshots = []
+        self.max_mae = None
+        self.aborted = False
+        self.abort_mae = None
+        self.resumed_from = 0
+        self.output = ModelOutput(self.games)
+        self.run_dual_engine()
+        self.model_runtime = time.time() - start_time
+
+    def run_dual_engine(self):
+        '''
+        The columnar engine's walk over the games, on dual numbers, through the same
+        model_steps. State is held in local lists, whose values are written back to the store
+        when the walk is complete
+        '''
+        params = self.config.values
+        n_wrt = len(self.wrt)
+        ## params as duals, or floats if they aren't being differentiated ##
+        p = {
+            k: Dual.seed(v, self.wrt.index(k), n_wrt) if k in self.wrt else v
+            for k, v in params.items()
+        }
+        n = len(self.games)
+        ## unpack game columns ##
+        qb_codes = self.game_columns['qb_codes']
+        team_codes = self.game_columns['team_codes']
+        opponent_codes = self.game_columns['opponent_codes']
+        seasons = self.game_columns['seasons']
+        player_values = self.game_columns['player_values']
+        draft_numbers = self.game_columns['draft_numbers']
+        gamedays = self.game_columns['gamedays']
+        teams = self.game_columns['teams']
+        names = self.game_columns['names']
+        clean_temps = self.game_columns['clean_temps'].tolist()
+        clean_winds = self.game_columns['clean_winds'].tolist()
+        log_draft_numbers = self.game_columns['log_draft_numbers'].tolist()
+        prev_team_avgs = self.game_columns['prev_team_avgs'].tolist()
+        prev_team_avgs_known = self.game_columns['prev_team_avgs_known'].tolist()
+        prev_league_avgs = self.game_columns['prev_league_avgs'].tolist()
+        prev_league_avgs_known = self.game_columns['prev_league_avgs_known'].tolist()
+        ## state ##
+        qb_state = {k: v.tolist() for k, v in self.store.qb.items()}
+        team_state = {k: v.tolist() for k, v in self.store.team.items()}
+        qb_init = qb_state['initialized']
+        qb_value = qb_state['current_value']
+        qb_variance = qb_state['current_variance']
+        qb_rolling = qb_state['rolling_value']
+        qb_starts = qb_state['starts']
+        qb_season_starts = qb_state['season_starts']
+        qb_alotted = qb_state['season_team_adjs_alotted']
+        qb_team_adjs = qb_state['season_team_adjs_received']
+        qb_player_adjs = qb_state['season_player_adjs_received']
+        qb_last_date = qb_state['last_game_date']
+        qb_last_season = qb_state['last_game_season']
+        qb_last_team = qb_state['last_game_team']
+        team_init = team_state['initialized']
+        off_value = team_state['off_value']
+        def_value = team_state['def_value']
+        season_adjs = team_state['season_adjs']
+        last_date_off = team_state['last_game_date_off']
+        last_season_off = team_state['last_game_season_off']
+        last_date_def = team_state['last_game_date_def']
+        last_season_def = team_state['last_game_season_def']
+        ## unpack params that are constant through the run ##
+        player_sf = p['player_sf']
+        career_sf_base = p['player_career_sf_base']
+        prog_disc_alpha = p['player_prog_disc_alpha']
+        value_cap = prog_disc_cap(15, prog_disc_alpha) if prog_disc_alpha != 0 else None
+        allotment_disc = p['player_team_adj_allotment_disc']
+        ## s curves over start counts, as lookup tables ##
+        table_size = self.max_player_games + 1
+        starts = numpy.arange(table_size, dtype=numpy.float64)
+        league_table = s_curve_array(
+            p['player_regression_league_height'], p['player_regression_league_mp'], starts, 'down'
+        ).tolist()
+        career_table = s_curve_array(
+            p['player_regression_career_height'], p['player_regression_career_mp'], starts, 'up'
+        ).tolist()
+        season_table = s_curve_table(1, 4, table_size, 'up')
+        rolling_sf_table = s_curve_array(
+            p['player_career_sf_height'], p['player_career_sf_mp'], starts, 'down'
+        ).tolist()
+        ## weather, evaluated once per distinct temp and wind ##
+        temps = numpy.unique(clean_temps)
+        temp_adjs = dict(zip(
+            temps.tolist(),
+            s_curve_array(p['temp_disc_height'], p['temp_disc_mp'], temps, 'down').tolist()
+        ))
+        winds = numpy.unique(clean_winds)
+        wind_adjs = dict(zip(
+            winds.tolist(),
+            s_curve_array(p['wind_disc_height'], p['wind_disc_mp'], winds, 'up').tolist()
+        ))
+        log_undrafted = dual_log(p['rookie_undrafted_draft_number'])
+        team_off_sf = p['team_off_sf']
+        team_def_sf = p['team_def_sf']
+        team_def_reversion = p['team_def_reversion']
+        init_value = p['init_value']
+        out = self.output.columns
+        tangents = numpy.zeros((n, n_wrt))
+        ## walk games ##
+        for i in range(n):
+            q = qb_codes[i]
+            t = team_codes[i]
+            o = opponent_codes[i]
+            season = seasons[i]
+            league_avg = prev_league_avgs[i] if prev_league_avgs_known[i] else init_value
+            ## init objects as necessary ##
+            if not qb_init[q]:
+                team_avg = prev_team_avgs[i] if prev_team_avgs_known[i] else init_value
+                log_draft = log_draft_numbers[i] if log_draft_numbers[i] == log_draft_numbers[i] else log_undrafted
+                qb_state['player_name'][q] = names[i]
+                qb_state['draft_number'][q] = draft_numbers[i]
+                qb_state['inital_team_avg'][q] = value(team_avg)
+                qb_state['inital_league_avg'][q] = value(league_avg)
+                qb_state['first_game_date'][q] = gamedays[i]
+                qb_state['first_game_season'][q] = season
+                qb_value[q] = rookie_value(
+                    p['rookie_draft_intercept'], p['rookie_draft_slope'], log_draft,
+                    p['rookie_league_reg'], p['rookie_league_cap'], team_avg, league_avg
+                )
+                qb_variance[q] = 1000
+                qb_rolling[q] = qb_value[q]
+                qb_init[q] = True
+            for k in (t, o):
+                if not team_init[k]:
+                    off_value[k] = init_value
+                    def_value[k] = 0
+                    season_adjs[k] = 0
+                    team_init[k] = True
+            ## handle regressions ##
+            ## QB ##
+            if qb_last_season[q] != NULL_SEASON and season > qb_last_season[q]:
+                qb_value[q] = regress_qb(
+                    qb_value[q], qb_team_adjs[q], qb_rolling[q], league_table[qb_starts[q]],
+                    season_table[qb_season_starts[q]], career_table[qb_starts[q]], league_avg
+                )
+                qb_season_starts[q] = 0
+                qb_alotted[q] = 0
+                qb_team_adjs[q] = 0
+                qb_player_adjs[q] = 0
+            ## TEAM ##
+            if last_season_off[t] != NULL_SEASON and season > last_season_off[t]:
+                ## normalization is written back to the config, as in Team.regress_offense ##
+                off_value[t], p['team_off_qb_reversion'], p['team_off_league_reversion'] = regress_offense(
+                    off_value[t], qb_value[q], p['team_off_qb_reversion'],
+                    p['team_off_league_reversion'], league_avg
+                )
+                params['team_off_qb_reversion'] = value(p['team_off_qb_reversion'])
+                params['team_off_league_reversion'] = value(p['team_off_league_reversion'])
+                season_adjs[t] = 0
+            ## OPPONENT ##
+            if last_season_def[o] != NULL_SEASON and season > last_season_def[o]:
+                def_value[o] = regress_defense(def_value[o], team_def_reversion)
+            ## get values, accounting for the backup adjustment ##
+            if qb_season_starts[q] == 0:
+                qb_value[q], qb_alotted[q], qb_team_adjs[q] = backup_adjustment(
+                    qb_value[q], off_value[t], season_adjs[t], qb_player_adjs[q],
+                    qb_alotted[q], qb_team_adjs[q], allotment_disc
+                )
+            qb_expected_value = qb_value[q]
+            team_off_value = off_value[t]
+            team_def_adjustment = def_value[o]
+            (
+                qb_expected_value_adj_def, def_adjusted_performance, qb_value[q],
+                qb_rolling[q], qb_variance[q], off_value[t], def_value[o]
+            ) = play_game(
+                qb_expected_value, qb_rolling[q], qb_variance[q], team_off_value,
+                team_def_adjustment, player_values[i],
+                temp_adjs[clean_temps[i]] + wind_adjs[clean_winds[i]],
+                career_sf_base + rolling_sf_table[qb_starts[q] + 1],
+                player_sf, team_off_sf, team_def_sf, prog_disc_alpha, value_cap
+            )
+            ## update qb ##
+            qb_last_date[q] = gamedays[i]
+            qb_last_season[q] = season
+            qb_last_team[q] = teams[i]
+            qb_starts[q] += 1
+            qb_season_starts[q] += 1
+            qb_player_adjs[q] += (qb_value[q] - qb_expected_value)
+            ## update team and opponent ##
+            season_adjs[t] += qb_value[q] - qb_expected_value
+            last_date_off[t] = gamedays[i]
+            last_season_off[t] = season
+            last_date_def[o] = gamedays[i]
+            last_season_def[o] = season
+            ## write outputs ##
+            if isinstance(qb_expected_value_adj_def, Dual):
+                tangents[i] = qb_expected_value_adj_def.d
+            out['qb_value_pre'][i] = value(qb_expected_value)
+            out['team_value_pre'][i] = value(team_off_value)
+            out['qb_adj'][i] = value(qb_expected_value - team_off_value)
+            out['opponent_def_value_pre'][i] = value(team_def_adjustment)
+            out['qb_value_pre_def_adj'][i] = value(qb_expected_value_adj_def)
+            out['player_VALUE_adj'][i] = value(def_adjusted_performance)
+            out['qb_value_post'][i] = value(qb_value[q])
+            out['team_value_post'][i] = value(off_value[t])
+            out['opponent_def_value_post'][i] = value(def_value[o])
+            out['player_name'][i] = qb_state['player_name'][q]
+            out['current_value'][i] = value(qb_value[q])
+            out['current_variance'][i] = value(qb_variance[q])
+            out['rolling_value'][i] = value(qb_rolling[q])
+            out['season_team_adjs_alotted'][i] = value(qb_alotted[q])
+            out['season_team_adjs_received'][i] = value(qb_team_adjs[q])
+            out['season_player_adjs_received'][i] = value(qb_player_adjs[q])
+            out['starts'][i] = qb_starts[q]
+            out['season_starts'][i] = qb_season_starts[q]
+        self.tangents = tangents
+        ## write state values back to the store ##
+        for k, v in qb_state.items():
+            self.store.qb[k][:] = [value(x) for x in v]
+        for k, v in team_state.items():
+            self.store.team[k][:] = [value(x) for x in v]
+
+    def score_gradient(self, objective_name='mae', first_season=2009, exclude_seasons=None) -> numpy.ndarray:
+        '''
+        Gradient of a scored record field with respect to the wrt params. The error
+        objectives are weighted sums of absolute errors, so each is differentiated as the
+        weighted sum of the sign of each error times its derivative. Where an error is
+        exactly zero, its derivative is taken as zero
+
+        Parameters:
+        * objective_name: str - 'mae', 'season_mae', 'mae_first_16', or 'mae_backup'
+        * first_season: int - the first season scored, as in score_model
+        * exclude_seasons: list[int] - seasons left out of the score, as in score_model
+
+        Returns:
+        * numpy.ndarray - the derivative of the field with respect to each wrt param
+        '''
+        out = self.output.columns
+        seasons = self.games['season'].to_numpy()
+        error = out['qb_value_pre_def_adj'] - self.games['player_VALUE'].to_numpy(dtype=numpy.float64)
+        scored = (seasons >= first_season) & ~numpy.isnan(error)
+        if exclude_seasons is not None:
+            scored &= ~numpy.isin(seasons, exclude_seasons)
+        if objective_name == 'mae_first_16':
+            scored &= self.games['start_number'].to_numpy() <= 16
+        elif objective_name == 'mae_backup':
+            scored &= out['qb_value_pre'] - out['team_value_pre'] < -15
+        elif objective_name not in ['mae', 'season_mae']:
+            raise ValueError('Objective {0} does not have a gradient.'.format(objective_name))
+        ## weight of each game's absolute error in the objective ##
+        weights = numpy.zeros(len(error))
+        if objective_name == 'season_mae':
+            scored_seasons = numpy.unique(seasons[scored])
+            for season in scored_seasons:
+                in_season = scored & (seasons == season)
+                weights[in_season] = 1 / (in_season.sum() * len(scored_seasons))
+        elif scored.any():
+            weights[scored] = 1 / scored.sum()
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            signs = numpy.where(scored, numpy.sign(error), 0)
+        return (weights * signs) @ self.tangents
@@ -10,7 +10,7 @@ class EloConstructor():
         self.at_wrapper = at_wrapper ## an updated AirtableWrapper Class object ##
         self.elo = elo ## an updated Elo Class object ##
         self.export_loc = export_loc ## location to export new file ##
-        self.qb_values = pd.DataFrame(qb_model.data)
+        self.qb_values = qb_model.data
         self.original_elo_file = pd.read_csv(self.qb_model.original_file_loc, index_col=0) ## original elo file ##
         self.original_elo_cols = self.original_elo_file.columns.to_list()
         self.new_games = None ## games that occured after original file ##
@@ -0,0 +1,36 @@
+## packages ##
+import pandas as pd
+
+## local ##
+from ..DataModels import ModelConfig
+from .qb_model import QBModel
+
+class ModelSession():
+    ## Prepares a games df once so the QB model can be run repeatedly under different configs. ##
+    ## Sorting, id interning, column extraction, and season averages are done when the session ##
+    ## is created and reused by every run. Each run resets the preallocated state store in ##
+    ## place and writes to fresh output buffers ##
+    def __init__(self,
+        games: pd.DataFrame,
+        model_config: ModelConfig = None
+    ):
+        self.model: QBModel = QBModel(games, model_config)
+        self.runs: int = 0 ## number of runs made with the session ##
+
+    def run(self, model_config: ModelConfig, **kwargs) -> QBModel:
+        '''
+        Runs the model with a config, reusing the prepared games
+
+        Parameters:
+        * model_config: ModelConfig - the config to run
+        * kwargs - passed to QBModel.run_model
+
+        Returns:
+        * QBModel - the session's model, which holds the output of this run. The model is
+            reused by the next run, so output tables that are needed later should be kept
+            from the model before running again
+        '''
+        self.model.config = model_config
+        self.model.run_model(**kwargs)
+        self.runs += 1
+        return self.model
@@ -0,0 +1,153 @@
+## Built-ins ##
+from typing import Optional, Tuple
+## packages ##
+import numpy
+
+## local ##
+from ..DataModels.Utilities import prog_disc, prog_disc_array
+
+## The model's game updates and offseason regressions, shared by the columnar, batch, and ##
+## dual engines. Each step is pure: it takes state values and returns the updated ones, ##
+## and the engine reads and writes its own state. Values can be floats, duals, or numpy ##
+## vectors with one value per config. Branches are plain ifs on floats and duals, and ##
+## elementwise selections on config vectors, so every engine runs the same math ##
+
+def choose(condition, if_true, if_false):
+    '''
+    Picks a value by a condition, elementwise for config vectors, and with a plain branch
+    for floats and duals.
+    '''
+    if isinstance(condition, numpy.ndarray):
+        return numpy.where(condition, if_true, if_false)
+    return if_true if condition else if_false
+
+def normalize_regressions(first, second) -> Tuple:
+    '''
+    Scales two regression weights so they sum to one, if they sum to more than one.
+    '''
+    total = first + second
+    over = total > 1
+    if isinstance(over, numpy.ndarray):
+        return numpy.where(over, first / total, first), numpy.where(over, second / total, second)
+    if over:
+        return first / total, second / total
+    return first, second
+
+def rookie_value(
+    draft_intercept, draft_slope, log_draft, league_reg, league_cap, team_avg, league_avg
+):
+    '''
+    A QB's value before their first start, as in QB.initial_value. The draft value, plus
+    a blend of the team and league averages, capped at a multiple of the league average.
+    '''
+    draft_value = (
+        (draft_intercept + (draft_slope * log_draft)) +
+        (
+            ((1-league_reg) * team_avg) +
+            (league_reg * league_avg)
+        ) * (1+league_cap)
+    )
+    cap = (1+league_cap) * league_avg
+    ## mirror min(), which keeps the first value unless the second is less ##
+    return choose(cap < draft_value, cap, draft_value)
+
+def regress_qb(
+    qb_value, team_adjs, rolling_value, league_regression, season_regression,
+    career_regression, league_avg
+):
+    '''
+    A QB's value after an offseason, as in QB.regress_value. Team adjustments received
+    during the season are removed, then the value is regressed toward the league average
+    and the QB's rolling value.
+    '''
+    qb_value = qb_value - team_adjs
+    league_regression, career_regression = normalize_regressions(
+        league_regression * season_regression, career_regression
+    )
+    return (
+        (1 - league_regression - career_regression) * qb_value +
+        (league_regression * league_avg) +
+        (career_regression * rolling_value)
+    )
+
+def regress_offense(off_value, qb_value, qb_reversion, league_reversion, league_avg) -> Tuple:
+    '''
+    A team's offensive value after an offseason, as in Team.regress_offense, along with the
+    normalized reversions, which the engine writes back to its params.
+    '''
+    qb_reversion, league_reversion = normalize_regressions(qb_reversion, league_reversion)
+    off_value = (
+        (
+            1 -
+            qb_reversion -
+            league_reversion
+        ) * off_value +
+        qb_reversion * qb_value +
+        league_reversion * league_avg
+    )
+    return off_value, qb_reversion, league_reversion
+
+def regress_defense(def_value, def_reversion):
+    '''
+    A team's defensive value after an offseason, as in Team.regress_defense.
+    '''
+    return (
+        (1 - def_reversion) * def_value +
+        def_reversion * 0
+    )
+
+def backup_adjustment(
+    qb_value, off_value, season_adjs, player_adjs, alotted, team_adjs, allotment_disc
+) -> Tuple:
+    '''
+    Adjusts a QB making their first start of the season for a team well above them, as in
+    QB.get_value, by a share of the team's season adjustments the QB hasn't received.
+    Returns the QB's value, adjustments alotted, and team adjustments received.
+    '''
+    backup = (season_adjs != 0) & (qb_value - off_value < -10)
+    if not numpy.any(backup):
+        return qb_value, alotted, team_adjs
+    net_adjs = season_adjs - (player_adjs + alotted)
+    other_qb_adj = net_adjs * allotment_disc
+    return (
+        choose(backup, qb_value + other_qb_adj, qb_value),
+        choose(backup, alotted + net_adjs, alotted),
+        choose(backup, team_adjs + other_qb_adj, team_adjs)
+    )
+
+def play_game(
+    qb_value, rolling_value, variance, off_value, def_value, player_value, weather_adj,
+    rolling_sf, player_sf, team_off_sf, team_def_sf, prog_disc_alpha,
+    value_cap: Optional[float] = None
+) -> Tuple:
+    '''
+    Updates the QB, team, and opponent with a game, as the iterrows engine does with
+    QB.update_value, Team.update_off_value, and Team.update_def_value
+
+    Returns:
+    * tuple - the QB's projection against the defense, the QB's performance adjusted for
+        the defense, and the updated QB value, rolling value, variance, team offensive value,
+        and opponent defensive value
+    '''
+    projection = qb_value - def_value + weather_adj
+    performance = player_value + def_value - weather_adj
+    performance_vs_expected = qb_value - (player_value - weather_adj)
+    if isinstance(performance, numpy.ndarray):
+        value_adj = prog_disc_array(performance, projection, 15, prog_disc_alpha)
+    else:
+        value_adj = prog_disc(
+            obs=performance,
+            proj=projection,
+            scale=15,
+            alpha=prog_disc_alpha,
+            cap=value_cap
+        )
+    new_value = player_sf * value_adj + (1 - player_sf) * qb_value
+    rolling_value = rolling_sf * value_adj + (1 - rolling_sf) * rolling_value
+    variance = (
+        player_sf * (performance - qb_value) * (performance - new_value) +
+        (1 - player_sf) * variance
+    )
+    off_value = team_off_sf * performance + (1 - team_off_sf) * off_value
+    def_value = team_def_sf * performance_vs_expected + (1 - team_def_sf) * def_value
+    return projection, performance, new_value, rolling_value, variance, off_value, def_value
@@ -2,13 +2,22 @@
 import time
 import math
 import pathlib
-from typing import Tuple, Any
+import hashlib
+import json
+import pickle
+import bisect
+from typing import Tuple, Optional
 ## packages ##
 import pandas as pd
 import numpy
 
 ## local ##
-from ..DataModels import QB, Team, ModelConfig, GameContext
+from ..DataModels import QB, Team, ModelConfig, GameContext, StateStore, ModelOutput
+from ..DataModels.StateStore import NULL_SEASON, QB_COLUMNS, TEAM_COLUMNS
+from ..DataModels.Utilities import s_curve_array, s_curve_table, prog_disc_cap
+from .model_steps import (
+    rookie_value, regress_qb, regress_offense, regress_defense, backup_adjustment, play_game
+)
 
 class QBModel():
     ## This class is used to store, retrieve, and update data as we
@@ -20,23 +29,34 @@ class QBModel():
         self.games: pd.DataFrame = games
         self.config: ModelConfig = model_config
         ## league states ##
-        self.season_avgs: dict = {} ## storage for season averages ##
-        self.team_avgs: dict = {} ## storage for season team averages ##
-        ## QB and Team state objects ##
-        self.qbs: dict[str, QB] = {} ## storage for most recent QB Data
-        self.teams: dict[str, Team] = {} ## storage for most recent team data
-        self.qb_records: list[dict[str, Any]] = [] ## storage for weekly QB records over time##
+        self.first_season: int = 0 ## first season in the games df, which offsets the avg arrays ##
+        self.season_avgs: numpy.ndarray = numpy.array([]) ## storage for season averages ##
+        self.team_avgs: numpy.ndarray = numpy.array([]) ## storage for season team averages (season x team code) ##
+        self.team_avgs_known: numpy.ndarray = numpy.array([]) ## mask of season team averages that exist ##
+        ## QB and Team state, held as arrays and indexed by interned codes ##
+        self.store: StateStore = None
+        self.game_columns: dict[str, list] = {} ## game columns extracted once for the columnar engine ##
+        self.max_player_games: int = 0 ## most games started by a single QB, which sizes start count tables ##
         ## ouput data ##
-        self.data: list[dict] = [] ## storage for all game records ##
-        self.data_team: list[dict] = [] ## storage for team defense data ##
+        self.output: Optional[ModelOutput] = None ## per-game output buffers of the last run ##
+        self.snapshots: list[dict] = [] ## weekly deltas of QB and team state ##
+        self.baselines: Optional[dict[int, numpy.ndarray]] = None ## rolling average baselines used in scoring ##
+        self.elo_rows: Optional[numpy.ndarray] = None ## row of the 538 reference matching each game ##
         ## tracking ##
         self.current_week: int = 1 ## track the current week to know when it has changed ##
         self.model_run_time: float = 0 ## track the time it takes to run the model ##
+        self.run_config_hash: Optional[str] = None ## hash of the config at the start of the last run ##
+        self.resumed_from: int = 0 ## number of games restored from a checkpoint in the last run ##
+        self.max_mae: Optional[float] = None ## mae bound of the last run, if it was bounded ##
+        self.aborted: bool = False ## whether the last run stopped early because it exceeded its bound ##
+        self.abort_mae: Optional[float] = None ## lower bound on the mae of an aborted run ##
         ## import original elo file location ##
         data_folder = pathlib.Path(__file__).parent.parent.resolve()
         self.original_file_loc = '{0}/Manual Data/original_elo_file.csv'.format(data_folder)
         ## initial ##
         self.chrono_sort() ## sort by date, so games can be iter'd ##
+        self.intern_ids()
+        self.extract_columns()
         self.add_averages()
     
     ##############################
@@ -44,59 +64,186 @@ class QBModel():
     ##############################
     def chrono_sort(self):
         ## sort games by date ##
+        ## games that are already sorted, like published SharedGames, are used without a copy ##
+        if pd.MultiIndex.from_arrays([
+            self.games['season'], self.games['week'], self.games['game_id']
+        ]).is_monotonic_increasing:
+            self.games = self.games.reset_index(drop=True)
+            return
         self.games = self.games.sort_values(
             by=['season', 'week', 'game_id'],
             ascending=[True, True, True]
         ).reset_index(drop=True)
     
+    def id_values(self, column: str) -> list:
+        ## the ids of a column in order of first appearance ##
+        ## categorical columns, like those of SharedGames, are read through their codes ##
+        values = self.games[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = pd.unique(values.cat.codes.to_numpy())
+            return values.cat.categories[codes[codes >= 0]].tolist()
+        return values.tolist()
+    
+    def id_codes(self, column: str, codes: dict) -> numpy.ndarray:
+        ## the store code of each game's id in a column ##
+        values = self.games[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            lookup = numpy.array([codes.get(v, -1) for v in values.cat.categories.tolist()], dtype=numpy.int64)
+            return lookup[values.cat.codes.to_numpy()]
+        return values.map(codes).to_numpy(dtype=numpy.int64)
+    
+    def intern_ids(self):
+        ## intern qb and team ids to integer codes, which index the state store ##
+        self.store = StateStore(
+            qb_ids=self.id_values('player_id'),
+            team_ids=self.id_values('team') + self.id_values('opponent')
+        )
+    
+    def extract_columns(self):
+        ## extract the game columns the columnar engine reads as python lists ##
+        ## these don't depend on the config, so they are reused by every run ##
+        games = self.games
+        self.game_columns = {
+            'qb_codes' : self.id_codes('player_id', self.store.qb_codes).tolist(),
+            'team_codes' : self.id_codes('team', self.store.team_codes).tolist(),
+            'opponent_codes' : self.id_codes('opponent', self.store.team_codes).tolist(),
+            'seasons' : games['season'].to_numpy(dtype=numpy.int64).tolist(),
+            'weeks' : games['week'].to_numpy(dtype=numpy.int64).tolist(),
+            'player_values' : games['player_VALUE'].to_numpy(dtype=numpy.float64).tolist(),
+            'draft_numbers' : games['draft_number'].to_numpy(dtype=numpy.float64).tolist(),
+            'gamedays' : games['gameday'].tolist(),
+            'teams' : games['team'].tolist(),
+            'names' : games['player_display_name'].tolist()
+        }
+        self.max_player_games = int(games['player_id'].value_counts().max()) if len(games) > 0 else 0
+        ## columns read by the prepass are kept as arrays ##
+        ## weather is cleaned as in GameContext.weather_adj ##
+        winds = games['wind'].to_numpy(dtype=numpy.float64)
+        temps = games['temp'].to_numpy(dtype=numpy.float64)
+        self.game_columns['clean_winds'] = numpy.clip(numpy.where(numpy.isnan(winds), 0, winds - 5), 0, 30)
+        self.game_columns['clean_temps'] = numpy.maximum(numpy.where(numpy.isnan(temps), 70, temps), 0)
+        ## log of draft number for drafted QBs, which is nan for undrafted QBs ##
+        draft_numbers = games['draft_number'].to_numpy(dtype=numpy.float64)
+        unique_drafts, draft_index = numpy.unique(draft_numbers, return_inverse=True)
+        self.game_columns['log_draft_numbers'] = numpy.array(
+            [math.log(v) if not math.isnan(v) else numpy.nan for v in unique_drafts.tolist()],
+            dtype=numpy.float64
+        )[draft_index.reshape(-1)]
+    
     def add_averages(self):
         ## adds the avg QB values for teams and leagues which are used in reversion ##
+        ## averages are stored in arrays indexed by season offset and team code ##
+        self.first_season = int(self.games['season'].min()) if len(self.games) > 0 else 0
+        n_seasons = int(self.games['season'].max()) - self.first_season + 1 if len(self.games) > 0 else 0
+        n_teams = len(self.store.team_ids)
         ## calc team averages ##
         team_avgs = self.games.groupby(
-            ['season', 'team']
+            ['season', 'team'], observed=True
         )['team_VALUE'].mean().reset_index()
         ## calc league average ##
         season_avgs = self.games.groupby(
             ['season']
         )['team_VALUE'].mean().reset_index()
         ## write to stoarge ##
-        for index, row in team_avgs.iterrows():
-            self.team_avgs['{0}{1}'.format(row['season'], row['team'])] = row['team_VALUE']
-        for index, row in season_avgs.iterrows():
-            self.season_avgs[row['season']] = row['team_VALUE']
+        self.team_avgs = numpy.full((n_seasons, n_teams), numpy.nan)
+        self.team_avgs_known = numpy.zeros((n_seasons, n_teams), dtype=bool)
+        season_index = team_avgs['season'].to_numpy() - self.first_season
+        team_index = team_avgs['team'].astype(object).map(self.store.team_codes).to_numpy(dtype=numpy.int64)
+        self.team_avgs[season_index, team_index] = team_avgs['team_VALUE'].to_numpy()
+        self.team_avgs_known[season_index, team_index] = True
+        self.season_avgs = numpy.full(n_seasons, numpy.nan)
+        self.season_avgs[season_avgs['season'].to_numpy() - self.first_season] = season_avgs['team_VALUE'].to_numpy()
+        ## previous season averages for each game, with masks of those that exist ##
+        prev_index = self.games['season'].to_numpy(dtype=numpy.int64) - 1 - self.first_season
+        team_codes = numpy.array(self.game_columns['team_codes'], dtype=numpy.int64)
+        has_prev = prev_index >= 0
+        prev_index = numpy.where(has_prev, prev_index, 0)
+        self.game_columns['prev_league_avgs_known'] = has_prev
+        self.game_columns['prev_league_avgs'] = numpy.where(
+            has_prev, self.season_avgs[prev_index] if n_seasons > 0 else numpy.nan, numpy.nan
+        )
+        self.game_columns['prev_team_avgs_known'] = has_prev & (
+            self.team_avgs_known[prev_index, team_codes] if n_seasons > 0 else has_prev
+        )
+        self.game_columns['prev_team_avgs'] = numpy.where(
+            self.game_columns['prev_team_avgs_known'],
+            self.team_avgs[prev_index, team_codes] if n_seasons > 0 else numpy.nan,
+            numpy.nan
+        )
     
     ####################################
     ## RETRIEVAL METHODS FOR AVERAGES ##
     ####################################
+    def lookup_prev_season_team_avg(self, season, team) -> Optional[float]:
+        ## get the teams previous season average, or None if it does not exist ##
+        team_code = self.store.team_codes.get(team)
+        season_index = season - 1 - self.first_season
+        if (
+            team_code is None or season_index < 0 or
+            season_index >= self.team_avgs.shape[0] or
+            team_code >= self.team_avgs.shape[1] or
+            not self.team_avgs_known[season_index, team_code]
+        ):
+            return None
+        return self.team_avgs.item(season_index, team_code)
+    
+    def lookup_prev_season_league_avg(self, season) -> Optional[float]:
+        ## get the leagues previous season average, or None if it does not exist ##
+        season_index = season - 1 - self.first_season
+        if season_index < 0 or season_index >= len(self.season_avgs):
+            return None
+        return self.season_avgs.item(season_index)
+    
     def get_prev_season_team_avg(self, season, team):
         ## get the teams previous season average while controlling for errors ##
         ## the first season will not have a pervous season ##
-        return self.team_avgs.get('{0}{1}'.format(
-            season - 1, team
-        ), self.config.values['init_value'])
+        avg = self.lookup_prev_season_team_avg(season, team)
+        return self.config.values['init_value'] if avg is None else avg
     
     def get_prev_season_league_avg(self, season):
         ## get the leagues previous season average while controlling for errors ##
         ## the first season will not have a pervous season ##
-        return self.season_avgs.get(season - 1, self.config.values['init_value'])
+        avg = self.lookup_prev_season_league_avg(season)
+        return self.config.values['init_value'] if avg is None else avg
     
     ###################################
     ## RETRIEVAL METHODS FOR OBJECTS ##
     ###################################
+    @property
+    def qbs(self) -> dict[str, QB]:
+        ## views of the most recent QB data, keyed by player id ##
+        return {
+            player_id : QB(self.store, code, self.config)
+            for player_id, code in self.store.qb_codes.items()
+            if self.store.qb['initialized'][code]
+        }
+    
+    @property
+    def teams(self) -> dict[str, Team]:
+        ## views of the most recent team data, keyed by team ##
+        return {
+            team : Team(self.store, code, self.config)
+            for team, code in self.store.team_codes.items()
+            if self.store.team['initialized'][code]
+        }
+    
     def get_team(self, team):
         ## retrieve the team object from storage ##
-        if team not in self.teams:
-            self.teams[team] = Team(team, self.config)
-        return self.teams[team]
+        code = self.store.intern_team(team)
+        if not self.store.team['initialized'][code]:
+            return Team.create(self.store, code, self.config)
+        return Team(self.store, code, self.config)
     
     def get_qb(self, row):
         '''
         Retrives a QB object from storage, or creates it if it doesn't exist
         '''
-        if row['player_id'] not in self.qbs:
+        code = self.store.intern_qb(row['player_id'])
+        if not self.store.qb['initialized'][code]:
             ## init the qb if it doesn't exist ##
-            self.qbs[row['player_id']] = QB(
-                player_id=row['player_id'],
+            return QB.create(
+                store=self.store,
+                index=code,
                 player_name=row['player_display_name'],
                 config=self.config,
                 draft_number=row['draft_number'],
@@ -106,7 +253,7 @@ class QBModel():
                 first_game_season=row['season']
             )
         ## retieve the qb from storage ##
-        return self.qbs[row['player_id']]
+        return QB(self.store, code, self.config)
     
     def get_objects(self, row) -> Tuple[QB, Team, Team]:
         '''
@@ -146,22 +293,94 @@ class QBModel():
         return qb, team, opponent
 
 
+    ####################
+    ## OUTPUT TABLES ##
+    ####################
+    @property
+    def data(self) -> pd.DataFrame:
+        ## all game records, with the model's pre and post game values ##
+        return self.output.data if self.output is not None else pd.DataFrame()
+    
+    @property
+    def data_team(self) -> pd.DataFrame:
+        ## team defense values before and after each game ##
+        return self.output.data_team if self.output is not None else pd.DataFrame()
+    
+    @property
+    def qb_records(self) -> pd.DataFrame:
+        ## QB records after each game ##
+        return self.output.qb_records if self.output is not None else pd.DataFrame()
+    
     #####################
     ## MODEL FUNCTIONS ##
     #####################
-    def run_model(self):
+    def run_model(self,
+        engine: str = 'columnar',
+        resume_from: Optional[str] = None,
+        snapshots: bool = False,
+        max_mae: Optional[float] = None,
+        first_season: int = 2009
+    ):
         '''
         Iters through the games df, updates states, and saves the output
+
+        Parameters:
+        * engine: str - 'columnar' walks typed game columns by index and is the default.
+            'iterrows' is the original row-by-row engine using QB and Team objects, and is
+            kept as a reference implementation. Both produce the same output.
+        * resume_from: str - optional path to a checkpoint written by save_checkpoint. If the
+            checkpoint matches the config and the games it covered, only later games are
+            processed. Otherwise, all games are replayed. Only the columnar engine can resume.
+        * snapshots: bool - record weekly deltas of QB and team state so the state as of any
+            season and week can be rebuilt with state_as_of. Only the columnar engine records them.
+        * max_mae: float - optional bound for a bounded run. The absolute error of games from
+            first_season on is summed as the games are walked, and the run stops as soon as the
+            sum proves the mae will exceed the bound. An aborted run's output is incomplete, and
+            score_model returns the lower bound it reached as the mae. Only the columnar engine
+            can run bounded, and not with a checkpoint or snapshots.
+        * first_season: int - the first season scored by a bounded run, as in score_model
         '''
+        if engine not in ['columnar', 'iterrows']:
+            raise ValueError('Engine {0} is not a valid option. Use columnar or iterrows.'.format(engine))
+        if resume_from is not None and engine != 'columnar':
+            raise ValueError('Only the columnar engine can resume from a checkpoint.')
+        if snapshots and engine != 'columnar':
+            raise ValueError('Only the columnar engine can record snapshots.')
+        if max_mae is not None and (engine != 'columnar' or resume_from is not None or snapshots):
+            raise ValueError('Bounded runs are only supported by the columnar engine, without checkpoints or snapshots.')
         ## set a start epoch time ##
         start_time = time.time()
+        self.run_config_hash = self.config_hash()
         ## clear out any existing values ##
-        self.qbs = {} ## storage for most recent QB Data
-        self.teams = {} ## storage for most recent team data
-        self.data = [] ## storage for all game records ##
+        self.store.reset() ## storage for most recent QB and team data ##
         self.current_week = 1 ## track the current week to know when it has changed ##
+        self.snapshots = []
+        self.max_mae = max_mae
+        self.aborted = False
+        self.abort_mae = None
+        ## restore state from a checkpoint if one matches ##
+        start, prefix = 0, None
+        if resume_from is not None:
+            start, prefix = self.load_checkpoint(resume_from, snapshots)
+        self.resumed_from = start
+        ## allocate output buffers, filling in any games restored from the checkpoint ##
+        self.output = ModelOutput(self.games)
+        if start > 0:
+            self.output.fill(prefix, start)
+        if engine == 'columnar':
+            self.run_columnar_engine(start, snapshots, max_mae, first_season)
+        else:
+            self.run_iterrows_engine()
+        end_time = time.time()
+        self.model_runtime = end_time - start_time
+    
+    def run_iterrows_engine(self):
+        '''
+        Iters through the games df row by row using QB and Team objects
+        '''
+        out = self.output.columns
         ## iterate through games df ##
-        for index, row in self.games.iterrows():
+        for i, (index, row) in enumerate(self.games.iterrows()):
             ## retrive the objects ##
             qb, team, opponent = self.get_objects(row)
             ## create a game context ##
@@ -211,49 +430,537 @@ class QBModel():
                 gameday=row['gameday'],
                 season=row['season']
             )
-            ## add opponent defense data to storage ##
-            self.data_team.append({
-                'game_id' : row['game_id'],
-                'season' : row['season'],
-                'week' : row['week'],
-                'team' : row['opponent'],
-                'def_value_pre' : round(team_def_adjustment, 3),
-                'def_value_post' : round(opponent.def_value, 3)
-            })
-            ## construct the row records ##
-            row['qb_value_pre'] = qb_expected_value
-            row['team_value_pre'] = team_off_value
-            row['qb_adj'] = qb_adj
-            row['opponent_def_value_pre'] = team_def_adjustment
-            row['qb_value_pre_def_adj'] = qb_expected_value_adj_def
-            row['player_VALUE_adj'] = def_adjusted_performance
-            row['qb_value_post'] = qb.current_value
-            row['team_value_post'] = team.off_value
-            row['opponent_def_value_post'] = opponent.def_value
-            ## write row to data ##
-            self.data.append(row)
-            qb_record = qb.as_record()
-            qb_record['value_pre'] = row['qb_value_pre']
-            qb_record['opponent_def_value_pre'] = row['opponent_def_value_pre']
-            qb_record['value_pre_def_adj'] = row['qb_value_pre_def_adj']
-            qb_record['value_performance_def_adj'] = row['player_VALUE_adj']
-            qb_record['game_id'] = row['game_id']
-            qb_record['season'] = row['season']
-            qb_record['week'] = row['week']
-            ## round all instances of floats ##
-            for key in qb_record:
-                if isinstance(qb_record[key], float):
-                    qb_record[key] = round(qb_record[key], 3)
-            self.qb_records.append(qb_record)
-        end_time = time.time()
-        self.model_runtime = end_time - start_time
+            ## write outputs ##
+            out['qb_value_pre'][i] = qb_expected_value
+            out['team_value_pre'][i] = team_off_value
+            out['qb_adj'][i] = qb_adj
+            out['opponent_def_value_pre'][i] = team_def_adjustment
+            out['qb_value_pre_def_adj'][i] = qb_expected_value_adj_def
+            out['player_VALUE_adj'][i] = def_adjusted_performance
+            out['qb_value_post'][i] = qb.current_value
+            out['team_value_post'][i] = team.off_value
+            out['opponent_def_value_post'][i] = opponent.def_value
+            out['player_name'][i] = qb.player_name
+            out['current_value'][i] = qb.current_value
+            out['current_variance'][i] = qb.current_variance
+            out['rolling_value'][i] = qb.rolling_value
+            out['starts'][i] = qb.starts
+            out['season_starts'][i] = qb.season_starts
+            out['season_team_adjs_alotted'][i] = qb.season_team_adjs_alotted
+            out['season_team_adjs_received'][i] = qb.season_team_adjs_received
+            out['season_player_adjs_received'][i] = qb.season_player_adjs_received
+    
+    def prepass(self) -> dict[str, list]:
+        '''
+        Computes the values that depend on the config and the game, but not on the
+        sequential state, for every game at once. The columnar engine reads these instead
+        of calculating them game by game.
+
+        Returns:
+        * dict - lists in games order of the weather adjustment, the previous season team and
+            league averages (falling back to the initial value), and the initial value each
+            QB would receive if the game were their first start
+        '''
+        params = self.config.values
+        columns = self.game_columns
+        ## previous season averages ##
+        team_avgs = numpy.where(columns['prev_team_avgs_known'], columns['prev_team_avgs'], params['init_value'])
+        league_avgs = numpy.where(columns['prev_league_avgs_known'], columns['prev_league_avgs'], params['init_value'])
+        ## weather, as in GameContext.weather_adj ##
+        weather_adjs = (
+            s_curve_array(params['temp_disc_height'], params['temp_disc_mp'], columns['clean_temps'], 'down') +
+            s_curve_array(params['wind_disc_height'], params['wind_disc_mp'], columns['clean_winds'], 'up')
+        )
+        ## rookie values, as in QB.initial_value ##
+        log_draft_numbers = numpy.where(
+            numpy.isnan(columns['log_draft_numbers']),
+            math.log(params['rookie_undrafted_draft_number']),
+            columns['log_draft_numbers']
+        )
+        rookie_values = rookie_value(
+            params['rookie_draft_intercept'], params['rookie_draft_slope'], log_draft_numbers,
+            params['rookie_league_reg'], params['rookie_league_cap'], team_avgs, league_avgs
+        )
+        return {
+            'weather_adjs' : weather_adjs.tolist(),
+            'team_avgs' : team_avgs.tolist(),
+            'league_avgs' : league_avgs.tolist(),
+            'rookie_values' : rookie_values.tolist()
+        }
+    
+    def run_columnar_engine(self,
+        start: int = 0,
+        snapshots: bool = False,
+        max_mae: Optional[float] = None,
+        first_season: int = 2009
+    ):
+        '''
+        Walks the games by index over columns that are extracted once, in extract_columns,
+        rather than building a Series per game. State is read from the store into local
+        lists, updated in place, and written back once the walk is complete. Results are written to the preallocated
+        output buffers, which build the data, data_team, and qb_records tables on demand.
+
+        The math mirrors QB, Team, and GameContext exactly, so both engines produce the
+        same output. Game updates and regressions are the model_steps shared with the batch
+        and dual engines.
+
+        Parameters:
+        * start: int - the index of the first game to process. Games before it must already
+            be reflected in the store and the output buffers
+        * snapshots: bool - record a delta of the QBs and teams that changed each week
+        * max_mae: float - stop once the scored absolute error proves the mae exceeds this
+        * first_season: int - the first season whose games are scored against max_mae
+        '''
+        params = self.config.values
+        n = len(self.games)
+        ## unpack game columns ##
+        qb_codes = self.game_columns['qb_codes']
+        team_codes = self.game_columns['team_codes']
+        opponent_codes = self.game_columns['opponent_codes']
+        seasons = self.game_columns['seasons']
+        weeks = self.game_columns['weeks']
+        player_values = self.game_columns['player_values']
+        draft_numbers = self.game_columns['draft_numbers']
+        gamedays = self.game_columns['gamedays']
+        teams = self.game_columns['teams']
+        names = self.game_columns['names']
+        ## compute config dependent game values ##
+        prepass = self.prepass()
+        weather_adjs = prepass['weather_adjs']
+        team_avgs = prepass['team_avgs']
+        league_avgs = prepass['league_avgs']
+        rookie_values = prepass['rookie_values']
+        ## read state into local lists ##
+        qb_state = {k: v.tolist() for k, v in self.store.qb.items()}
+        team_state = {k: v.tolist() for k, v in self.store.team.items()}
+        qb_init = qb_state['initialized']
+        qb_value = qb_state['current_value']
+        qb_variance = qb_state['current_variance']
+        qb_rolling = qb_state['rolling_value']
+        qb_starts = qb_state['starts']
+        qb_season_starts = qb_state['season_starts']
+        qb_alotted = qb_state['season_team_adjs_alotted']
+        qb_team_adjs = qb_state['season_team_adjs_received']
+        qb_player_adjs = qb_state['season_player_adjs_received']
+        qb_last_date = qb_state['last_game_date']
+        qb_last_season = qb_state['last_game_season']
+        qb_last_team = qb_state['last_game_team']
+        team_init = team_state['initialized']
+        off_value = team_state['off_value']
+        def_value = team_state['def_value']
+        season_adjs = team_state['season_adjs']
+        last_date_off = team_state['last_game_date_off']
+        last_season_off = team_state['last_game_season_off']
+        last_date_def = team_state['last_game_date_def']
+        last_season_def = team_state['last_game_season_def']
+        ## unpack params that are constant through the run ##
+        player_sf = params['player_sf']
+        career_sf_base = params['player_career_sf_base']
+        prog_disc_alpha = params['player_prog_disc_alpha']
+        value_cap = prog_disc_cap(15, prog_disc_alpha) if prog_disc_alpha != 0 else None
+        allotment_disc = params['player_team_adj_allotment_disc']
+        ## s curves over start counts, as lookup tables covering every count the run can reach ##
+        table_size = max(qb_starts, default=0) + self.max_player_games + 1
+        league_table = s_curve_table(
+            params['player_regression_league_height'], params['player_regression_league_mp'], table_size, 'down'
+        )
+        career_table = s_curve_table(
+            params['player_regression_career_height'], params['player_regression_career_mp'], table_size, 'up'
+        )
+        season_table = s_curve_table(1, 4, table_size, 'up')
+        rolling_sf_table = s_curve_table(
+            params['player_career_sf_height'], params['player_career_sf_mp'], table_size, 'down'
+        )
+        team_off_sf = params['team_off_sf']
+        team_def_sf = params['team_def_sf']
+        team_def_reversion = params['team_def_reversion']
+        init_value = params['init_value']
+        out = self.output.columns
+        ## track the QBs and teams touched each week for snapshots ##
+        touched_qbs, touched_teams, week_key = set(), set(), None
+        if snapshots and start > 0:
+            ## the last delta of a checkpoint covers a week that may still be in progress, ##
+            ## so it is reopened and recaptured at the next week boundary ##
+            pending = self.snapshots.pop()
+            touched_qbs.update(pending['qb_codes'].tolist())
+            touched_teams.update(pending['team_codes'].tolist())
+            week_key = (seasons[start - 1], weeks[start - 1])
+        ## the total scored absolute error that proves a bounded run exceeds its bound ##
+        bounded = max_mae is not None
+        if bounded:
+            scored_values = numpy.array(player_values)[numpy.array(seasons) >= first_season]
+            n_scored = int((~numpy.isnan(scored_values)).sum())
+            error_bound = max_mae * n_scored
+            abs_error_sum = 0.0
+        ## walk games ##
+        for i in range(start, n):
+            q = qb_codes[i]
+            t = team_codes[i]
+            o = opponent_codes[i]
+            season = seasons[i]
+            if snapshots:
+                if (season, weeks[i]) != week_key:
+                    if len(touched_qbs) > 0:
+                        self.snapshots.append(self.snapshot_delta(
+                            week_key, touched_qbs, touched_teams, qb_state, team_state
+                        ))
+                    touched_qbs, touched_teams = set(), set()
+                    week_key = (season, weeks[i])
+                touched_qbs.add(q)
+                touched_teams.update((t, o))
+            ## init objects as necessary ##
+            if not qb_init[q]:
+                qb_state['player_name'][q] = names[i]
+                qb_state['draft_number'][q] = draft_numbers[i]
+                qb_state['inital_team_avg'][q] = team_avgs[i]
+                qb_state['inital_league_avg'][q] = league_avgs[i]
+                qb_state['first_game_date'][q] = gamedays[i]
+                qb_state['first_game_season'][q] = season
+                qb_value[q] = rookie_values[i]
+                qb_variance[q] = 1000
+                qb_rolling[q] = qb_value[q]
+                qb_init[q] = True
+            for k in (t, o):
+                if not team_init[k]:
+                    off_value[k] = init_value
+                    def_value[k] = 0
+                    season_adjs[k] = 0
+                    team_init[k] = True
+            ## handle regressions ##
+            ## QB ##
+            if qb_last_season[q] != NULL_SEASON and season > qb_last_season[q]:
+                qb_value[q] = regress_qb(
+                    qb_value[q], qb_team_adjs[q], qb_rolling[q], league_table[qb_starts[q]],
+                    season_table[qb_season_starts[q]], career_table[qb_starts[q]], league_avgs[i]
+                )
+                qb_season_starts[q] = 0
+                qb_alotted[q] = 0
+                qb_team_adjs[q] = 0
+                qb_player_adjs[q] = 0
+            ## TEAM ##
+            if last_season_off[t] != NULL_SEASON and season > last_season_off[t]:
+                ## normalization is written back to the config, as in Team.regress_offense ##
+                off_value[t], params['team_off_qb_reversion'], params['team_off_league_reversion'] = regress_offense(
+                    off_value[t], qb_value[q], params['team_off_qb_reversion'],
+                    params['team_off_league_reversion'], league_avgs[i]
+                )
+                season_adjs[t] = 0
+            ## OPPONENT ##
+            if last_season_def[o] != NULL_SEASON and season > last_season_def[o]:
+                def_value[o] = regress_defense(def_value[o], team_def_reversion)
+            ## get values, accounting for the backup adjustment ##
+            if qb_season_starts[q] == 0:
+                qb_value[q], qb_alotted[q], qb_team_adjs[q] = backup_adjustment(
+                    qb_value[q], off_value[t], season_adjs[t], qb_player_adjs[q],
+                    qb_alotted[q], qb_team_adjs[q], allotment_disc
+                )
+            qb_expected_value = qb_value[q]
+            team_off_value = off_value[t]
+            team_def_adjustment = def_value[o]
+            player_value = player_values[i]
+            ## play the game, without writing state until the run is known to continue ##
+            (
+                qb_expected_value_adj_def, def_adjusted_performance, new_value,
+                new_rolling, new_variance, new_off_value, new_def_value
+            ) = play_game(
+                qb_expected_value, qb_rolling[q], qb_variance[q], team_off_value,
+                team_def_adjustment, player_value, weather_adjs[i],
+                career_sf_base + rolling_sf_table[qb_starts[q] + 1],
+                player_sf, team_off_sf, team_def_sf, prog_disc_alpha, value_cap
+            )
+            ## stop a bounded run once its mae can't come in under the bound ##
+            if bounded and season >= first_season:
+                abs_error = abs(qb_expected_value_adj_def - player_value)
+                if abs_error == abs_error:
+                    abs_error_sum += abs_error
+                    if abs_error_sum > error_bound:
+                        self.aborted = True
+                        self.abort_mae = abs_error_sum / n_scored
+                        break
+            ## update qb ##
+            qb_last_date[q] = gamedays[i]
+            qb_last_season[q] = season
+            qb_last_team[q] = teams[i]
+            qb_starts[q] += 1
+            qb_season_starts[q] += 1
+            qb_value[q] = new_value
+            qb_rolling[q] = new_rolling
+            qb_variance[q] = new_variance
+            qb_player_adjs[q] += (new_value - qb_expected_value)
+            ## update team and opponent ##
+            off_value[t] = new_off_value
+            season_adjs[t] += new_value - qb_expected_value
+            last_date_off[t] = gamedays[i]
+            last_season_off[t] = season
+            def_value[o] = new_def_value
+            last_date_def[o] = gamedays[i]
+            last_season_def[o] = season
+            ## write outputs ##
+            out['qb_value_pre'][i] = qb_expected_value
+            out['team_value_pre'][i] = team_off_value
+            out['qb_adj'][i] = qb_expected_value - team_off_value
+            out['opponent_def_value_pre'][i] = team_def_adjustment
+            out['qb_value_pre_def_adj'][i] = qb_expected_value_adj_def
+            out['player_VALUE_adj'][i] = def_adjusted_performance
+            out['qb_value_post'][i] = qb_value[q]
+            out['team_value_post'][i] = off_value[t]
+            out['opponent_def_value_post'][i] = def_value[o]
+            out['player_name'][i] = qb_state['player_name'][q]
+            out['current_value'][i] = qb_value[q]
+            out['current_variance'][i] = qb_variance[q]
+            out['rolling_value'][i] = qb_rolling[q]
+            out['season_team_adjs_alotted'][i] = qb_alotted[q]
+            out['season_team_adjs_received'][i] = qb_team_adjs[q]
+            out['season_player_adjs_received'][i] = qb_player_adjs[q]
+            out['starts'][i] = qb_starts[q]
+            out['season_starts'][i] = qb_season_starts[q]
+        ## close out the final week ##
+        if snapshots and len(touched_qbs) > 0:
+            self.snapshots.append(self.snapshot_delta(
+                week_key, touched_qbs, touched_teams, qb_state, team_state
+            ))
+        ## write state back to the store ##
+        for k, v in qb_state.items():
+            self.store.qb[k][:] = v
+        for k, v in team_state.items():
+            self.store.team[k][:] = v
+    
+    @staticmethod
+    def snapshot_delta(
+        key: Tuple[int, int],
+        qb_codes: set[int],
+        team_codes: set[int],
+        qb_state: dict[str, list],
+        team_state: dict[str, list]
+    ) -> dict:
+        ## capture the state of the QBs and teams that changed during a week ##
+        ## the key is the season and week whose games the delta covers ##
+        qb_codes = sorted(qb_codes)
+        team_codes = sorted(team_codes)
+        return {
+            'season' : key[0],
+            'week' : key[1],
+            'qb_codes' : numpy.array(qb_codes, dtype=numpy.int64),
+            'qb' : {
+                name: numpy.array([qb_state[name][c] for c in qb_codes], dtype=dtype)
+                for name, dtype, fill in QB_COLUMNS
+            },
+            'team_codes' : numpy.array(team_codes, dtype=numpy.int64),
+            'team' : {
+                name: numpy.array([team_state[name][c] for c in team_codes], dtype=dtype)
+                for name, dtype, fill in TEAM_COLUMNS
+            }
+        }
+    
+    #################
+    ## CHECKPOINTS ##
+    #################
+    ## bump when the checkpoint contents or model math change so old checkpoints are ignored ##
+    checkpoint_version: int = 3
+    ## game columns the model reads, which are hashed to key a checkpoint ##
+    checkpoint_columns: list[str] = [
+        'game_id', 'season', 'week', 'gameday', 'team', 'opponent', 'player_id',
+        'player_display_name', 'draft_number', 'temp', 'wind', 'player_VALUE', 'team_VALUE'
+    ]
+    
+    def config_hash(self) -> str:
+        ## hash of the config values ##
+        return hashlib.sha256(
+            json.dumps(self.config.values, sort_keys=True, default=str).encode()
+        ).hexdigest()
+    
+    def games_hash(self, n_games: int) -> str:
+        ## hash of the first n sorted games, using only the columns the model reads ##
+        row_hashes = pd.util.hash_pandas_object(
+            self.games[self.checkpoint_columns].iloc[:n_games],
+            index=False
+        ).to_numpy()
+        return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+    
+    def save_checkpoint(self, file_path: str) -> None:
+        '''
+        Saves the end state of the last run so a later run over the same games plus
+        new ones can resume without replaying history. The checkpoint holds QB and
+        team state, season and team averages, the last processed game, and the
+        per-game outputs, keyed by a hash of the config and the games processed.
+        '''
+        if self.output is None:
+            raise ValueError('Checkpoints can only be saved after the model has been run.')
+        n_games = len(self.games)
+        checkpoint = {
+            'version' : self.checkpoint_version,
+            'config_hash' : self.run_config_hash,
+            'games_hash' : self.games_hash(n_games),
+            'n_games' : n_games,
+            'last_game_id' : self.games['game_id'].iloc[-1] if n_games > 0 else None,
+            'qb_ids' : list(self.store.qb_ids),
+            'team_ids' : list(self.store.team_ids),
+            'qb' : {k: v[:len(self.store.qb_ids)] for k, v in self.store.qb.items()},
+            'team' : {k: v[:len(self.store.team_ids)] for k, v in self.store.team.items()},
+            'first_season' : self.first_season,
+            'season_avgs' : self.season_avgs,
+            'team_avgs' : self.team_avgs,
+            'team_avgs_known' : self.team_avgs_known,
+            'game_outputs' : self.output.columns,
+            'snapshots' : self.snapshots if len(self.snapshots) > 0 else None
+        }
+        with open(file_path, 'wb') as fp:
+            pickle.dump(checkpoint, fp, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def load_checkpoint(self, file_path: str, snapshots: bool = False) -> Tuple[int, Optional[dict[str, numpy.ndarray]]]:
+        '''
+        Restores state from a checkpoint if it was written with the same config over the
+        same leading games as the current games df. When snapshots are requested, the
+        checkpoint must also hold the snapshots for the games it covered.
+
+        Returns:
+        * tuple - the number of games already processed and their outputs, or (0, None) when
+            the checkpoint can't be used and all games need to be replayed
+        '''
+        try:
+            with open(file_path, 'rb') as fp:
+                checkpoint = pickle.load(fp)
+        except FileNotFoundError:
+            print('     No checkpoint found. Replaying all games...')
+            return 0, None
+        ## check the checkpoint covers the leading games of the current df ##
+        n_games = checkpoint['n_games']
+        if (
+            checkpoint['version'] != self.checkpoint_version or
+            checkpoint['config_hash'] != self.run_config_hash or
+            n_games > len(self.games) or
+            (n_games > 0 and self.games['game_id'].iloc[n_games - 1] != checkpoint['last_game_id']) or
+            checkpoint['games_hash'] != self.games_hash(n_games) or
+            (snapshots and n_games > 0 and checkpoint['snapshots'] is None)
+        ):
+            print('     Checkpoint does not match config or games. Replaying all games...')
+            return 0, None
+        ## restore state, mapping checkpoint codes onto the current store ##
+        ## averages are not restored since they are recomputed from the current games, ##
+        ## which include any new games in the latest season ##
+        qb_codes = [self.store.intern_qb(k) for k in checkpoint['qb_ids']]
+        team_codes = [self.store.intern_team(k) for k in checkpoint['team_ids']]
+        for k, v in checkpoint['qb'].items():
+            self.store.qb[k][qb_codes] = v
+        for k, v in checkpoint['team'].items():
+            self.store.team[k][team_codes] = v
+        if snapshots and n_games > 0:
+            self.snapshots = self.remap_snapshots(checkpoint['snapshots'], qb_codes, team_codes)
+        print('     Resuming from checkpoint after {0} games...'.format(n_games))
+        return n_games, checkpoint['game_outputs']
+    
+    @staticmethod
+    def remap_snapshots(snapshots: list[dict], qb_codes: list[int], team_codes: list[int]) -> list[dict]:
+        ## translate snapshot codes from a checkpoint's store to the current store ##
+        qb_codes = numpy.array(qb_codes, dtype=numpy.int64)
+        team_codes = numpy.array(team_codes, dtype=numpy.int64)
+        for snapshot in snapshots:
+            snapshot['qb_codes'] = qb_codes[snapshot['qb_codes']]
+            snapshot['team_codes'] = team_codes[snapshot['team_codes']]
+        return snapshots
+    
+    ###############
+    ## SNAPSHOTS ##
+    ###############
+    def state_as_of(self, season: int, week: int) -> StateStore:
+        '''
+        Rebuilds the QB and team state as it was before any games of the given season
+        and week were played, by applying the weekly deltas recorded during run_model.
+        This does not replay games, and does not apply offseason regressions or backup
+        adjustments, which are applied when a QB or team next plays (see get_objects).
+
+        Parameters:
+        * season: int - the season
+        * week: int - the week of the season
+
+        Returns:
+        * StateStore - a new store with the same codes as the model's store
+        '''
+        if len(self.snapshots) == 0:
+            raise ValueError('No snapshots have been recorded. Use run_model(snapshots=True).')
+        store = StateStore(
+            qb_ids=list(self.store.qb_ids),
+            team_ids=list(self.store.team_ids)
+        )
+        ## apply the delta of every week before the requested week ##
+        keys = [(s['season'], s['week']) for s in self.snapshots]
+        for snapshot in self.snapshots[:bisect.bisect_left(keys, (season, week))]:
+            for k, v in snapshot['qb'].items():
+                store.qb[k][snapshot['qb_codes']] = v
+            for k, v in snapshot['team'].items():
+                store.team[k][snapshot['team_codes']] = v
+        return store
+    
+    def restore_state(self, season: int, week: int) -> None:
+        '''
+        Sets the model's state to what it was before the given season and week, so
+        get_objects can be used to project that week's games, including under different
+        starters. Running the model again will reset the state.
+        '''
+        self.store = self.state_as_of(season, week)
+    
+    def qb_states_as_of(self, season: int, week: int) -> pd.DataFrame:
+        '''
+        Returns the state of every QB who had started a game before the given season and
+        week, in the same format as QB.as_record
+        '''
+        store = self.state_as_of(season, week)
+        return pd.DataFrame([
+            QB(store, code, self.config).as_record()
+            for code in numpy.flatnonzero(store.qb['initialized'][:len(store.qb_ids)]).tolist()
+        ])
     
     ## scoring ##
-    def add_elo(self, df):
-        ## add elo values from 538 to df for comparison of accuracy ##
-        ## read in elo data ##
+    ## windows of the rolling average baselines ##
+    baseline_rolls: list[int] = [8, 16, 24, 32]
+    
+    def rolling_baselines(self) -> dict[int, numpy.ndarray]:
+        '''
+        Simple rolling average predictions of player_VALUE, which serve as a quasi control.
+        Each is the mean of a QB's previous starts within the window, or nan for a first
+        start. These only depend on the games, not the config, so they are computed once
+        and reused by every scoring call.
+
+        Returns:
+        * dict - baseline predictions in games order, keyed by window
+        '''
+        if self.baselines is not None:
+            return self.baselines
+        ## order games by QB, keeping chronological order within each QB ##
+        qb_codes = numpy.array(self.game_columns['qb_codes'], dtype=numpy.int64)
+        order = numpy.argsort(qb_codes, kind='stable')
+        sorted_codes = qb_codes[order]
+        sorted_values = self.games['player_VALUE'].to_numpy(dtype=numpy.float64)[order]
+        known = ~numpy.isnan(sorted_values)
+        filled = numpy.where(known, sorted_values, 0)
+        n = len(order)
+        ## add each QB's start from k games back, recording windows as they are reached ##
+        sums = numpy.zeros(n)
+        counts = numpy.zeros(n)
+        self.baselines = {}
+        for k in range(1, max(self.baseline_rolls) + 1):
+            if k < n:
+                same_qb = sorted_codes[k:] == sorted_codes[:-k]
+                sums[k:] += numpy.where(same_qb, filled[:-k], 0)
+                counts[k:] += same_qb & known[:-k]
+            if k in self.baseline_rolls:
+                baseline = numpy.empty(n)
+                with numpy.errstate(divide='ignore', invalid='ignore'):
+                    baseline[order] = numpy.where(counts > 0, sums / counts, numpy.nan)
+                self.baselines[k] = baseline
+        return self.baselines
+    
+    ###################
+    ## 538 REFERENCE ##
+    ###################
+    ## parsed reference files, keyed by file location, kept for the life of the process ##
+    elo_reference_cache: dict[str, dict] = {}
+    
+    @staticmethod
+    def read_elo_reference(file_loc: str) -> pd.DataFrame:
+        ## read the original elo file and flatten it to one row per team and game ##
         elo = pd.read_csv(
-            self.original_file_loc,
+            file_loc,
             index_col=0,
         )
         ## flatten elo df ##
@@ -286,50 +993,99 @@ class QBModel():
         ## convert elo to value ##
         elo['f38_projected_value'] = elo['f38_projected_value'] / 3.3
         elo['f38_team_adj'] = elo['f38_team_adj'] / 3.3
-        ## merge elo data ##
-        df = pd.merge(
-            df,
-            elo,
-            on=['gameday', 'team', 'opponent', 'player_display_name'],
-            how='left'
-        )
+        return elo.reset_index(drop=True)
+    
+    @classmethod
+    def load_elo_reference(cls, file_loc: str) -> pd.DataFrame:
+        '''
+        Returns the flattened 538 reference. The csv is parsed once per process, and the
+        parsed reference is kept in a binary cache next to the csv. The cache is rebuilt
+        when the csv's modified time has changed and its contents no longer match the hash
+        the cache was built from.
+        '''
+        mtime = pathlib.Path(file_loc).stat().st_mtime_ns
+        entry = cls.elo_reference_cache.get(file_loc)
+        if entry is not None and entry['mtime'] == mtime:
+            return entry['elo']
+        ## try the binary cache ##
+        cache_loc = str(pathlib.Path(file_loc).with_suffix('.cache.pkl'))
+        try:
+            with open(cache_loc, 'rb') as fp:
+                entry = pickle.load(fp)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            entry = None
+        ## rebuild the cache if the csv has changed ##
+        if entry is None or entry['mtime'] != mtime:
+            with open(file_loc, 'rb') as fp:
+                digest = hashlib.sha256(fp.read()).hexdigest()
+            if entry is None or entry['sha256'] != digest:
+                entry = {
+                    'sha256' : digest,
+                    'elo' : cls.read_elo_reference(file_loc)
+                }
+            entry['mtime'] = mtime
+            with open(cache_loc, 'wb') as fp:
+                pickle.dump(entry, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        cls.elo_reference_cache[file_loc] = entry
+        return entry['elo']
+    
+    def elo_reference_rows(self) -> numpy.ndarray:
+        ## row of the 538 reference matching each game, or -1 where there is no match ##
+        ## games don't change, so the string key join is only made once per model ##
+        if self.elo_rows is None:
+            elo = self.load_elo_reference(self.original_file_loc)
+            keys = ['gameday', 'team', 'opponent', 'player_display_name']
+            matched = pd.merge(
+                self.games[keys],
+                elo[keys].assign(elo_row=numpy.arange(len(elo))),
+                on=keys,
+                how='left'
+            )
+            self.elo_rows = matched['elo_row'].fillna(-1).to_numpy(dtype=numpy.int64)
+        return self.elo_rows
+    
+    def add_elo(self, df):
+        ## add elo values from 538 to df for comparison of accuracy ##
+        ## df must be indexed by game position, as self.data and its filters are ##
+        elo = self.load_elo_reference(self.original_file_loc)
+        rows = self.elo_reference_rows()[df.index.to_numpy()]
+        df = df.reset_index(drop=True)
+        for col in ['f38_projected_value', 'f38_team_adj']:
+            ## games without a match point at the trailing nan ##
+            values = numpy.append(elo[col].to_numpy(dtype=numpy.float64), numpy.nan)
+            df[col] = values[rows]
         ## return df ##
         return df
     
-    def score_model(self, first_season=2009, add_elo=True):
+    def score_model(self, first_season=2009, add_elo=True, exclude_seasons=None):
         ## function for scoring model for testing purposes ##
+        ## exclude_seasons leaves seasons out of the score, as when scoring a fold's training seasons ##
+        if self.aborted:
+            return self.score_aborted()
         ## create df from data ##
-        df = pd.DataFrame(self.data)
+        df = self.data.copy()
         ## get mean squared error ##
         df['se'] = (df['qb_value_pre_def_adj'] - df['player_VALUE']) ** 2 ## expectation for game including D, vs actual ##
         df['abs_error'] = numpy.absolute(df['qb_value_pre_def_adj'] - df['player_VALUE'])
         ## create rolling averages as a quasi control ##
-        for roll in [8, 16, 24, 32]:
-            df['se_r{0}'.format(roll)] = (
-                ## prediction based on a simple rolling average ##
-                df.groupby(['player_id'])['player_VALUE'].transform(
-                    lambda x: x.rolling(roll, min_periods=1).mean().shift()
-                ).fillna(df['qb_value_pre_def_adj']) -
-                ## actual value ##
-                df['player_VALUE']
-            ) ** 2
-            df['abs_error_r{0}'.format(roll)] = numpy.absolute(
-                ## prediction based on a simple rolling average ##
-                df.groupby(['player_id'])['player_VALUE'].transform(
-                    lambda x: x.rolling(roll, min_periods=1).mean().shift()
-                ).fillna(df['qb_value_pre_def_adj']) -
-                ## actual value ##
-                df['player_VALUE']
-            )
+        for roll, baseline in self.rolling_baselines().items():
+            ## prediction based on a simple rolling average, or the model without history ##
+            roll_pred = numpy.where(numpy.isnan(baseline), df['qb_value_pre_def_adj'], baseline)
+            df['se_r{0}'.format(roll)] = (roll_pred - df['player_VALUE']) ** 2
+            df['abs_error_r{0}'.format(roll)] = numpy.absolute(roll_pred - df['player_VALUE'])
         ## only look at data past first season ##
         ## this is to give model time to catch up since we are starting in 1999 ##
         ## and veteran QBs are treated like rookies in that season ##
         df = df[df['season'] >= first_season].copy()
+        if exclude_seasons is not None:
+            df = df[~df['season'].isin(exclude_seasons)].copy()
         ## copy config to serve as a record of what was used ##
         record = self.config.values.copy()
         ## add rmse and mae to record ##
         record['rmse'] = df['se'].mean() ** 0.5
         record['mae'] = df['abs_error'].mean()
+        ## mean of the in-sample season maes, which weights each season equally ##
+        record['season_mae'] = df.groupby('season')['abs_error'].mean().mean()
         ## add specials ##
         record['mae_first_16'] = numpy.nanmean(numpy.where(
             df['start_number'] <= 16,
@@ -342,7 +1098,7 @@ class QBModel():
             numpy.nan
         ))
         ## add rolling averages to record ##
-        for roll in [8, 16, 24, 32]:
+        for roll in self.baseline_rolls:
             record['rmse_r{0}'.format(roll)] = df['se_r{0}'.format(roll)].mean() ** 0.5
             record['mae_r{0}'.format(roll)] = df['abs_error_r{0}'.format(roll)].mean()
         if add_elo:
@@ -355,18 +1111,58 @@ class QBModel():
             ## add rookie model comp ##
             r = f[f['start_number'] <= 10].copy()
             record['delta_vs_538_rookies'] = (r['f38_se'].mean() ** 0.5) - (r['se'].mean() ** 0.5)
+        if self.max_mae is not None:
+            record['aborted'] = False
         record['model_runtime'] = self.model_runtime
         ## return record ##
         return record
     
+    def score_aborted(self) -> dict:
+        ## record for a bounded run that stopped early, which only has a lower bound on the mae ##
+        record = self.config.values.copy()
+        for k in ['rmse', 'mae', 'season_mae', 'mae_first_16', 'mae_backup']:
+            record[k] = numpy.nan
+        for roll in self.baseline_rolls:
+            record['rmse_r{0}'.format(roll)] = numpy.nan
+            record['mae_r{0}'.format(roll)] = numpy.nan
+        record['mae'] = self.abort_mae
+        record['aborted'] = True
+        record['model_runtime'] = self.model_runtime
+        return record
+    
+    def score_folds(self, first_season=2009) -> pd.DataFrame:
+        '''
+        Error of each leave-one-season-out fold, from the single run. Predictions are made
+        before each game from earlier games only, so a season's error is out of sample for
+        its games, and only the config is shared across folds
+
+        Parameters:
+        * first_season: int - the first season scored
+
+        Returns:
+        * pd.DataFrame - games, mae, and rmse of each season
+        '''
+        df = self.data[self.data['season'] >= first_season]
+        error = df['qb_value_pre_def_adj'] - df['player_VALUE']
+        folds = pd.DataFrame({
+            'season' : df['season'],
+            'abs_error' : error.abs(),
+            'se' : error ** 2
+        }).groupby('season').agg(
+            games=('abs_error', 'count'),
+            mae=('abs_error', 'mean'),
+            mse=('se', 'mean')
+        ).reset_index()
+        folds['rmse'] = folds['mse'] ** 0.5
+        return folds.drop(columns=['mse'])
+    
     def score_adj(self, first_season=2009):
         ## Function for scoring the team adjustment ##
         ## While the model should try to predict VALUE as best as it can ##
         ## The team adj should try to get as close to the 538 team adj as this ##
         ## ghe main nfelo model has already been optimized for this value ##
         ## create df from data ##
-        df = pd.DataFrame(self.data)
-        df = df[df['season'] >= first_season].copy()
+        df = self.data[self.data['season'] >= first_season].copy()
         ## add elo ##
         df = self.add_elo(df)
         ## add comparison to 538 ##
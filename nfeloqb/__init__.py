@@ -1,3 +1,3 @@
 from .nfeloqb import run
-from .feature_optimization import optimize_config_subsets, optimize_config, optimize_config_subsets_with_rand, optimize_config_with_rand
+from .feature_optimization import optimize_config_subsets, optimize_config, optimize_config_subsets_with_rand, optimize_config_with_rand, optimize_config_with_population
 from .Resources import DataLoader
\ No newline at end of file
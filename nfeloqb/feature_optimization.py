@@ -1,80 +1,39 @@
 ## functions for feature optimization ##
 ## import modules ##
 import pathlib
-import pandas as pd
 import datetime
 ## import resources ##
 from .Resources import *
-from .DataModels import ModelConfig
-from .Optimizer import ConfigOptimizer
+from .DataModels import ModelConfig, OptimizationPlan
+from .Optimizer import ConfigOptimizer, Campaign, run_plan
 
-def optimize_config_subsets(save_result:bool=True, update_config:bool=False):
+def optimize_config_subsets(save_result:bool=True, update_config:bool=False, workers:int=None):
     '''
     Optimizes the config as defined in the model_config.json file, using subesets
-    for better optimization results
+    for better optimization results. Subsets are defined by the subsets plan of the
+    optimization_plan.json file, which optimizes them one after another, each starting
+    from the values found by the subsets before it.
+
+    Parameters
+    * save_result : bool - Whether to save the result to a csv file.
+    * update_config : bool - Whether to update the model_config.json file with the optimized values.
+    * workers : int - The number of processes to evaluate with. Defaults to the cpu count.
     '''
     ## load config ##
     package_folder = pathlib.Path(__file__).parent.parent.resolve()
     config = ModelConfig.from_file('{0}/model_config.json'.format(package_folder))
+    plan = OptimizationPlan.from_file('{0}/optimization_plan.json'.format(package_folder), 'subsets')
     ## get the games data ##
     data = DataLoader() 
-    ## define subsets ##
-    subsets = [
-        {
-            'subset_name' : 'weekly_player_adjustments',
-            'subset' : [
-                'player_sf',
-                'player_career_sf_base',
-                'player_career_sf_height',
-                'player_career_sf_mp',
-                'player_prog_disc_alpha'
-            ]
-        },
-        {
-            'subset_name' : 'rookie_values',
-            'subset' : [
-                'rookie_draft_intercept',
-                'rookie_draft_slope',
-                'rookie_league_reg',
-                'rookie_league_cap'
-            ]
-        },
-        {
-            'subset_name' : 'offseason_player_regression',
-            'subset' : [
-                'player_regression_league_mp',
-                'player_regression_league_height',
-                'player_regression_career_mp',
-                'player_regression_career_height',
-            ]
-        },
-        {
-            'subset_name' : 'player_adjustment_core',
-            'subset' : [
-                'player_sf',
-                'player_career_sf_base',
-                'player_career_sf_height',
-                'player_career_sf_mp',
-                'player_regression_league_mp',
-                'player_regression_league_height',
-                'player_regression_career_mp',
-                'player_regression_career_height',
-                'player_team_adj_allotment_disc',
-                'player_prog_disc_alpha',
-                'team_def_sf',
-                'team_def_reversion',
-            ]
-        }
-    ]
     ## optimize each subset ##
-    for subset in subsets:
-        optimizer = ConfigOptimizer(
-            data=data.model_df,
-            config=config,
-            subset=subset['subset'],
-            subset_name=subset['subset_name']
-        )
-        optimizer.optimize(save_result, update_config)
+    run_plan(
+        plan=plan,
+        data=data.model_df,
+        config=config,
+        workers=workers,
+        save_result=save_result,
+        update_config=update_config
+    )
 
 
 def optimize_config(save_result:bool=True, update_config:bool=False):
@@ -93,170 +52,105 @@ def optimize_config(save_result:bool=True, update_config:bool=False):
     optimizer = ConfigOptimizer(data.model_df, config)
     optimizer.optimize(save_result, update_config)
 
-def optimize_config_subsets_with_rand(rounds:int=25):
+def optimize_config_subsets_with_rand(rounds:int=None, workers:int=None, seed:int=None, campaign:str=None):
     '''
     Optimizes the config as defined in the model_config.json file, using subesets
     for better optimization results AND using rounds of randomized best guesses to 
     explore global optimization and validate whether the optimizer is getting
-    stuck due to local minima.
+    stuck due to local minima. Subsets are defined by the subsets_with_rand plan of
+    the optimization_plan.json file.
+
+    Parameters
+    * rounds : int - The number of randomized starts per subset. Defaults to the plan's rounds.
+    * workers : int - The number of processes to run starts in. Defaults to the cpu count.
+    * seed : int - Seed for the randomized starts, which makes the run reproducible.
+    * campaign : str - Id of a campaign to run in. Rerunning with the same id resumes the
+      campaign, skipping completed starts and continuing in-progress ones.
     '''
     ## load config ##
     package_folder = pathlib.Path(__file__).parent.parent.resolve()
     config = ModelConfig.from_file('{0}/model_config.json'.format(package_folder))
+    plan = OptimizationPlan.from_file('{0}/optimization_plan.json'.format(package_folder), 'subsets_with_rand')
     ## get the games data ##
     data = DataLoader() 
-    ## define subsets ##
-    subsets = [
-        {
-            'subset_name' : 'weekly_player_adjustments',
-            'subset' : [
-                'player_sf',
-                'player_career_sf_base',
-                'player_career_sf_height',
-                'player_career_sf_mp',
-                'player_prog_disc_alpha'
-            ]
-        },
-        {
-            'subset_name' : 'rookie_values',
-            'subset' : [
-                'rookie_draft_intercept',
-                'rookie_draft_slope',
-                'rookie_league_reg',
-                'rookie_league_cap'
-            ]
-        },
-        {
-            'subset_name' : 'offseason_player_regression',
-            'subset' : [
-                'player_regression_league_mp',
-                'player_regression_league_height',
-                'player_regression_career_mp',
-                'player_regression_career_height'
-            ]
-        },
-        {
-            'subset_name' : 'player_adjustment_core',
-            'subset' : [
-                'player_sf',
-                'player_career_sf_base',
-                'player_career_sf_height',
-                'player_career_sf_mp',
-                'player_regression_league_mp',
-                'player_regression_league_height',
-                'player_regression_career_mp',
-                'player_regression_career_height',
-                'player_prog_disc_alpha',
-                'player_team_adj_allotment_disc',
-                'team_def_sf',
-                'team_def_reversion',
-            ]
-        }
-    ]
-    ## optimize each subset ##
-    for subset in subsets:
-        print('Optimizing subset: {0}'.format(subset['subset_name']))
-        best_recs = []
-        for i in range(rounds):
-            print('Round {0} of {1}'.format(i+1, rounds))
-            optimizer = ConfigOptimizer(
-                data=data.model_df,
-                config=config,
-                subset=subset['subset'],
-                subset_name=subset['subset_name'],
-                randomize_bgs=True
-            )
-            optimizer.optimize(False, False)
-            best_recs.append(optimizer.get_best_record())
-            ## save the best records ##
-            df = pd.DataFrame(best_recs)
-            df.to_csv('{0}/Optimizer/Results/{1}{2}.csv'.format( 
-                pathlib.Path(__file__).parent.resolve(),
-                datetime.datetime.now().strftime('%Y%m%d'),
-                '_{0}_randomized_bgs'.format(subset['subset_name'])
-            ))
+    ## optimize each subset, running randomized starts and saving the best records as they complete ##
+    run_plan(
+        plan=plan,
+        data=data.model_df,
+        config=config,
+        workers=workers,
+        seed=seed,
+        rounds=rounds,
+        campaign=Campaign(campaign, seed) if campaign is not None else None
+    )
 
 
-def optimize_config_with_rand(rounds:int=100, subset_names:list[str]=[]):
+def optimize_config_with_rand(rounds:int=None, subset_names:list[str]=[], workers:int=None, seed:int=None, campaign:str=None):
     '''
     Optimizes the config as defined in the model_config.json file, using rounds of
     randomized best guesses to explore global optimization and validate whether
-    the optimizer is getting stuck due to local minima.
+    the optimizer is getting stuck due to local minima. Subsets, and the objective
+    each minimizes, are defined by the with_rand plan of the optimization_plan.json file.
+
+    Parameters
+    * rounds : int - The number of randomized starts per subset. Defaults to the plan's rounds.
+    * subset_names : list[str] - Subsets to optimize. All subsets are optimized if empty.
+    * workers : int - The number of processes to run starts in. Defaults to the cpu count.
+    * seed : int - Seed for the randomized starts, which makes the run reproducible.
+    * campaign : str - Id of a campaign to run in. Rerunning with the same id resumes the
+      campaign, skipping completed starts and continuing in-progress ones.
     '''
     ## load config ##
     package_folder = pathlib.Path(__file__).parent.parent.resolve()
     config = ModelConfig.from_file('{0}/model_config.json'.format(package_folder))
+    plan = OptimizationPlan.from_file('{0}/optimization_plan.json'.format(package_folder), 'with_rand')
+    if len(subset_names) > 0:
+        plan = plan.select(subset_names)
     ## get the games data ##
     data = DataLoader() 
-    ## define subsets ##
-    subsets = [
-        {
-            'subset_name' : 'player_adjustment',
-            'subset' : [
-                'player_sf',
-                'player_career_sf_base',
-                'player_career_sf_height',
-                'player_career_sf_mp',
-                'player_regression_league_mp',
-                'player_regression_league_height',
-                'player_regression_career_mp',
-                'player_regression_career_height',
-                'player_prog_disc_alpha',
-                'team_def_sf',
-                'team_def_reversion',
-            ],
-            'objective' : 'mae'
-        },
-        {
-            'subset_name' : 'weather',
-            'subset' : [
-                'wind_disc_height',
-                'wind_disc_mp',
-                'temp_disc_height',
-                'temp_disc_mp'
-            ],
-            'objective' : 'mae'
-        },
-        {
-            'subset_name' : 'backup_values',
-            'subset' : [
-                'player_team_adj_allotment_disc',
-            ],
-            'objective' : 'mae_backup'
-        },
-        {
-            'subset_name' : 'rookie_values',
-            'subset' : [
-                'rookie_draft_intercept',
-                'rookie_draft_slope',
-                'rookie_league_reg',
-                'rookie_league_cap'
-            ],
-            'objective' : 'mae_first_16'
-        }
-    ]
-    ## optimize each subset ##
-    for subset in subsets:
-        if subset['subset_name'] not in subset_names and len(subset_names) > 0:
-            continue
-        print('Optimizing subset: {0}'.format(subset['subset_name']))
-        best_recs = []
-        for i in range(rounds):
-            print('Round {0} of {1}'.format(i+1, rounds))
-            optimizer = ConfigOptimizer(
-                data=data.model_df,
-                config=config,
-                subset=subset['subset'],
-                subset_name=subset['subset_name'],
-                objective_name=subset['objective'] if 'objective' in subset else 'mae',
-                randomize_bgs=True
-            )
-            optimizer.optimize(False, False)
-            best_recs.append(optimizer.get_best_record())
-            ## save the best records ##
-            df = pd.DataFrame(best_recs)
-            df.to_csv('{0}/Optimizer/Results/{1}{2}.csv'.format( 
-                pathlib.Path(__file__).parent.resolve(),
-                datetime.datetime.now().strftime('%Y%m%d'),
-                '_{0}_randomized_bgs'.format(subset['subset_name'])
-            ))
\ No newline at end of file
+    ## optimize each subset, running randomized starts and saving the best records as they complete ##
+    run_plan(
+        plan=plan,
+        data=data.model_df,
+        config=config,
+        workers=workers,
+        seed=seed,
+        rounds=rounds,
+        campaign=Campaign(campaign, seed) if campaign is not None else None
+    )
+
+def optimize_config_with_population(budget:int=2000, popsize:int=None, workers:int=None, seed:int=None, save_result:bool=True, update_config:bool=False):
+    '''
+    Optimizes the config as defined in the model_config.json file with a population
+    based CMA-ES search, which explores the full param space in a single run rather than
+    through rounds of randomized starts. Each generation is evaluated in parallel, and
+    saved to a checkpoint that a rerun with the same seed on the same day continues from.
+
+    Parameters
+    * budget : int - The number of model evaluations to run.
+    * popsize : int - The number of configs per generation. Defaults to 4 + 3ln(n params).
+    * workers : int - The number of processes to evaluate generations in. Defaults to the cpu count.
+    * seed : int - Seed for the search, which makes the run reproducible.
+    * save_result : bool - Whether to save the result to a csv file.
+    * update_config : bool - Whether to update the model_config.json file with the optimized values.
+    '''
+    ## load config ##
+    package_folder = pathlib.Path(__file__).parent.parent.resolve()
+    config = ModelConfig.from_file('{0}/model_config.json'.format(package_folder))
+    ## get the games data ##
+    data = DataLoader() 
+    optimizer = ConfigOptimizer(
+        data.model_df,
+        config,
+        backend='cmaes',
+        budget=budget,
+        popsize=popsize,
+        workers=workers,
+        seed=seed,
+        checkpoint='{0}/Optimizer/In-flight Results/{1}_population_{2}.ckpt'.format(
+            pathlib.Path(__file__).parent.resolve(),
+            datetime.datetime.now().strftime('%Y%m%d'),
+            seed
+        )
+    )
+    optimizer.optimize(save_result, update_config)
@@ -62,7 +62,16 @@ def run(perform_starter_update=False, model_only=False, force_run=False):
     ## run model ##
     print('Running QB model...')
     model = QBModel(data.model_df, config)
-    model.run_model()
+    ## resume from the last run's checkpoint so only new games are processed ##
+    ## the checkpoint is kept out of the tracked tree, and is cached between workflow runs ##
+    checkpoint_loc = os.environ.get(
+        'QB_MODEL_CHECKPOINT',
+        '{0}/.cache/qb_model_checkpoint.pkl'.format(package_folder)
+    )
+    os.makedirs(os.path.dirname(checkpoint_loc), exist_ok=True)
+    model.run_model(resume_from=checkpoint_loc)
+    ## save before the elo constructor, which touches model state for next week's games ##
+    model.save_checkpoint(checkpoint_loc)
     if model_only:
         return model
     ## update starters ##
@@ -79,7 +88,7 @@ def run(perform_starter_update=False, model_only=False, force_run=False):
     print('Running Elo model...')
     elo = Elo(
         data.games,
-        pd.DataFrame(model.data)
+        model.data
     )
     elo.run()
     ## construct elo file ##
@@ -92,7 +101,7 @@ def run(perform_starter_update=False, model_only=False, force_run=False):
     )
     constructor.construct_elo_file()
     ## save flattened qb and team data ##
-    pd.DataFrame(model.data_team).sort_values(
+    model.data_team.sort_values(
         by=['team', 'season', 'week'],
         ascending=[True, True, True]
     ).reset_index(drop=True).to_csv(
@@ -100,7 +109,7 @@ def run(perform_starter_update=False, model_only=False, force_run=False):
         index=False
     )
     ## save flattened qb records ##
-    pd.DataFrame(model.qb_records).to_csv(
+    model.qb_records.to_csv(
         '{0}/Other Data/weekly_qb_states.csv'.format(package_folder),
         index=False
     )
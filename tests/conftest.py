@@ -0,0 +1,73 @@
+## shared helpers for the tests, which run offline on synthetic games ##
+import pathlib
+
+import pandas as pd
+import numpy
+
+from nfeloqb.DataModels import ModelConfig
+
+def synthetic_games(seed: int = 7, last_season: int = 2010) -> pd.DataFrame:
+    '''
+    A small games df with the columns DataLoader provides, covering scored seasons,
+    rookies, veterans, backups, and missing weather and draft numbers. Seasons run from
+    2006 through the last season.
+    '''
+    rng = numpy.random.default_rng(seed)
+    teams = ['ARI', 'BUF', 'CHI', 'DAL', 'KC', 'NE']
+    ## each team has a starter, and a backup who starts some games ##
+    qbs = {
+        team: [
+            {
+                'player_id': '00-{0}{1}'.format(team, i),
+                'player_name': '{0} QB{1}'.format(team, i),
+                'draft_number': numpy.nan if rng.random() < 0.2 else float(rng.integers(1, 260))
+            }
+            for i in range(2)
+        ]
+        for team in teams
+    }
+    rows = []
+    for season in range(2006, last_season + 1):
+        ## a rookie takes over one team each season ##
+        rookie_team = teams[season % len(teams)]
+        qbs[rookie_team][0] = {
+            'player_id': '00-{0}R{1}'.format(rookie_team, season),
+            'player_name': '{0} Rookie {1}'.format(rookie_team, season),
+            'draft_number': float(rng.integers(1, 64))
+        }
+        for week in range(1, 9):
+            order = rng.permutation(teams)
+            for away, home in zip(order[::2], order[1::2]):
+                game_id = '{0}_{1:02d}_{2}_{3}'.format(season, week, away, home)
+                wind = numpy.nan if rng.random() < 0.3 else float(rng.integers(0, 30))
+                temp = numpy.nan if rng.random() < 0.3 else float(rng.integers(-5, 95))
+                for team, opponent in [(away, home), (home, away)]:
+                    qb = qbs[team][1 if rng.random() < 0.15 else 0]
+                    player_value = rng.normal(0, 80)
+                    rows.append({
+                        'game_id': game_id,
+                        'season': season,
+                        'week': week,
+                        'gameday': '{0}-09-{1:02d}'.format(season, week),
+                        'team': team,
+                        'opponent': opponent,
+                        'player_id': qb['player_id'],
+                        'player_name': qb['player_name'],
+                        'player_display_name': qb['player_name'],
+                        'draft_number': qb['draft_number'],
+                        'player_VALUE': player_value,
+                        'team_VALUE': player_value + rng.normal(0, 20),
+                        'wind': wind,
+                        'temp': temp
+                    })
+    df = pd.DataFrame(rows)
+    df['rookie_year'] = df.groupby('player_id')['season'].transform('min')
+    df['entry_year'] = df['rookie_year']
+    df['start_number'] = df.groupby('player_id').cumcount() + 1
+    ## engines sort the games themselves ##
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+def load_config() -> ModelConfig:
+    return ModelConfig.from_file(
+        '{0}/model_config.json'.format(pathlib.Path(__file__).parent.parent.resolve())
+    )
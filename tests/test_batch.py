@@ -0,0 +1,41 @@
+## checks that the batch engine scores each config the same as a single config run ##
+import numpy
+
+from nfeloqb.Resources import QBModel, BatchQBModel
+from conftest import synthetic_games, load_config
+
+def perturbed_configs(n: int, seed: int = 3) -> list:
+    '''
+    The repo config, followed by n-1 configs with every optimized param drawn within its
+    bounds.
+    '''
+    rng = numpy.random.default_rng(seed)
+    configs = []
+    for i in range(n):
+        config = load_config()
+        if i > 0:
+            for k, param in config.params.items():
+                if k in ['init_value', 'rookie_undrafted_draft_number']:
+                    continue
+                config.values[k] = rng.uniform(param.opti_min, param.opti_max)
+        configs.append(config)
+    return configs
+
+def test_batch_records_match_single_config_records():
+    configs = perturbed_configs(5)
+    ## the batch engine writes normalized reversions back to its configs, so copy values first ##
+    values = [dict(config.values) for config in configs]
+    batch = BatchQBModel(synthetic_games(), configs)
+    batch.run_model()
+    batch_records = batch.score_model()
+    assert len(batch_records) == len(configs)
+    for config_values, batch_record in zip(values, batch_records):
+        config = load_config()
+        config.values.update(config_values)
+        model = QBModel(synthetic_games(), config)
+        model.run_model()
+        record = model.score_model(add_elo=False)
+        for k in record:
+            if k == 'model_runtime':
+                continue
+            numpy.testing.assert_allclose(batch_record[k], record[k], rtol=0, atol=1e-12, err_msg=k)
@@ -0,0 +1,59 @@
+## checks that the optimizer serves repeated configs from the evaluation cache, and that ##
+## the cache is keyed to the games and excluded seasons ##
+import sqlite3
+
+import pytest
+
+from nfeloqb.Optimizer import ConfigOptimizer
+from conftest import synthetic_games, load_config
+
+def optimizer(cache: str, games=None, **kwargs) -> ConfigOptimizer:
+    return ConfigOptimizer(
+        synthetic_games() if games is None else games,
+        load_config(),
+        save_in_flight=False,
+        cache=cache,
+        **kwargs
+    )
+
+def test_repeated_config_is_served_from_cache(tmp_path):
+    cache = str(tmp_path / 'evaluations.db')
+    first = optimizer(cache)
+    obj = first.objective(first.bgs)
+    assert (first.cache.hits, first.cache.misses) == (0, 1)
+    assert first.objective(first.bgs) == obj
+    assert (first.cache.hits, first.cache.misses) == (1, 1)
+    first.cache.close()
+    ## a later optimizer on the same games reads the same records ##
+    second = optimizer(cache)
+    assert second.objective(second.bgs) == obj
+    assert second.cache.hits == 1
+    second.cache.close()
+
+def test_cache_is_keyed_by_dataset_and_excluded_seasons(tmp_path):
+    cache = str(tmp_path / 'evaluations.db')
+    base = optimizer(cache)
+    base.objective(base.bgs)
+    base.cache.close()
+    changed = synthetic_games()
+    changed.loc[changed.index[0], 'player_VALUE'] = changed.loc[changed.index[0], 'player_VALUE'] + 1
+    for other in [
+        optimizer(cache, exclude_seasons=[2009]),
+        optimizer(cache, games=changed)
+    ]:
+        assert other.cache.dataset != base.cache.dataset
+        other.objective(other.bgs)
+        assert (other.cache.hits, other.cache.misses) == (0, 1)
+        other.cache.close()
+
+def test_optimize_closes_cache(tmp_path):
+    search = optimizer(
+        str(tmp_path / 'evaluations.db'),
+        subset=['player_sf', 'team_off_sf'],
+        backend='cmaes',
+        budget=4,
+        seed=1
+    )
+    search.optimize(False, False)
+    with pytest.raises(sqlite3.ProgrammingError):
+        search.cache.conn.execute('SELECT 1')
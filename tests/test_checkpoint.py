@@ -0,0 +1,82 @@
+## checks that checkpoints resume to the same output as a full run, and that snapshots ##
+## rebuild the state a run truncated at that week ends with ##
+import pandas as pd
+import pandas.testing as pdt
+
+from nfeloqb.Resources import QBModel
+from nfeloqb.DataModels import StateStore
+from conftest import synthetic_games, load_config
+
+## the games after this season and week are left out of the first run ##
+CUTOFF = (2009, 5)
+
+def before(games: pd.DataFrame, season: int, week: int) -> pd.DataFrame:
+    return games[
+        (games['season'] < season) |
+        ((games['season'] == season) & (games['week'] < week))
+    ].copy()
+
+def run(games: pd.DataFrame, config=None, **kwargs) -> QBModel:
+    model = QBModel(games, config if config is not None else load_config())
+    model.run_model(**kwargs)
+    return model
+
+def save_prefix_checkpoint(file_path: str, games: pd.DataFrame, config=None) -> None:
+    run(before(games, *CUTOFF), config).save_checkpoint(file_path)
+
+def store_frames(store: StateStore) -> tuple[pd.DataFrame, pd.DataFrame]:
+    '''
+    The store's initialized QBs and teams as frames indexed by id, so stores with
+    different codes can be compared.
+    '''
+    qbs = pd.DataFrame(
+        {k: v[:len(store.qb_ids)] for k, v in store.qb.items()},
+        index=store.qb_ids
+    )
+    teams = pd.DataFrame(
+        {k: v[:len(store.team_ids)] for k, v in store.team.items()},
+        index=store.team_ids
+    )
+    return qbs[qbs['initialized']], teams[teams['initialized']]
+
+def test_resume_matches_full_run(tmp_path):
+    games = synthetic_games()
+    file_path = str(tmp_path / 'checkpoint.p')
+    save_prefix_checkpoint(file_path, games)
+    full = run(games)
+    resumed = run(games, resume_from=file_path)
+    assert resumed.resumed_from == len(before(games, *CUTOFF))
+    for table in ['data', 'data_team', 'qb_records']:
+        pdt.assert_frame_equal(
+            pd.DataFrame(getattr(resumed, table)),
+            pd.DataFrame(getattr(full, table)),
+            obj=table
+        )
+
+def test_config_change_invalidates_checkpoint(tmp_path):
+    games = synthetic_games()
+    file_path = str(tmp_path / 'checkpoint.p')
+    save_prefix_checkpoint(file_path, games)
+    config = load_config()
+    config.values['player_sf'] = config.values['player_sf'] * 1.1
+    assert run(games, config, resume_from=file_path).resumed_from == 0
+
+def test_games_change_invalidates_checkpoint(tmp_path):
+    games = synthetic_games()
+    file_path = str(tmp_path / 'checkpoint.p')
+    save_prefix_checkpoint(file_path, games)
+    ## restate a game the checkpoint covered ##
+    changed = games.copy()
+    row = changed.index[changed['season'] == 2007][0]
+    changed.loc[row, 'player_VALUE'] = changed.loc[row, 'player_VALUE'] + 1
+    assert run(changed, resume_from=file_path).resumed_from == 0
+
+def test_state_as_of_matches_truncated_run():
+    games = synthetic_games()
+    full = run(games, snapshots=True)
+    for season, week in [(2007, 1), CUTOFF, (2010, 8)]:
+        truncated = run(before(games, season, week))
+        qbs, teams = store_frames(full.state_as_of(season, week))
+        truncated_qbs, truncated_teams = store_frames(truncated.store)
+        pdt.assert_frame_equal(qbs, truncated_qbs, obj='qbs as of {0}'.format((season, week)))
+        pdt.assert_frame_equal(teams, truncated_teams, obj='teams as of {0}'.format((season, week)))
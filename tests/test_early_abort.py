@@ -0,0 +1,61 @@
+## checks that bounded runs stop exactly when their error proves the bound is exceeded, ##
+## and that early abort is only allowed where the optimizer can use a bound ##
+import numpy
+import pytest
+
+from nfeloqb.Resources import QBModel
+from nfeloqb.Optimizer import ConfigOptimizer
+from conftest import synthetic_games, load_config
+
+def run(max_mae=None) -> QBModel:
+    model = QBModel(synthetic_games(), load_config())
+    model.run_model(max_mae=max_mae)
+    return model
+
+def test_aborted_run_stops_once_error_exceeds_bound():
+    full = run()
+    df = full.data
+    errors = numpy.absolute(df['qb_value_pre_def_adj'] - df['player_VALUE']).to_numpy()
+    scored = numpy.flatnonzero((df['season'] >= 2009).to_numpy() & ~numpy.isnan(errors))
+    cumulative = numpy.cumsum(errors[scored])
+    max_mae = 0.6 * full.score_model(add_elo=False)['mae']
+    bound = max_mae * len(scored)
+    ## the abort comes at the first scored game whose error takes the sum past the bound ##
+    k = int(numpy.argmax(cumulative > bound))
+    assert k > 0 and cumulative[k - 1] <= bound < cumulative[k]
+    bounded = run(max_mae)
+    assert bounded.aborted
+    numpy.testing.assert_allclose(bounded.abort_mae * len(scored), cumulative[k], rtol=1e-12)
+    assert bounded.abort_mae > max_mae
+    ## every game before the abort was played as in the full run ##
+    numpy.testing.assert_array_equal(
+        bounded.data['qb_value_pre_def_adj'].to_numpy()[:scored[k]],
+        df['qb_value_pre_def_adj'].to_numpy()[:scored[k]]
+    )
+    record = bounded.score_model(add_elo=False)
+    assert record['aborted'] and record['mae'] == bounded.abort_mae
+
+def test_unaborted_bounded_run_scores_as_unbounded():
+    record = run().score_model(add_elo=False)
+    bounded = run(record['mae'] + 1)
+    assert not bounded.aborted
+    bounded_record = bounded.score_model(add_elo=False)
+    assert bounded_record.pop('aborted') is False
+    for k in record:
+        if k != 'model_runtime':
+            numpy.testing.assert_array_equal(bounded_record[k], record[k], err_msg=k)
+
+@pytest.mark.parametrize('options, message', [
+    ({'backend': 'cmaes', 'objective_name': 'mae_first_16'}, 'mae objective'),
+    ({'backend': 'cmaes', 'exclude_seasons': [2009]}, 'excluded seasons'),
+    ({'backend': 'minimize'}, 'cmaes and halving'),
+    ({'backend': 'surrogate'}, 'cmaes and halving')
+])
+def test_validate_early_abort_rejects(options, message):
+    with pytest.raises(ValueError, match=message):
+        ConfigOptimizer(synthetic_games(), load_config(), save_in_flight=False, early_abort=True, **options)
+
+@pytest.mark.parametrize('backend', ['cmaes', 'halving'])
+def test_validate_early_abort_accepts(backend):
+    optimizer = ConfigOptimizer(synthetic_games(), load_config(), save_in_flight=False, early_abort=True, backend=backend)
+    assert optimizer.early_abort
@@ -0,0 +1,29 @@
+## compares the columnar engine to the original iterrows engine on synthetic games ##
+## so the check runs offline ##
+import pandas as pd
+import numpy
+import pandas.testing as pdt
+
+from nfeloqb.Resources import QBModel
+from conftest import synthetic_games, load_config
+
+def run(engine: str) -> QBModel:
+    model = QBModel(synthetic_games(), load_config())
+    model.run_model(engine=engine)
+    return model
+
+def test_columnar_engine_matches_iterrows():
+    columnar = run('columnar')
+    iterrows = run('iterrows')
+    for table in ['data', 'data_team', 'qb_records']:
+        pdt.assert_frame_equal(
+            pd.DataFrame(getattr(columnar, table)),
+            pd.DataFrame(getattr(iterrows, table)),
+            check_dtype=False,
+            obj=table
+        )
+    columnar_record = columnar.score_model(add_elo=False)
+    iterrows_record = iterrows.score_model(add_elo=False)
+    for k in columnar_record:
+        if k != 'model_runtime':
+            numpy.testing.assert_allclose(columnar_record[k], iterrows_record[k], rtol=0, atol=1e-9, err_msg=k)
@@ -0,0 +1,64 @@
+## checks that fold scores add up to the model's score, and that cross validation ##
+## trains without the held out seasons and scores on them ##
+import numpy
+import pytest
+
+from nfeloqb.Resources import QBModel
+from nfeloqb.Optimizer import cross_validate
+from conftest import synthetic_games, load_config
+
+## four scored seasons, 2009 through 2012 ##
+GAMES = synthetic_games(last_season=2012)
+
+def run(config=None) -> QBModel:
+    model = QBModel(GAMES, config if config is not None else load_config())
+    model.run_model()
+    return model
+
+def test_fold_scores_average_to_model_score():
+    model = run()
+    folds = model.score_folds()
+    record = model.score_model(add_elo=False)
+    assert folds['season'].tolist() == [2009, 2010, 2011, 2012]
+    assert folds['games'].sum() == (GAMES['season'] >= 2009).sum()
+    ## weighted by games, the folds are the full score, and unweighted they are season_mae ##
+    assert (folds['mae'] * folds['games']).sum() / folds['games'].sum() == pytest.approx(record['mae'], rel=1e-12)
+    assert ((folds['rmse'] ** 2 * folds['games']).sum() / folds['games'].sum()) ** 0.5 == pytest.approx(record['rmse'], rel=1e-12)
+    assert folds['mae'].mean() == pytest.approx(record['season_mae'], rel=1e-12)
+
+def test_exclude_seasons_drops_seasons_from_score():
+    model = run()
+    folds = model.score_folds()
+    record = model.score_model(add_elo=False, exclude_seasons=[2009, 2011])
+    kept = folds[folds['season'].isin([2010, 2012])]
+    assert (kept['mae'] * kept['games']).sum() / kept['games'].sum() == pytest.approx(record['mae'], rel=1e-12)
+    assert kept['mae'].mean() == pytest.approx(record['season_mae'], rel=1e-12)
+
+def test_cross_validate_trains_without_held_out_seasons():
+    subset = ['player_sf', 'team_off_sf']
+    results = cross_validate(
+        GAMES,
+        load_config(),
+        subset=subset,
+        folds=[[2009], [2011, 2012]],
+        workers=1,
+        backend='cmaes',
+        budget=4,
+        seed=1
+    )
+    assert results['seasons'].tolist() == ['2009', '2011,2012']
+    for _, fold in results.iterrows():
+        seasons = [int(s) for s in fold['seasons'].split(',')]
+        config = load_config()
+        config.values.update({k: fold[k] for k in subset})
+        model = run(config)
+        ## the training score leaves the fold's seasons out, and the test score is only theirs ##
+        numpy.testing.assert_allclose(
+            fold['train_mae'], model.score_model(add_elo=False, exclude_seasons=seasons)['mae'], rtol=1e-12
+        )
+        folds = model.score_folds()
+        test = folds[folds['season'].isin(seasons)]
+        assert fold['test_games'] == test['games'].sum()
+        numpy.testing.assert_allclose(
+            fold['test_mae'], (test['mae'] * test['games']).sum() / test['games'].sum(), rtol=1e-12
+        )
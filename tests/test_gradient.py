@@ -0,0 +1,30 @@
+## checks the dual engine's gradients against central finite differences of the columnar engine ##
+import numpy
+
+from nfeloqb.Resources import QBModel, DualQBModel
+from conftest import synthetic_games, load_config
+
+OBJECTIVES = ['mae', 'season_mae', 'mae_first_16', 'mae_backup']
+
+def test_score_gradient_matches_finite_differences():
+    values = load_config().values
+    ## init_value and the undrafted draft number only set the starting point ##
+    wrt = [k for k in values if k not in ['init_value', 'rookie_undrafted_draft_number']]
+    dual = DualQBModel(synthetic_games(), load_config())
+    dual.run_model(wrt=wrt)
+    gradients = {objective: dual.score_gradient(objective) for objective in OBJECTIVES}
+    for i, k in enumerate(wrt):
+        step = 1e-6 * max(1, abs(values[k]))
+        records = []
+        for sign in [1, -1]:
+            config = load_config()
+            config.values[k] = values[k] + sign * step
+            model = QBModel(synthetic_games(), config)
+            model.run_model()
+            records.append(model.score_model(add_elo=False))
+        for objective in OBJECTIVES:
+            finite_difference = (records[0][objective] - records[1][objective]) / (2 * step)
+            numpy.testing.assert_allclose(
+                gradients[objective][i], finite_difference,
+                rtol=1e-6, atol=1e-6, err_msg='{0} wrt {1}'.format(objective, k)
+            )
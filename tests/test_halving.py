@@ -0,0 +1,78 @@
+## checks the halving backend's rungs, rung sizes, and spend against its budget ##
+import pandas as pd
+import pytest
+
+from nfeloqb.Optimizer import ConfigOptimizer
+from conftest import synthetic_games, load_config
+
+## nine seasons of equal length, so a rung through a season costs its share of them ##
+GAMES = synthetic_games(last_season=2014)
+
+def halving(budget: float = 4, games: pd.DataFrame = GAMES, **kwargs) -> ConfigOptimizer:
+    return ConfigOptimizer(
+        games,
+        load_config(),
+        subset=['player_sf', 'team_off_sf', 'team_def_sf'],
+        backend='halving',
+        budget=budget,
+        workers=1,
+        seed=5,
+        save_in_flight=False,
+        **kwargs
+    )
+
+def tallied_search(budget: float) -> tuple[ConfigOptimizer, list[tuple[int, int]]]:
+    '''
+    Runs a halving search with eta 2 from one scored season, recording the last season
+    and number of configs of every rung it runs.
+    '''
+    optimizer = halving(budget, eta=2, min_seasons=1)
+    runs = []
+    run_truncated = optimizer.run_truncated
+    def tallied_run_truncated(configs, last_season):
+        runs.append((last_season, len(configs)))
+        return run_truncated(configs, last_season)
+    objective_batch = optimizer.objective_batch
+    def tallied_objective_batch(xs, run_configs=None):
+        runs.append((2014, len(xs)))
+        return objective_batch(xs, run_configs)
+    optimizer.run_truncated = tallied_run_truncated
+    optimizer.objective_batch = tallied_objective_batch
+    optimizer.optimize(False, False)
+    return optimizer, runs
+
+def cost(runs: list[tuple[int, int]]) -> float:
+    return sum(n * (GAMES['season'] <= last_season).sum() / len(GAMES) for last_season, n in runs)
+
+@pytest.mark.parametrize('games, options, rungs', [
+    (GAMES, {'eta': 2, 'min_seasons': 1}, [2009, 2010, 2012, 2014]),
+    (GAMES, {'eta': 3, 'min_seasons': 1}, [2009, 2011, 2014]),
+    (GAMES, {'eta': 3, 'min_seasons': 2}, [2010, 2014]),
+    (synthetic_games(), {'eta': 3, 'min_seasons': 2}, [2010])
+])
+def test_fidelity_rungs(games, options, rungs):
+    assert halving(games=games, **options).fidelity_rungs() == rungs
+
+@pytest.mark.filterwarnings('ignore:Mean of empty slice')
+def test_rung_sizes_and_costs():
+    optimizer, runs = tallied_search(14)
+    ## the first bracket halves 8 configs down to one full run, costing 8 1/3 full runs, ##
+    ## and the second starts 6 on the second rung, and stops when a full run isn't affordable ##
+    assert runs == [(2009, 8), (2010, 4), (2012, 2), (2014, 1), (2010, 6), (2012, 3)]
+    assert cost(runs[:4]) == pytest.approx(8 + 1 / 3)
+    assert cost(runs) == pytest.approx(14)
+    assert optimizer.solution.nfev == 1 and optimizer.solution.nit == 2
+
+@pytest.mark.filterwarnings('ignore:Mean of empty slice')
+@pytest.mark.parametrize('budget', [1, 2, 4, 9, 14, 20])
+def test_spend_stays_within_budget(budget):
+    optimizer, runs = tallied_search(budget)
+    full_runs = sum(n for last_season, n in runs if last_season == 2014)
+    assert optimizer.solution.nfev == full_runs == len(optimizer.optimization_records)
+    assert full_runs >= 1
+    if budget < 8 + 1 / 3:
+        ## too small for a full bracket, so only the first full run can go over ##
+        assert full_runs == 1
+        assert cost(runs) - 1 <= budget + 1e-9
+    else:
+        assert cost(runs) <= budget + 1e-9